@@ -0,0 +1,137 @@
+# ===============================================================
+# BESTAND: xaurum/core/batch_sync.py
+# Headless batch-sync (zonder GUI) voor de nachtelijke run:
+# load_all (laden, sync, afsluiten, opslaan) per costcenter, optioneel in een process pool
+# + JSON samenvatting van de tellers uit DataStore.last_load_summary.
+# De globale config-wasstraat (clean_sql_config_names) draait 1x vooraf, niet per worker.
+#
+# Gebruik:
+#   python -m xaurum.core.batch_sync --costcenter B1 --costcenter B3
+#   python -m xaurum.core.batch_sync --all --workers 4 --output sync_summary.json
+#   (staging tabellen hebben per aanroep een unieke naam, dus parallel is veilig)
+#   python -m xaurum.core.batch_sync --all --full-sync
+# ===============================================================
+
+import argparse
+import json
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+def list_costcenters() -> List[str]:
+    """Alle costcenters uit de staff directory (zelfde lijst als de afdelings-dropdown)."""
+    from xaurum.core.datastore import DataStore
+
+    ds = DataStore()
+    if not ds.load_staff_only():
+        print(f"❌ Staff laden mislukt: {ds.errors}")
+        return []
+    return [cc for cc, _ in ds.get_staff_directory()["departments"]]
+
+
+def clean_config_once() -> bool:
+    """Globale wasstraat (alle medewerkers, niet per costcenter): 1x in het hoofdproces, voor de pool start."""
+    from xaurum.core.datastore import DataStore
+
+    ds = DataStore()
+    if not ds.USE_SQL_FOR_CONFIG:
+        return False
+    ds.clean_sql_config_names()
+    return True
+
+
+def run_costcenter(costcenter: str, full_sync: bool = False) -> Dict[str, Any]:
+    """
+    Worker (1 proces per costcenter): eigen DataStore + SQL engine, load_all (zonder wasstraat,
+    zie clean_config_once) en optioneel de volledige sync-keten van on_save (DataStore.run_planner_sync).
+    Geeft de tellers terug (nooit een exception, zodat 1 afdeling de rest van de batch niet stopt).
+    """
+    t0 = time.perf_counter()
+    result: Dict[str, Any] = {"costcenter": costcenter, "ok": False}
+    try:
+        from xaurum.core.datastore import DataStore
+
+        ds = DataStore()
+        ds.AUTO_CLEAN_CONFIG = False
+        ok = ds.load_all(costcenter)
+        result.update(ds.last_load_summary)
+        if ok and full_sync:
+            # config + todo zijn net door load_all geladen: geen herlaadbeurt nodig
+            result["volledige_sync_tellers"] = ds.run_planner_sync(reload=False)
+        result["ok"] = bool(ok)
+    except Exception as e:
+        result["fout"] = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    result["duur_totaal_s"] = round(time.perf_counter() - t0, 1)
+    return result
+
+
+def run_batch(costcenters: List[str], workers: int = 1, full_sync: bool = False) -> Dict[str, Any]:
+    """Verdeelt de costcenters over een process pool en bundelt de resultaten (gesorteerd op costcenter)."""
+    t0 = time.perf_counter()
+    started = datetime.now().isoformat(timespec="seconds")
+    results = []
+    workers = max(1, min(workers, len(costcenters)))
+
+    try:
+        config_cleaned = clean_config_once()
+    except Exception as e:
+        print(f"⚠️ Wasstraat vooraf mislukt: {e}")
+        config_cleaned = False
+
+    if workers == 1:
+        results = [run_costcenter(cc, full_sync) for cc in costcenters]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_costcenter, cc, full_sync): cc for cc in costcenters}
+            for fut in as_completed(futures):
+                res = fut.result()
+                print(f"{'✅' if res['ok'] else '❌'} {futures[fut]}: {res.get('todo', '?')} taken ({res['duur_totaal_s']}s)")
+                results.append(res)
+
+    results.sort(key=lambda r: str(r["costcenter"]))
+    return {
+        "gestart": started,
+        "workers": workers,
+        "volledige_sync": full_sync,
+        "config_wasstraat": config_cleaned,
+        "costcenters": len(costcenters),
+        "geslaagd": sum(1 for r in results if r["ok"]),
+        "duur_s": round(time.perf_counter() - t0, 1),
+        "resultaten": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless planner-sync per costcenter (zonder GUI).")
+    parser.add_argument("--costcenter", "-c", action="append", default=[],
+                        help="Costcenter om te verwerken (meermaals te gebruiken)")
+    parser.add_argument("--all", action="store_true", help="Alle costcenters uit de staff directory")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                        help="Aantal parallelle processen (standaard: 1, sequentieel)")
+    parser.add_argument("--full-sync", action="store_true",
+                        help="Na load_all ook de volledige sync-keten van on_save uitvoeren")
+    parser.add_argument("--output", "-o", default="batch_sync_summary.json", help="Pad voor de JSON samenvatting")
+    args = parser.parse_args(argv)
+
+    costcenters = list(dict.fromkeys(c.strip() for c in args.costcenter if c and c.strip()))
+    if args.all:
+        costcenters = list(dict.fromkeys(costcenters + list_costcenters()))
+    if not costcenters:
+        parser.error("geef minstens 1 --costcenter of --all")
+
+    print(f"🌙 Batch-sync: {len(costcenters)} costcenter(s), {args.workers} worker(s)")
+    summary = run_batch(costcenters, workers=args.workers, full_sync=args.full_sync)
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, ensure_ascii=False, indent=2, default=str)
+    print(f"💾 Samenvatting: {args.output} ({summary['geslaagd']}/{summary['costcenters']} geslaagd)")
+    return 0 if summary["geslaagd"] == summary["costcenters"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
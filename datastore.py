@@ -51,6 +51,45 @@ from xaurum.db.training_manager import SQLServerTrainingManager
 # GLOBALE HELPERS
 # =========================================================
 
+# Versieteller per frame-object (zie DataStore._frame_version). Sleutel = id(obj), maar met een
+# weakref erbij: hergebruikt CPython het id van een vrijgegeven frame, dan krijgt het nieuwe
+# frame toch een nieuwe versie.
+_FRAME_VERSIONS: Dict[int, Tuple[Any, int, Optional[int]]] = {}
+_FRAME_VERSION_SEQ = [0]
+
+
+def _touch_frame(obj) -> int:
+    """Geeft obj een nieuwe versie (bij vervanging of in-place wijziging). Returns de nieuwe versie."""
+    import weakref
+
+    if obj is None:
+        return 0
+    if len(_FRAME_VERSIONS) > 512:
+        for key in [k for k, e in _FRAME_VERSIONS.items() if e[0]() is None]:
+            del _FRAME_VERSIONS[key]
+    entry = _FRAME_VERSIONS.get(id(obj))
+    previous = entry[1] if entry is not None and entry[0]() is obj else None
+    _FRAME_VERSION_SEQ[0] += 1
+    _FRAME_VERSIONS[id(obj)] = (weakref.ref(obj), _FRAME_VERSION_SEQ[0], previous)
+    return _FRAME_VERSION_SEQ[0]
+
+
+def _frame_entry(obj):
+    entry = _FRAME_VERSIONS.get(id(obj))
+    if entry is None or entry[0]() is not obj:
+        _touch_frame(obj)
+        entry = _FRAME_VERSIONS[id(obj)]
+    return entry
+
+
+class _FrameDict(dict):
+    """self.df: elke toekenning (ook hetzelfde frame na een in-place wijziging) bumpt de versie."""
+
+    def __setitem__(self, key, value):
+        if value is not None:
+            _touch_frame(value)
+        super().__setitem__(key, value)
+
 
 class DataStore:
     def __init__(self):
@@ -58,7 +97,7 @@ class DataStore:
         # BESTAANDE DATASTRUCTUREN
         # ═══════════════════════════════════════════════════════════
         
-        self.df: Dict[str, pd.DataFrame] = {}
+        self.df: Dict[str, pd.DataFrame] = _FrameDict()
         self.master_comp_req: pd.DataFrame = pd.DataFrame()
         self.master_comp_all: pd.DataFrame = pd.DataFrame()
         self.errors: List[str] = []
@@ -82,13 +121,48 @@ class DataStore:
         # Backwards-compat/UI helpers
         self._cert_display_map: Dict[str, str] = {}
         self._cert_display_map_built: bool = False
+        self._cert_display_map_version = None
+        self._display_name_cache: Dict[Tuple[str, Optional[str]], str] = {}
+        self._standard_name_cache: Dict[str, str] = {}
         
         # Track sync statistics
         self.last_sync_merge_count: int = 0
+
+        # staffGIDs met staffSTAFFSTATUSID <> 1 (gevuld in STAP 1)
+        self.inactive_staff_gids: set = set()
+
+        # Audit van de laatste dedupe-runs (dubbele groepen, kolom '_behouden')
+        self.last_duplicate_tasks: pd.DataFrame = pd.DataFrame()
+        self.last_duplicate_configs: pd.DataFrame = pd.DataFrame()
+        # Rapporten van de laatste master-controles (bron, naam, naam_norm, aantal)
+        self.last_cert_discrepancies: pd.DataFrame = pd.DataFrame()
+        self.last_comp_discrepancies: pd.DataFrame = pd.DataFrame()
+        # Tellers van de laatste load_all-run (zie batch_sync.py voor de JSON-export)
+        self.last_load_summary: Dict[str, Any] = {}
         
         # 🆕 VERTALINGEN DICTIONARY (Voor Frans -> Nederlands)
         self.translation_dict: Dict[str, str] = {} 
 
+        # Cache ruwe naam -> normalize_certname() (leeg bij elke wijziging van translation_dict)
+        self._norm_cache: Dict[str, str] = {}
+
+        # Vervangkandidaten-index (zie _build_replacement_index)
+        self._repl_index: Dict[str, Any] = {}
+
+        # Training catalogus-index + URL memo (zie _build_catalog_index)
+        self._catalog_index: Dict[str, Any] = {}
+        self._catalog_url_cache: Dict[str, Optional[str]] = {}
+
+        # Profiel-index per medewerker (zie _build_profile_index)
+        self._profile_index: Dict[str, Any] = {}
+
+        # Afdeling/medewerker directory (zie get_staff_directory)
+        self._staff_directory: Dict[str, Any] = {}
+
+        # Zoekindex master-namen + laatste zoekresultaat (zie search_master_names)
+        self._search_index: Dict[str, Any] = {}
+        self._search_last = None
+
         # ═══════════════════════════════════════════════════════════
         # 🆕 SQL SERVER CONFIGURATIE (V11 - VOLLEDIG)
         # ═══════════════════════════════════════════════════════════
@@ -98,6 +172,7 @@ class DataStore:
         self.USE_SQL_FOR_CONFIG = True      # Config uit SQL
         self.USE_SQL_FOR_TODO = True        # Todo uit SQL
         self.USE_SQL_FOR_MASTER = True      # Master data uit SQL
+        self.AUTO_CLEAN_CONFIG = True       # Wasstraat (STAP 9.5) in load_all; batch_sync doet die 1x vooraf
         
         # SQL Server instellingen
         self.SQL_CONFIG = {
@@ -212,6 +287,11 @@ class DataStore:
         """
         # Reset
         self.translation_dict = {}
+        self._norm_cache = {}
+        self._catalog_index = {}
+        self._profile_index = {}
+        self._search_index = {}
+        self._invalidate_name_index()
         df_map = pd.DataFrame()
 
         # 1. Probeer SQL (Gebruik de BESTAANDE tabel)
@@ -370,10 +450,36 @@ class DataStore:
             text += " "
         return text + addition
 
+    def _missing_against_master(self, sources: Dict[str, pd.Series], master_names: pd.Series) -> pd.DataFrame:
+        """
+        Set-difference van genormaliseerde unieke namen tegen de master lijst (1 pass per bron).
+
+        Returns: rapport frame [bron, naam, naam_norm, aantal] met 1 rij per ontbrekende
+        norm-naam per bron (naam = eerste originele schrijfwijze).
+        """
+        master_set = set(self._norm_series(master_names.dropna().astype(str)))
+        delen = []
+        for bron, names in sources.items():
+            orig = names.dropna().astype(str)
+            if orig.empty:
+                continue
+            normed = self._norm_series(orig)
+            frame = pd.DataFrame({"naam": orig.to_numpy(), "naam_norm": normed.to_numpy()})
+            frame = frame[(frame["naam_norm"] != "") & ~frame["naam_norm"].isin(master_set)]
+            if frame.empty:
+                continue
+            aantal = frame.groupby("naam_norm", sort=False).size().rename("aantal")
+            frame = frame.drop_duplicates("naam_norm", keep="first").join(aantal, on="naam_norm")
+            delen.append(frame.assign(bron=bron))
+        if not delen:
+            return pd.DataFrame(columns=["bron", "naam", "naam_norm", "aantal"])
+        return pd.concat(delen, ignore_index=True)[["bron", "naam", "naam_norm", "aantal"]]
+
     def check_certnames_against_master(self):
         """
         Controleert of alle CertNames uit certificates en training_req 
         voorkomen in de master certificaten lijst.
+        Het volledige rapport staat daarna in self.last_cert_discrepancies.
         
         Returns:
             dict met 'certificates' en 'training_req' lijsten van ontbrekende namen
@@ -388,36 +494,20 @@ class DataStore:
             print("⚠️ Master certificaten lijst is leeg of heeft geen CertName kolom")
             return result
 
-        norm = self.normalize_certname
-        master_set = set(
-            self.master_cert_all["CertName"]
-            .dropna()
-            .astype(str)
-            .map(norm)
-        )
-
-        print(f"\n🔍 Controleren tegen {len(master_set)} master certificaten...")
+        print(f"\n🔍 Controleren tegen {self.master_cert_all['CertName'].nunique()} master certificaten...")
 
+        sources = {}
         for key in ("certificates", "training_req"):
             df = self.df.get(key, pd.DataFrame())
-            missing: list[str] = []
-
-            if df is None or df.empty or "CertName" not in df.columns:
-                result[key] = missing
-                continue
+            if df is not None and not df.empty and "CertName" in df.columns:
+                sources[key] = df["CertName"]
 
-            orig = df["CertName"].dropna().astype(str)
-            normed = orig.map(norm)
+        report = self._missing_against_master(sources, self.master_cert_all["CertName"])
+        self.last_cert_discrepancies = report
 
-            for cert_norm in sorted(normed.unique()):
-                if not cert_norm:
-                    continue
-                if cert_norm not in master_set:
-                    sample = orig[normed == cert_norm].iloc[0]
-                    missing.append(str(sample))
-
-            result[key] = sorted(set(missing))
-            
+        for key in result:
+            missing = sorted(set(report.loc[report["bron"] == key, "naam"]))
+            result[key] = missing
             if missing:
                 print(f"   ⚠️ {key}: {len(missing)} ontbrekende certificaten")
 
@@ -483,6 +573,7 @@ class DataStore:
         """
         Controleert of alle Competence-namen uit competences 
         voorkomen in de master competenties lijst.
+        Het volledige rapport staat daarna in self.last_comp_discrepancies.
         
         Returns:
             dict met 'competences' lijst van ontbrekende namen
@@ -493,34 +584,17 @@ class DataStore:
             print("⚠️ Master competenties lijst is leeg of heeft geen Competence kolom")
             return result
 
-        norm = self.normalize_certname
-        master_set = set(
-            self.master_comp_all["Competence"]
-            .dropna()
-            .astype(str)
-            .map(norm)
-        )
-
-        print(f"\n🔍 Controleren tegen {len(master_set)} master competenties...")
+        print(f"\n🔍 Controleren tegen {self.master_comp_all['Competence'].nunique()} master competenties...")
 
         df_comp = self.df.get("competences", pd.DataFrame())
-        missing: list[str] = []
-
         if df_comp is None or df_comp.empty or "Competence" not in df_comp.columns:
-            result["competences"] = missing
             return result
 
-        orig = df_comp["Competence"].dropna().astype(str)
-        normed = orig.map(norm)
-
-        for comp_norm in sorted(normed.unique()):
-            if not comp_norm:
-                continue
-            if comp_norm not in master_set:
-                sample = orig[normed == comp_norm].iloc[0]
-                missing.append(str(sample))
+        report = self._missing_against_master({"competences": df_comp["Competence"]}, self.master_comp_all["Competence"])
+        self.last_comp_discrepancies = report
 
-        result["competences"] = sorted(set(missing))
+        missing = sorted(set(report["naam"]))
+        result["competences"] = missing
         
         if missing:
             print(f"   ⚠️ {len(missing)} ontbrekende competenties gevonden")
@@ -686,38 +760,193 @@ class DataStore:
         return days_until_expiry < 180  # 6 maanden
 
 
+    # ===============================================================
+    # GEDEELDE TAAK-GENERATIE (kolomsgewijs: nodig vs. behaald vs. open)
+    # ===============================================================
+    def _norm_series(self, series: pd.Series) -> pd.Series:
+        """
+        Kolomsgewijze normalize_certname.
+        Elke unieke naam wordt maar 1x genormaliseerd (self._norm_cache), daarna is het een dict-map.
+        """
+        if series is None or len(series) == 0:
+            return pd.Series([], index=getattr(series, "index", None), dtype=object)
+        s = series.astype(object).where(series.notna(), "")
+        cache = getattr(self, "_norm_cache", None)
+        if cache is None:
+            cache = self._norm_cache = {}
+        lookup = {}
+        for v in pd.unique(s):
+            if v not in cache:
+                cache[v] = self.normalize_certname(v)
+            lookup[v] = cache[v]
+        return s.map(lookup)
+
+    def _ensure_norm_column(self, df: pd.DataFrame, name_col: str = "CertName", norm_col: str = "CertName_norm") -> pd.DataFrame:
+        """
+        Zorgt dat df[norm_col] bestaat; normaliseert enkel de rijen waar die nog leeg is.
+        Past df in-place aan en geeft df terug.
+        """
+        if df is None or df.empty or name_col not in df.columns:
+            return df
+        if norm_col not in df.columns:
+            df[norm_col] = self._norm_series(df[name_col])
+            return df
+        leeg = df[norm_col].isna() | (df[norm_col].astype(str).str.strip() == "")
+        if leeg.any():
+            df.loc[leeg, norm_col] = self._norm_series(df.loc[leeg, name_col])
+        return df
+
+    @staticmethod
+    def _frame_version(df) -> Optional[Tuple[int, int]]:
+        """
+        Versie-sleutel van een frame (of set): (versieteller, len). Wijzigt als df vervangen wordt,
+        via self.df[...] opnieuw toegekend wordt (in-place wijziging) of van lengte verandert.
+        """
+        return (_frame_entry(df)[1], len(df)) if df is not None else None
+
+    @staticmethod
+    def _frame_previous_version(df) -> Optional[Tuple[int, int]]:
+        """Versie-sleutel van df vóór de laatste bump (None als er geen vorige versie is)."""
+        if df is None:
+            return None
+        previous = _frame_entry(df)[2]
+        return (previous, len(df)) if previous is not None else None
+
+    @staticmethod
+    def _truthy_mask(series: pd.Series) -> pd.Series:
+        """Vectorized versie van de lokale is_true() helpers ('true', '1', 'ja', 'yes', 't')."""
+        return series.astype(str).str.lower().isin(['true', '1', 'ja', 'yes', 't'])
+
+    def _staff_task_info(self, staff: pd.DataFrame, id_col: str) -> pd.DataFrame:
+        """
+        Staff-velden die op elke nieuwe taak komen, geïndexeerd op staffGID.
+        Kolommen: _staff_name, _staff_sap, _staff_cc (eerste niet-lege waarde uit de kandidaten).
+        """
+        if staff is None or staff.empty or id_col not in staff.columns:
+            return pd.DataFrame(columns=["_staff_name", "_staff_sap", "_staff_cc"])
+
+        def _coalesce(cols, default=""):
+            out = pd.Series("", index=staff.index, dtype=object)
+            for c in cols:
+                if c in staff.columns:
+                    vals = staff[c].fillna("").astype(str).str.strip()
+                    out = out.where(out != "", vals)
+            return out.where(out != "", default)
+
+        info = pd.DataFrame({
+            "staffGID": staff[id_col].astype(str).str.strip(),
+            "_staff_name": _coalesce(["MedewerkerNaam", "FullName"]),
+            "_staff_sap": _coalesce(["staffSAPNR"]),
+            "_staff_cc": _coalesce(["CostCenter", "staffCOSTCENTER315"], self.active_costcenter or ""),
+        })
+        return info.drop_duplicates("staffGID", keep="last").set_index("staffGID")
+
+    def _generate_required_tasks(
+        self,
+        required: pd.DataFrame,
+        staff: pd.DataFrame,
+        todo: pd.DataFrame,
+        *,
+        id_col: str,
+        name_col: str,
+        lookups: Optional[Dict[str, pd.DataFrame]] = None,
+        task_type: Optional[str] = None,
+        closed_statuses=("afgewerkt", "gesloten"),
+        todo_norm_col: Optional[str] = "CertName_norm",
+    ) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Gedeelde kern van sync_cert_tasks() en sync_competence_tasks().
+
+        - required: config-rijen die Nodig zijn (al gefilterd op afdeling)
+        - todo: bestaande taken; open taken (status niet in closed_statuses,
+          optioneel enkel TaskType == task_type) vallen weg via een anti-join
+        - staff: levert _staff_name/_staff_sap/_staff_cc (inner join)
+        - lookups: {marker: frame met staffGID + CertName_norm}; elk frame wordt
+          links gejoind en 'marker' wordt een boolean "gevonden" kolom
+
+        Returns (kandidaten, stats). Kandidaten hebben staffGID, CertName (origineel),
+        CertName_norm, alle config-kolommen, de staff-kolommen en de lookup-kolommen.
+        """
+        keys = ["staffGID", "CertName_norm"]
+        stats = {"skip_taak_bestaat": 0, "skip_geen_staff": 0, "naam_genormaliseerd": 0}
+        if required is None or required.empty:
+            return pd.DataFrame(columns=keys), stats
+
+        req = required.copy()
+        req["staffGID"] = req[id_col].astype(str).str.strip()
+        req["CertName"] = req[name_col].astype(str).str.strip() if name_col in req.columns else ""
+        req["CertName_norm"] = self._norm_series(req["CertName"])
+        stats["naam_genormaliseerd"] = int((req["CertName_norm"] != req["CertName"].str.lower()).sum())
+
+        # 1. Anti-join: (staffGID, norm) met een open taak -> overslaan
+        if todo is not None and not todo.empty:
+            t_id = id_col if id_col in todo.columns else "staffGID"
+            if t_id in todo.columns:
+                status_lc = (todo["Status"] if "Status" in todo.columns else pd.Series("", index=todo.index)).astype(str).str.lower()
+                open_mask = ~status_lc.isin(closed_statuses)
+                if task_type:
+                    if "TaskType" in todo.columns:
+                        open_mask &= todo["TaskType"].astype(str).str.lower() == task_type.lower()
+                    else:
+                        open_mask &= False
+                if todo_norm_col and todo_norm_col in todo.columns:
+                    t_norm = todo[todo_norm_col].astype(str).str.strip()
+                elif "CertName" in todo.columns:
+                    t_norm = self._norm_series(todo["CertName"].astype(str))
+                else:
+                    t_norm = pd.Series("", index=todo.index)
+                open_keys = pd.DataFrame({
+                    "staffGID": todo[t_id].astype(str).str.strip(),
+                    "CertName_norm": t_norm,
+                })[open_mask].drop_duplicates()
+                req = req.merge(open_keys.assign(_open=True), on=keys, how="left")
+                exists = req["_open"].notna()
+                stats["skip_taak_bestaat"] = int(exists.sum())
+                req = req[~exists].drop(columns="_open")
+
+        # 2. Staff info (inner join)
+        info = self._staff_task_info(staff, id_col)
+        has_staff = req["staffGID"].isin(info.index)
+        stats["skip_geen_staff"] = int((~has_staff).sum())
+        req = req[has_staff].join(info, on="staffGID")
+
+        # 3. Behaald / ingeschreven / ... (left joins)
+        for marker, lk in (lookups or {}).items():
+            if lk is None:
+                req[marker] = False
+                continue
+            lk = lk.drop_duplicates(keys, keep="last").assign(**{marker: True})
+            req = req.merge(lk, on=keys, how="left")
+            req[marker] = req[marker].notna()
+
+        return req.reset_index(drop=True), stats
+
     def sync_cert_tasks(self):
         """
-        ULTIMATE VERSION:  V17-DEBUG functionaliteit + V18 Afdelingsbeveiliging. 
+        ULTIMATE VERSION:  V17-DEBUG functionaliteit + V18 Afdelingsbeveiliging.
         Zorgt voor correcte datums én voorkomt vervuiling van andere costcenters.
-        
+
         V19-FIX: CostCenter lookup aangepast om te werken na kolom-hernoemen in load_all().
-        V20-FIX: FutureWarning pd.concat opgelost. 
+        V20-FIX: FutureWarning pd.concat opgelost.
+        V21: Kolomsgewijs via _generate_required_tasks() (joins i.p.v. iterrows).
         """
+        import numpy as np
+
         print("\n" + "="*60)
         print(f"🔄 sync_cert_tasks() - AFDELING: {self. active_costcenter}")
         print("="*60)
-        
-        # --- HULPFUNCTIE VOOR ZUIVERE INTEGERS ---
-        def to_int_or_none(val):
-            try:
-                if pd.isna(val) or val == "" or str(val).strip().lower() == "nan":
-                    return None
-                return int(float(val))
-            except: 
-                return None
 
         # 1. LAAD DATA
         cfg = self.df. get("config_cert", pd.DataFrame())
         if cfg.empty:
             cfg = self.df.get("config", pd.DataFrame())
-            
+
         staff = self.df.get("staff", pd. DataFrame())
         results = self.df. get("cert_results", pd. DataFrame())
         certs_overview = self.df. get("certificates", pd.DataFrame())
         todo = self.df. get("todo", pd.DataFrame())
         training_req = self.df. get("training_req", pd.DataFrame())
-        
+
         if cfg.empty or staff.empty:
             print("   ⚠️ Geen config of staff data - niets te doen")
             return
@@ -725,182 +954,168 @@ class DataStore:
         # 2. STRIKTE AFDELINGSFILTER (De 'Miserie' oplosser)
         id_col = self.get_id_column() or "staffGID"
         my_department_gids = set(staff[id_col].astype(str).str.strip().unique())
-        
+
         cfg_col = next((c for c in [id_col, "staffGID"] if c in cfg. columns), None)
-        def is_true(x): return str(x).lower() in ['true', '1', 'ja', 'yes', 't']
-        
+
         # Filter config op alleen de mensen van JOUW afdeling die het certificaat NODIG hebben
         cfg_nodig = cfg[
             (cfg[cfg_col].astype(str).str.strip().isin(my_department_gids)) &
-            (cfg["Nodig"]. apply(is_true))
+            (self._truthy_mask(cfg["Nodig"]))
         ].copy()
-        
+
         print(f"   📊 Config voor {self.active_costcenter}:  {len(cfg_nodig)} rijen.")
 
         # 3. LOOKUPS BOUWEN (Alleen voor jouw mensen)
-        # V19-FIX:  CostCenter zoeken in meerdere mogelijke kolomnamen
-        # Na load_all() is 'staffCOSTCENTER315' hernoemd naar 'CostCenter'
-        staff_lookup = {}
-        for _, row in staff.iterrows():
-            sid = str(row. get(id_col, "")).strip()
-            
-            # FIX: Zoek CostCenter in beide mogelijke kolomnamen + fallback naar active_costcenter
-            cc_value = (
-                row.get("CostCenter", "") or
-                row. get("staffCOSTCENTER315", "") or
-                self.active_costcenter or
-                ""
-            )
-            
-            staff_lookup[sid] = {
-                "name": str(row.get("MedewerkerNaam", "") or row.get("FullName", "")).strip(),
-                "sapnr": str(row.get("staffSAPNR", "")).strip(),
-                "costcenter":  str(cc_value).strip()
-            }
-
-        # --- SMART LOOKUP (Best Info) ---
-        best_info = {}
-        def add_info(sid, cname, date_behaald, date_valid, date_issued, status, source):
-            sid = str(sid).strip()
-            if not sid or not cname or sid not in my_department_gids:
-                return
-            key = (sid, self.normalize_certname(cname))
-            
-            dt = pd.to_datetime(date_behaald, errors='coerce')
-            valid = pd.to_datetime(date_valid, errors='coerce')
-            issued = pd.to_datetime(date_issued, errors='coerce')
-            
-            is_better = False
-            if key not in best_info: 
-                is_better = True
-            else:
-                curr = best_info[key]
-                if pd.notna(valid):
-                    if pd.isna(curr["valid"]) or valid > curr["valid"]: 
-                        is_better = True
-                elif pd.notna(dt):
-                    if pd.isna(curr["date"]) or dt > curr["date"]: 
-                        is_better = True
-            
-            if is_better:
-                best_info[key] = {"date": dt, "valid": valid, "issued": issued, "status": status, "source": source}
+        # --- SMART LOOKUP (Best Info): 1 rij per (staffGID, CertName_norm) ---
+        # Beste = laatste Geldig_Tot, daarna laatste Behaald (results én Excel overzicht)
+        def _info_frame(df, id_c, cert_c, date_c, valid_c, issued_c, status):
+            if df.empty or id_c not in df.columns or cert_c not in df.columns:
+                return None
+            def _dt(c):
+                if c and c in df.columns:
+                    return pd.to_datetime(df[c], errors="coerce")
+                return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+            return pd.DataFrame({
+                "staffGID": df[id_c].astype(str).str.strip(),
+                "CertName_norm": self._norm_series(df[cert_c]),
+                "_date": _dt(date_c),
+                "_valid": _dt(valid_c),
+                "_issued": _dt(issued_c),
+                "_status": status,
+            })
 
-        # Vul best_info uit Results en Excel
+        info_parts = []
         if not results.empty:
             r_id = next((c for c in ["staffGID", "MedewerkerID"] if c in results.columns), "staffGID")
             r_cert = next((c for c in ["CertName", "Certificaat"] if c in results.columns), "CertName")
             r_date = next((c for c in ["Behaald", "Behaald_Datum", "Exam_Date"] if c in results.columns), None)
             r_valid = next((c for c in ["Geldig_Tot", "ExpiryDate", "ValidUntil"] if c in results.columns), None)
             r_stat = next((c for c in ["Status", "Resultaat"] if c in results.columns), "Status")
-            for _, row in results.iterrows():
-                add_info(row. get(r_id), row.get(r_cert), row.get(r_date), row.get(r_valid), None, str(row.get(r_stat, "")), "results")
+            r_status = results[r_stat].astype(str) if r_stat in results.columns else ""
+            info_parts.append(_info_frame(results, r_id, r_cert, r_date, r_valid, None, r_status))
 
         if not certs_overview.empty:
             c_id = next((c for c in ["staffGID", "MedewerkerID"] if c in certs_overview.columns), "staffGID")
             c_cert = next((c for c in ["CertName", "Certificaat"] if c in certs_overview.columns), "CertName")
             c_valid = next((c for c in ["ExpiryDate", "Geldig_Tot"] if c in certs_overview.columns), None)
             c_issued = next((c for c in ["IssueDate", "Behaald"] if c in certs_overview.columns), None)
-            for _, row in certs_overview.iterrows():
-                add_info(row.get(c_id), row.get(c_cert), row.get(c_issued), row.get(c_valid), row.get(c_issued), "Certified", "certificates")
+            info_parts.append(_info_frame(certs_overview, c_id, c_cert, c_issued, c_valid, c_issued, "Certified"))
+
+        info_parts = [p for p in info_parts if p is not None and not p.empty]
+        best_info = None
+        if info_parts:
+            best_info = pd.concat(info_parts, ignore_index=True)
+            best_info = best_info[
+                (best_info["staffGID"] != "") & (best_info["CertName_norm"] != "") &
+                best_info["staffGID"].isin(my_department_gids)
+            ]
+            best_info = (
+                best_info.sort_values(["_valid", "_date"], na_position="first", kind="mergesort")
+                .drop_duplicates(["staffGID", "CertName_norm"], keep="last")
+            )
 
         # Inschrijvingen lookup
-        inschrijving_lookup = {}
+        inschrijvingen = None
         if not training_req.empty:
             tr_id = "staffGID" if "staffGID" in training_req.columns else id_col
             tr_cert = "CertName" if "CertName" in training_req.columns else "Certificaat"
-            for _, row in training_req.iterrows():
-                sid = str(row. get(tr_id, "")).strip()
-                if sid in my_department_gids:
-                    knorm = self.normalize_certname(str(row.get(tr_cert, "")))
-                    inschrijving_lookup[(sid, knorm)] = {
-                        "date": pd. to_datetime(row.get("ScheduledDate", pd.NaT)),
-                        "loc": str(row. get("Location", "")).strip()
-                    }
+            if tr_id in training_req.columns and tr_cert in training_req.columns:
+                inschrijvingen = pd.DataFrame({
+                    "staffGID": training_req[tr_id].astype(str).str.strip(),
+                    "CertName_norm": self._norm_series(training_req[tr_cert].astype(str)),
+                    "_ins_date": pd.to_datetime(training_req.get("ScheduledDate", pd.NaT), errors="coerce"),
+                    "_ins_loc": training_req["Location"].fillna("").astype(str).str.strip() if "Location" in training_req.columns else "",
+                })
+                inschrijvingen = inschrijvingen[inschrijvingen["staffGID"].isin(my_department_gids)]
+
+        # 4. GENEREREN (Volledige V17-DEBUG logica, kolomsgewijs)
+        cand, core_stats = self._generate_required_tasks(
+            cfg_nodig, staff, todo,
+            id_col=cfg_col, name_col="CertName",
+            lookups={"_ins": inschrijvingen, "_info": best_info},
+            closed_statuses=("afgewerkt", "gesloten"),
+            todo_norm_col="CertName_norm",
+        )
+        if core_stats["skip_geen_staff"]:
+            print(f"   ⚠️ Geen staff info voor {core_stats['skip_geen_staff']} config rijen - overgeslagen")
+        if cand.empty:
+            return
 
-        # 4. GENEREREN (Volledige V17-DEBUG logica)
-        new_tasks = []
         now = pd.Timestamp.now()
         today = pd.Timestamp.today().normalize()
-        debug_printed = 0
-        existing_tasks = set(
-            (str(r.get("staffGID", "")).strip(), str(r.get("CertName_norm", "")).strip())
-            for _, r in todo.iterrows()
-            if str(r.get("Status")).lower() not in ["afgewerkt", "gesloten"]
+        for c in ("_ins_date", "_date", "_valid", "_issued"):
+            cand[c] = pd.to_datetime(cand[c], errors="coerce") if c in cand.columns else pd.NaT
+
+        def _task_frame(sub, **extra):
+            return pd.DataFrame({
+                "staffGID": sub["staffGID"], "staffSAPNR": sub["_staff_sap"], "MedewerkerID": sub["staffGID"],
+                "MedewerkerNaam": sub["_staff_name"], "CostCenter": sub["_staff_cc"],
+                "CertName": sub["CertName"], "CertName_norm": sub["CertName_norm"], "TaskType": "Certificaat",
+                **extra,
+            }, index=sub.index)
+
+        # A. Check Inschrijving
+        ins = cand[cand["_ins"]]
+        ins_tasks = _task_frame(
+            ins,
+            Status="Ingeschreven",
+            Status_Detail="Ingepland op " + ins["_ins_date"].dt.strftime('%d-%m-%Y').fillna("?"),
+            Nodig=True, Ingeschreven_Datum=ins["_ins_date"], Ingeschreven_Locatie=ins["_ins_loc"],
+            CreatedAt=now, LastUpdatedAt=now, CreatedBy="sync_cert_tasks",
         )
 
-        for _, row in cfg_nodig.iterrows():
-            sid = str(row.get(cfg_col, "")).strip()
-            cert_raw = str(row.get("CertName", "")).strip()
-            cert_norm = self.normalize_certname(cert_raw)
-            
-            if sid not in my_department_gids or (sid, cert_norm) in existing_tasks: 
-                continue
-            s_info = staff_lookup. get(sid)
-            
-            # V19-FIX: Skip als we geen staff info hebben voor deze medewerker
-            if not s_info:
-                print(f"   ⚠️ Geen staff info voor {sid} - overgeslagen")
-                continue
-
-            # A. Check Inschrijving
-            if (sid, cert_norm) in inschrijving_lookup:
-                ins = inschrijving_lookup[(sid, cert_norm)]
-                new_tasks.append({
-                    "staffGID":  sid, "staffSAPNR": s_info["sapnr"], "MedewerkerID":  sid,
-                    "MedewerkerNaam": s_info["name"], "CostCenter": s_info["costcenter"],
-                    "CertName": cert_raw, "CertName_norm":  cert_norm, "TaskType": "Certificaat",
-                    "Status": "Ingeschreven", "Status_Detail": f"Ingepland op {ins['date'].strftime('%d-%m-%Y') if pd.notna(ins['date']) else '?'}",
-                    "Nodig": True, "Ingeschreven_Datum": ins["date"], "Ingeschreven_Locatie": ins["loc"],
-                    "CreatedAt": now, "LastUpdatedAt": now, "CreatedBy": "sync_cert_tasks"
-                })
-                continue
-
-            # B.  Bereken datums (De V17 functionaliteit)
-            info = best_info.get((sid, cert_norm))
-            status, detail, expiry, days_until, geldigheid = "Open", "Nog niet behaald", None, None, to_int_or_none(row.get("Interval_maanden"))
-
-            if info: 
-                if str(info["status"]).lower() in ["geslaagd", "passed", "certified", "ok", "behaald"]: 
-                    valid, issued = info["valid"], info["issued"]
-                    # 2099 / Oneindig fix
-                    if pd.notna(valid) and valid.year >= 2099:
-                        geldigheid = 0
-                    elif geldigheid is None and pd. notna(valid) and pd.notna(issued):
-                        diff = (valid - issued).days
-                        if diff > 300:
-                            geldigheid = int(round(diff / 30.44))
-
-                    if pd.isna(valid) and pd.notna(info["date"]) and geldigheid: 
-                        valid = info["date"] + pd.DateOffset(months=geldigheid)
-                    
-                    if pd.notna(valid):
-                        days_until = int((valid - today).days)
-                        if days_until > 180:
-                            continue  # Nog geldig
-                        detail = f"VERLOPEN - {abs(days_until)} dagen geleden" if days_until <= 0 else f"Verloopt binnenkort ({days_until} dagen)"
-                        expiry = valid
-                else:
-                    detail = "Niet geslaagd - Herkansing nodig"
-
-            new_tasks.append({
-                "staffGID": sid, "staffSAPNR": s_info["sapnr"], "MedewerkerID": sid,
-                "MedewerkerNaam":  s_info["name"], "CostCenter": s_info["costcenter"],
-                "CertName": cert_raw, "CertName_norm": cert_norm, "TaskType":  "Certificaat",
-                "Status":  status, "Status_Detail": detail, "Nodig": True,
-                "Geldigheid_maanden": geldigheid, "ExpiryDate": expiry, "DaysUntilExpiry": days_until,
-                "CreatedAt":  now, "LastUpdatedAt": now, "CreatedBy":  "sync_cert_tasks"
-            })
+        # B. Bereken datums (De V17 functionaliteit)
+        rest = cand[~cand["_ins"]]
+        geldigheid = (
+            np.trunc(pd.to_numeric(rest["Interval_maanden"], errors="coerce"))
+            if "Interval_maanden" in rest.columns else pd.Series(np.nan, index=rest.index)
+        )
+        passed = rest["_info"] & rest["_status"].astype(str).str.lower().isin(["geslaagd", "passed", "certified", "ok", "behaald"])
+        failed = rest["_info"] & ~passed
+        valid = rest["_valid"].where(passed)
+        issued = rest["_issued"]
+
+        # 2099 / Oneindig fix
+        oneindig = passed & (valid.dt.year >= 2099)
+        geldigheid = geldigheid.mask(oneindig, 0)
+        diff = (valid - issued).dt.days
+        afgeleid = passed & ~oneindig & geldigheid.isna() & valid.notna() & issued.notna() & (diff > 300)
+        geldigheid = geldigheid.mask(afgeleid, (diff / 30.44).round())
+
+        aanvullen = passed & valid.isna() & rest["_date"].notna() & geldigheid.notna() & (geldigheid != 0)
+        for maanden in geldigheid[aanvullen].unique():
+            sel = aanvullen & (geldigheid == maanden)
+            valid = valid.mask(sel, rest.loc[sel, "_date"] + pd.DateOffset(months=int(maanden)))
+
+        heeft_datum = passed & valid.notna()
+        days_until = (valid - today).dt.days.where(heeft_datum)
+        nog_geldig = heeft_datum & (days_until > 180)
+        days_txt = days_until.abs().astype("Int64").astype(str)
+
+        detail = np.select(
+            [heeft_datum & (days_until <= 0), heeft_datum, failed],
+            ["VERLOPEN - " + days_txt + " dagen geleden", "Verloopt binnenkort (" + days_txt + " dagen)", "Niet geslaagd - Herkansing nodig"],
+            default="Nog niet behaald",
+        )
+        open_tasks = _task_frame(
+            rest,
+            Status="Open", Status_Detail=detail, Nodig=True,
+            Geldigheid_maanden=geldigheid, ExpiryDate=valid.where(heeft_datum), DaysUntilExpiry=days_until,
+            CreatedAt=now, LastUpdatedAt=now, CreatedBy="sync_cert_tasks",
+        )[~nog_geldig]
 
         # 5. OPSLAAN - V20-FIX:  FutureWarning pd.concat opgelost
-        if new_tasks:
-            new_df = pd.DataFrame(new_tasks)
+        parts = [p for p in (ins_tasks, open_tasks) if not p.empty]
+        if parts:
+            # Originele config-volgorde behouden
+            new_df = pd.concat(parts).sort_index()
             # Verwijder lege kolommen om FutureWarning te voorkomen
             new_df = new_df.dropna(axis=1, how='all')
             if not todo.empty:
                 todo = todo.dropna(axis=1, how='all')
             self.df["todo"] = pd.concat([todo, new_df], ignore_index=True)
-            print(f"   ✅ {len(new_tasks)} nieuwe taken voor {self.active_costcenter}.")
-            if self.USE_SQL_FOR_TODO: 
+            print(f"   ✅ {len(new_df)} nieuwe taken voor {self.active_costcenter}.")
+            if self.USE_SQL_FOR_TODO:
                 self.save_todo_planner()
     
     def load_all(self, costcenter_filter: str = None) -> bool:
@@ -920,6 +1135,8 @@ class DataStore:
 
         self.errors = []
         self.active_costcenter = costcenter_filter
+        t_start = time.perf_counter()
+        summary = self.last_load_summary = {"costcenter": costcenter_filter, "gestart": datetime.now().isoformat(timespec="seconds")}
 
         print("\n" + "=" * 60)
         print(f"📊 DATA LADEN - Costcenter: {costcenter_filter or 'ALLE'}")
@@ -989,8 +1206,15 @@ class DataStore:
             # Dit stelt ons in staat om later te zien: "Hey, taak X hoort bij medewerker Y van afdeling W2".
             
             # Wel filteren op 'Actief' (mensen uit dienst hoeven we meestal niet meer)
+            # Inactieve GIDs bijhouden voor close_tasks_for_inactive_staff (STAP 14.5)
+            self.inactive_staff_gids = set()
             if "staffSTAFFSTATUSID" in staff.columns:
                 staff["staffSTAFFSTATUSID"] = pd.to_numeric(staff["staffSTAFFSTATUSID"], errors="coerce")
+                if "staffGID" in staff.columns:
+                    status = staff["staffSTAFFSTATUSID"]
+                    self.inactive_staff_gids = set(
+                        staff.loc[status.notna() & (status != 1), "staffGID"].astype(str).str.strip()
+                    )
                 staff = staff[staff["staffSTAFFSTATUSID"] == 1].copy()
 
             # FullName aanmaken (voor de UI)
@@ -1465,7 +1689,7 @@ class DataStore:
         # =========================================================
         # Dit repareert Franse/Engelse namen in de SQL database
         # VOORDAT de Todo Planner (Stap 13) gaat rekenen.
-        if self.USE_SQL_FOR_CONFIG:
+        if self.USE_SQL_FOR_CONFIG and self.AUTO_CLEAN_CONFIG:
             try:
                 # 1. Voer de cleanup uit op SQL (Certificaten)
                 self.clean_sql_config_names()
@@ -1576,43 +1800,11 @@ class DataStore:
         if not todo.empty and not staff.empty:
             print("   🔧 Data Verrijking: Ontbrekende medewerker-info aanvullen...")
             
-            # Zorg voor schone keys
+            # Kolomsgewijs: lege CostCenter/SAPNR/naam/ID via map op de staff-index
+            # (1x per load; STAP 17 hoeft niet opnieuw te verrijken)
             if "staffGID" in todo.columns and "staffGID" in staff.columns:
-                # Maak mapping dictionaries voor snelle lookup
                 staff["staffGID"] = staff["staffGID"].astype(str).str.strip()
-                
-                # Mapping: GID -> CostCenter
-                # Let op: 'staff' bevat nu ALLE medewerkers (dankzij Stap 1 fix), dus we vinden ook de 'vreemde'
-                cc_map = staff.set_index("staffGID")["CostCenter"].to_dict()
-                
-                # Mapping: GID -> SAPNR
-                sap_map = {}
-                if "staffSAPNR" in staff.columns:
-                    sap_map = staff.set_index("staffGID")["staffSAPNR"].to_dict()
-                
-                # Functie om CostCenter te fixen als het leeg is
-                def fix_cc(row):
-                    curr = str(row.get("CostCenter", "")).strip()
-                    if curr and curr.lower() != "nan" and curr.lower() != "none" and curr.lower() != "nat":
-                        return curr
-                    gid = str(row.get("staffGID", "")).strip()
-                    return cc_map.get(gid, "")
-
-                # Functie om SAPNR te fixen als het leeg is
-                def fix_sap(row):
-                    curr = str(row.get("staffSAPNR", "")).strip()
-                    if curr and curr.lower() != "nan" and curr.lower() != "none":
-                        return curr
-                    gid = str(row.get("staffGID", "")).strip()
-                    return sap_map.get(gid, "")
-
-                # Pas toe
-                todo["CostCenter"] = todo.apply(fix_cc, axis=1)
-                todo["staffSAPNR"] = todo.apply(fix_sap, axis=1)
-                
-                # Vul ook MedewerkerID (is vaak gelijk aan GID)
-                if "MedewerkerID" in todo.columns:
-                    todo["MedewerkerID"] = todo["MedewerkerID"].fillna(todo["staffGID"])
+                todo = self._enrich_todo_from_staff(todo, staff, fill_costcenter=True)
 
                 print(f"   ✅ Verrijking voltooid voor {len(todo)} taken.")
                 self.df["todo"] = todo
@@ -1656,6 +1848,9 @@ class DataStore:
                     df_cat["raw_text"] = df_cat["title"]
             self.training_catalog = df_cat
             print(f"   ✅ Training Catalog: {len(df_cat)} rijen" if not df_cat.empty else "   ℹ️ Training Catalog leeg")
+            idx = self._build_catalog_index()
+            if idx["url"] is not None:
+                print(f"   ✅ Catalog-index: {len(idx['norm'])} namen, {sum(len(m) for m in idx['codes'])} codes")
         except Exception as e:
             print(f"   ❌ FOUT: {e}")
             self.errors.append(f"❌ Kan training catalog niet laden: {e}")
@@ -1673,6 +1868,27 @@ class DataStore:
         except Exception as e: 
             print(f"   ⚠️ Fout bij bouwen zoeksets: {e}")
         print(f"   ✅ Zoeksets:  {len(self. all_cert_names)} certs, {len(self.all_competence_names)} comps")
+        try:
+            self._invalidate_name_index()
+            print(f"   ✅ Naam-index: {len(self._build_cert_display_map())} certnamen")
+        except Exception as e:
+            print(f"   ⚠️ Fout bij bouwen naam-index: {e}")
+        try:
+            idx = self._build_replacement_index(force=True)
+            print(f"   ✅ Vervangkandidaten-index: {len(idx['req'])} certs (training_req), {len(idx['todo'])} certs (todo)")
+        except Exception as e:
+            print(f"   ⚠️ Fout bij bouwen vervangkandidaten-index: {e}")
+        try:
+            self._profile_index = {}
+            idx = self._build_profile_index()
+            print(f"   ✅ Profiel-index: {len(idx['certificates']['rows'])} medewerkers met certificaten, {len(idx['config_cert']['rows'])} met config")
+        except Exception as e:
+            print(f"   ⚠️ Fout bij bouwen profiel-index: {e}")
+        try:
+            idx = self._build_search_index(force=True)
+            print(f"   ✅ Zoekindex: {len(idx['name'])} namen, {len(idx['grams'])} n-grams")
+        except Exception as e:
+            print(f"   ⚠️ Fout bij bouwen zoekindex: {e}")
 
         # =========================================================
         # STAP 13: SMART SYNC (Inschrijvingen & Failed Results)
@@ -1681,6 +1897,7 @@ class DataStore:
             try:
                 print("\n🔄 Sync inschrijvingen uit Training_Req...")
                 inschrijvingen_count = self.sync_inschrijvingen()
+                summary["inschrijvingen"] = int(inschrijvingen_count or 0)
                 if inschrijvingen_count > 0:
                     print(f"   ✅ {inschrijvingen_count} taken bijgewerkt met inschrijfdata")
                 else: 
@@ -1692,6 +1909,7 @@ class DataStore:
             try:
                 print("\n🔄 Sync niet-geslaagde resultaten uit Cert_Results...")
                 n_failed = self. sync_failed_results_to_todo()
+                summary["niet_geslaagd"] = int(n_failed or 0)
                 if n_failed > 0:
                     print(f"   ✅ {n_failed} niet-geslaagde taak/taken aangemaakt/heropend")
                 else: 
@@ -1706,6 +1924,7 @@ class DataStore:
         print("\n🔄 STAP 14: Status updates toepassen...")
         try:
             changes_count = self.close_finished_tasks()
+            summary["afgesloten"] = int(changes_count or 0)
             # Detecteer afwezigen bij afgelopen opleidingen
             self.detect_absent_from_completed_training()
             if changes_count and changes_count > 0:
@@ -1719,7 +1938,8 @@ class DataStore:
         # STAP 14. 5: Opschonen taken voor medewerkers die uit dienst zijn
         print("\n🧹 STAP 14.5: Taken opschonen voor inactieve medewerkers...")
         try:
-            inactief_count = self.close_tasks_for_inactive_staff()
+            inactief_count = int(self.close_tasks_for_inactive_staff().sum())
+            summary["afgesloten_inactief"] = inactief_count
             if inactief_count > 0:
                 print(f"   → {inactief_count} taken afgesloten (medewerkers uit dienst)")
         except Exception as e: 
@@ -1736,6 +1956,7 @@ class DataStore:
                 names_converted = self.convert_names_to_lastname_first()
                 if names_converted is None:
                     names_converted = 0
+                summary["namen_geconverteerd"] = int(names_converted)
                 if names_converted > 0:
                     print(f"   → {names_converted} namen geconverteerd")
                     needs_save = True
@@ -1782,6 +2003,7 @@ class DataStore:
                     rows_to_save["_SrcRowId"] = [str(uuid.uuid4()) for _ in range(len(rows_to_save))]
 
                     print(f"\n   💾 Opslaan subset:  {len(rows_to_save)} gewijzigde taken naar SQL...")
+                    summary["subset_opgeslagen"] = len(rows_to_save)
                     if self.USE_SQL_FOR_TODO and getattr(self, "sql_training_manager", None):
                         try:
                             success, mapping = self.sql_training_manager.save_todo_planner(rows_to_save)
@@ -1808,6 +2030,7 @@ class DataStore:
             print("\n🔍 STAP 16: Controleren op inschrijvingen zonder config...")
             check_result = self. check_training_req_against_config()
             missing_count = check_result. get("missing_count", 0) if isinstance(check_result, dict) else 0
+            summary["inschrijvingen_zonder_config"] = int(missing_count or 0)
             
             if missing_count > 0:
                 print(f"   ℹ️ INFO: {missing_count} inschrijving(en) gevonden die nog niet in config staan.")
@@ -1825,6 +2048,7 @@ class DataStore:
         print("🔄 STAP 17: Check voor nieuwe taken (veilige modus)...")
         print("=" * 60)
         
+        todo_before = len(self.df.get("todo", pd.DataFrame()))
         try: 
             if hasattr(self, "sync_cert_tasks"):
                 self.sync_cert_tasks()
@@ -1832,12 +2056,13 @@ class DataStore:
             if hasattr(self, "sync_competence_tasks"):
                 self. sync_competence_tasks()
             
-            if hasattr(self, "enrich_todo_with_staff_info"):
-                self.enrich_todo_with_staff_info()
+            # Staff-verrijking gebeurde al in STAP 10.5; nieuwe taken krijgen
+            # naam/SAPNR/MedewerkerID mee bij aanmaak.
             
             if hasattr(self, "save_todo"):
                 self.save_todo()
                 
+            summary["nieuwe_taken"] = len(self.df.get("todo", pd.DataFrame())) - todo_before
             print("✅ STAP 17: Sync voltooid (bestaande taken intact)")
             
         except Exception as e: 
@@ -1863,6 +2088,10 @@ class DataStore:
             for err in self.errors[:20]:
                 print(f"      - {err}")
         print("=" * 60 + "\n")
+        summary.update({
+            "staff": staff_count, "certificates": cert_count, "todo": todo_count,
+            "waarschuwingen": list(self.errors), "duur_s": round(time.perf_counter() - t_start, 1),
+        })
         
         return True
         # # STAP 12: HELPER SETS
@@ -2200,56 +2429,45 @@ class DataStore:
             config_cert[id_col] = config_cert[id_col].astype(str).str.strip()
             config_cert["CertName"] = config_cert["CertName"].astype(str).str.strip()
         
+        # Anti-join: (staff_id, CertName) uit training_req die niet in config staan
+        def _txt(df: pd.DataFrame, col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[col].astype(object).where(df[col].notna(), "").astype(str).str.strip()
+
+        req = training_req.assign(_sid=_txt(training_req, id_col), _cert=_txt(training_req, "CertName"))
+        req = req[(req["_sid"] != "") & (req["_cert"] != "")]
+        if not config_cert.empty and id_col in config_cert.columns and "CertName" in config_cert.columns:
+            cfg_keys = pd.MultiIndex.from_arrays([config_cert[id_col], config_cert["CertName"]])
+            req = req[~pd.MultiIndex.from_arrays([req["_sid"], req["_cert"]]).isin(cfg_keys)]
+
         missing_items = []
-        
-        for idx, row in training_req.iterrows():
-            staff_id = str(row.get(id_col, "")).strip()
-            cert_name = str(row.get("CertName", "")).strip()
-            
-            if not staff_id or not cert_name:
-                continue
-            
-            if config_cert.empty:
-                is_in_config = False
+        if not req.empty:
+            medewerker = _txt(req, "MedewerkerNaam")
+            medewerker = medewerker.where(medewerker.str.lower() != "nan", "")
+            if not staff.empty and id_col in staff.columns:
+                name_col = next((c for c in ["FullName", "Name+Firstname", "Naam"] if c in staff.columns), None)
+                if name_col:
+                    staff_ids = staff[id_col].astype(str).str.strip()
+                    staff_names = pd.Series(staff[name_col].astype(str).str.strip().to_numpy(), index=staff_ids)
+                    staff_names = staff_names[~staff_names.index.duplicated(keep="first")]
+                    medewerker = medewerker.where(medewerker != "", req["_sid"].map(staff_names).fillna(""))
+
+            date_col = "ScheduledDate" if "ScheduledDate" in req.columns else "ScheduledDateParsed"
+            if date_col in req.columns:
+                datum = pd.to_datetime(req[date_col], errors="coerce").dt.strftime("%d-%m-%Y").fillna("")
             else:
-                is_in_config = (
-                    (config_cert[id_col] == staff_id) & 
-                    (config_cert["CertName"] == cert_name)
-                ).any()
-            
-            if not is_in_config:
-                medewerker_naam = str(row.get("MedewerkerNaam", "")).strip()
-                if not medewerker_naam or medewerker_naam.lower() == "nan":
-                    if not staff.empty and id_col in staff.columns:
-                        staff_row = staff[staff[id_col].astype(str).str.strip() == staff_id]
-                        if not staff_row.empty:
-                            for name_col in ["FullName", "Name+Firstname", "Naam"]:
-                                if name_col in staff_row.columns:
-                                    medewerker_naam = str(staff_row.iloc[0][name_col]).strip()
-                                    break
-                
-                scheduled_date = row.get("ScheduledDate", row.get("ScheduledDateParsed", pd.NaT))
-                location = str(row.get("Location", "") or "").strip()
-                status = str(row.get("RequestStatus", "") or "").strip()
-                costcenter = str(row.get("CostCenter", "") or "").strip()
-                
-                date_str = ""
-                if pd.notna(scheduled_date):
-                    try:
-                        dt = pd.to_datetime(scheduled_date)
-                        date_str = dt.strftime("%d-%m-%Y")
-                    except:
-                        pass
-                
-                missing_items.append({
-                    "staff_id": staff_id,
-                    "medewerker": medewerker_naam or staff_id,
-                    "cert_name": cert_name,
-                    "scheduled_date": date_str,
-                    "location": location,
-                    "status": status,
-                    "costcenter": costcenter,
-                })
+                datum = pd.Series("", index=req.index)
+
+            missing_items = pd.DataFrame({
+                "staff_id": req["_sid"],
+                "medewerker": medewerker.where(medewerker != "", req["_sid"]),
+                "cert_name": req["_cert"],
+                "scheduled_date": datum,
+                "location": _txt(req, "Location"),
+                "status": _txt(req, "RequestStatus"),
+                "costcenter": _txt(req, "CostCenter"),
+            }).to_dict("records")
         
         result["missing_count"] = len(missing_items)
         result["missing_items"] = missing_items
@@ -2360,342 +2578,134 @@ class DataStore:
 
         self.df["competences"] = df
 
-    # def sync_competence_tasks(self):
-        # """
-        # ULTIMATE VERSION: sync_competence_tasks.
-        # Combineert V10 (volledige functionaliteit) met V11 (afdelingsbeveiliging).
-        # Voorkomt 'NameError: my_department_gids' en 'Invalid column name: Competence'.
-        # """
-        # print("\n" + "="*60)
-        # print(f"🔄 sync_competence_tasks() - AFDELING: {self.active_costcenter}")
-        # print("="*60)
-        
-        # # 1. LAAD BENODIGDE DATA
-        # cfg = self.df.get("competence_config", pd.DataFrame())
-        # staff = self.df.get("staff", pd.DataFrame())
-        # competences = self.df.get("competences", pd.DataFrame())
-        # todo = self.df.get("todo", pd.DataFrame())
-        
-        # if cfg.empty or staff.empty:
-            # print("   ⚠️ Geen competentie config of staff data - niets te doen")
-            # return
-        
-        # # 2. BEPAAL GIDS VAN DE ACTIEVE AFDELING (De lek-dichting)
-        # id_col = self.get_id_column() or "staffGID"
-        # # We gebruiken 'valid_staff_ids' om consistent te blijven met load_all
-        # valid_staff_ids = set(staff[id_col].astype(str).str.strip().unique())
-        
-        # cfg_id_col = id_col if id_col in cfg.columns else "staffGID"
-        # def is_true(x): return str(x).lower() in ['true', '1', 'ja', 'yes', 't']
-
-        # # Filter config: Alleen jouw mensen van dit CC & alleen als 'Nodig' aan staat
-        # cfg_filtered = cfg[cfg[cfg_id_col].astype(str).str.strip().isin(valid_staff_ids)].copy()
-        # cfg_nodig = cfg_filtered[cfg_filtered["Nodig"].apply(is_true)].copy()
-        
-        # print(f"   📊 Config voor {self.active_costcenter}: {len(cfg_nodig)} rijen met Nodig=Aan.")
-        
-        # if cfg_nodig.empty:
-            # print(f"   ✅ Geen vaardigheden met Nodig=True voor dit costcenter")
-            # return
-
-        # # 3. LOOKUPS BOUWEN (Alleen voor relevante medewerkers)
-        # comp_lookup = {}
-        # if not competences.empty:
-            # comp_id_col = id_col if id_col in competences.columns else "staffGID"
-            # comp_name_col = next((c for c in ["Competence", "CompName", "Vaardigheid"] if c in competences.columns), "Competence")
-            # for _, row in competences.iterrows():
-                # sid = str(row.get(comp_id_col, "")).strip()
-                # if sid in valid_staff_ids:
-                    # cnorm = self.normalize_certname(str(row.get(comp_name_col, "")))
-                    # comp_lookup[(sid, cnorm)] = row
-
-        # existing_tasks = set()
-        # if not todo.empty:
-            # t_id = id_col if id_col in todo.columns else "staffGID"
-            # for _, row in todo.iterrows():
-                # sid = str(row.get(t_id, "")).strip()
-                # if sid in valid_staff_ids:
-                    # cnorm = self.normalize_certname(str(row.get("CertName", "")))
-                    # stat = str(row.get("Status", "")).lower()
-                    # if str(row.get("TaskType", "")).lower() == "vaardigheid":
-                        # if stat not in ["afgewerkt", "closed", "gesloten"]:
-                            # existing_tasks.add((sid, cnorm))
-
-        # staff_lookup = {}
-        # for _, row in staff.iterrows():
-            # sid = str(row.get(id_col, "")).strip()
-            # staff_lookup[sid] = {
-                # "name": str(row.get("MedewerkerNaam", row.get("FullName", ""))).strip(),
-                # "cc": str(row.get("staffCOSTCENTER315", row.get("CostCenter", ""))).strip(),
-                # "sap": str(row.get("staffSAPNR", "")).strip()
-            # }
-
-        # # 4. VERWERK & GENEREER (Met alle V10 stats)
-        # new_tasks = []
-        # stats = {"nieuw": 0, "renewal": 0, "skip_actief": 0, "skip_taak_bestaat": 0, "skip_geen_staff": 0, "naam_genormaliseerd": 0}
-        
-        # now = datetime.now()
-        # threshold_days = 180
-        # comp_col = "Competence" if "Competence" in cfg_nodig.columns else "CertName"
-
-        # for idx, row in cfg_nodig.iterrows():
-            # sid = str(row.get(cfg_id_col, "")).strip()
-            # comp_name_original = str(row.get(comp_col, "")).strip()
-            # comp_name = self.normalize_certname(comp_name_original)
-            
-            # if comp_name != comp_name_original.lower(): # Kleine indicatie van normalisatie
-                # stats["naam_genormaliseerd"] += 1
-            
-            # # Veiligheid: dubbele check of ID in onze CC lijst zit
-            # if sid not in valid_staff_ids:
-                # stats["skip_geen_staff"] += 1
-                # continue
-            
-            # if (sid, comp_name) in existing_tasks:
-                # stats["skip_taak_bestaat"] += 1
-                # continue
-
-            # s_info = staff_lookup.get(sid)
-            # if not s_info: 
-                # stats["skip_geen_staff"] += 1
-                # continue
-
-            # # Status bepaling
-            # status, detail, expiry, days = "Open", "Vaardigheid nog niet behaald", None, None
-            # exist = comp_lookup.get((sid, comp_name))
-            
-            # if exist is not None:
-                # exp_col = next((c for c in ["ValidUntil", "ExpiryDate", "Valid_Until"] if c in exist.index), None)
-                # if exp_col and pd.notna(exist[exp_col]):
-                    # val_str = str(exist[exp_col]).lower()
-                    
-                    # # 🔥 FIX: Als er "onbeperkt" staat, is de competentie geldig -> SKIP taak
-                    # if "onbeperkt" in val_str or "unlimited" in val_str:
-                        # stats["skip_actief"] += 1
-                        # continue
-                    
-                    # try:
-                        # expiry = pd.to_datetime(exist[exp_col], errors='coerce')
-                        # if pd.notna(expiry):
-                            # days = int((expiry - now).days)
-                            # if days > threshold_days: 
-                                # stats["skip_actief"] += 1
-                                # continue 
-                            # status, detail = "Open", f"Vernieuwing nodig ({days} dagen)"
-                            # stats["renewal"] += 1
-                    # except Exception as e:
-                        # # Als de datum-conversie mislukt, loggen we het en gaan we door
-                        # print(f"⚠️ Datumfout bij {sid} - {comp_name}: {e}")
-                        # status, detail = "Open", "Check datum formaat"
-                # else:
-                    # # Gevonden in behaald maar geen verloopdatum -> OK, niet toevoegen
-                    # stats["skip_actief"] += 1
-                    # continue 
-
-            # # Taak toevoegen (Dit staat nu BUITEN de try-except van de datum)
-            # new_tasks.append({
-                # "staffGID": sid, 
-                # "staffSAPNR": s_info["sap"], 
-                # "MedewerkerID": sid,
-                # "MedewerkerNaam": s_info["name"], 
-                # "CostCenter": s_info["cc"],
-                # "CertName": comp_name_original, 
-                # "CertName_norm": comp_name, 
-                # "TaskType": "Vaardigheid",
-                # "Status": status, 
-                # "Status_Detail": detail, 
-                # "Nodig": True,
-                # "Strategisch": row.get("Strategisch", False),
-                # "Commentaar": row.get("Commentaar", "") or row.get("Opmerking", ""),
-                # "ExpiryDate": expiry, 
-                # "DaysUntilExpiry": days,
-                # "CreatedAt": now, 
-                # "LastUpdatedAt": now, 
-                # "CreatedBy": "sync_competence_tasks"
-            # })
-            # stats["nieuw"] += 1
- 
-
-        # # 5. SAMENVOEGEN & OPSLAAN
-        # if new_tasks:
-            # self.df["todo"] = pd.concat([todo, pd.DataFrame(new_tasks)], ignore_index=True)
-            # if self.USE_SQL_FOR_TODO: 
-                # self.save_todo_planner()
-        
-        # # 6. VOLLEDIGE V10 RAPPORTAGE
-        # print(f"\n✅ sync_competence_tasks() RESULTAAT:")
-        # print(f"   • Nieuwe vaardigheden: {stats['nieuw']}")
-        # print(f"   • Vernieuwingen nodig: {stats['renewal']}")
-        # print(f"   • Overgeslagen (nog geldig): {stats['skip_actief']}")
-        # print(f"   • Overgeslagen (taak bestaat): {stats['skip_taak_bestaat']}")
-        # print(f"   • Overgeslagen (niet in costcenter): {stats['skip_geen_staff']}")
-        # print(f"   • 🔄 Namen genormaliseerd: {stats['naam_genormaliseerd']}")
-        # print(f"   • TOTAAL NIEUWE TAKEN: {len(new_tasks)}")
-        # print("="*60)
     def sync_competence_tasks(self):
         """
-        ULTIMATE VERSION:  sync_competence_tasks. 
+        ULTIMATE VERSION:  sync_competence_tasks.
         Combineert V10 (volledige functionaliteit) met V11 (afdelingsbeveiliging).
-        Voorkomt 'NameError:  my_department_gids' en 'Invalid column name:  Competence'. 
+        Voorkomt 'NameError:  my_department_gids' en 'Invalid column name:  Competence'.
+        V12: Kolomsgewijs via _generate_required_tasks() (zelfde kern als sync_cert_tasks).
         """
+        import numpy as np
+
         print("\n" + "="*60)
         print(f"🔄 sync_competence_tasks() - AFDELING: {self. active_costcenter}")
         print("="*60)
-        
+
         # 1. LAAD BENODIGDE DATA
         cfg = self.df. get("competence_config", pd.DataFrame())
         staff = self.df.get("staff", pd. DataFrame())
         competences = self.df. get("competences", pd.DataFrame())
         todo = self.df.get("todo", pd. DataFrame())
-        
+
         if cfg.empty or staff.empty:
             print("   ⚠️ Geen competentie config of staff data - niets te doen")
             return
-        
+
         # 2. BEPAAL GIDS VAN DE ACTIEVE AFDELING
         id_col = self.get_id_column() or "staffGID"
         valid_staff_ids = set(staff[id_col].astype(str).str.strip().unique())
-        
+
         cfg_id_col = id_col if id_col in cfg.columns else "staffGID"
-        def is_true(x): return str(x).lower() in ['true', '1', 'ja', 'yes', 't']
 
         # Filter config:  Alleen jouw mensen van dit CC & alleen als 'Nodig' aan staat
-        cfg_filtered = cfg[cfg[cfg_id_col].astype(str).str.strip().isin(valid_staff_ids)].copy()
-        cfg_nodig = cfg_filtered[cfg_filtered["Nodig"]. apply(is_true)].copy()
-        
+        cfg_filtered = cfg[cfg[cfg_id_col].astype(str).str.strip().isin(valid_staff_ids)]
+        cfg_nodig = cfg_filtered[self._truthy_mask(cfg_filtered["Nodig"])].copy()
+
         print(f"   📊 Config voor {self.active_costcenter}:  {len(cfg_nodig)} rijen met Nodig=Aan.")
-        
+
         if cfg_nodig. empty:
             print(f"   ✅ Geen vaardigheden met Nodig=True voor dit costcenter")
             return
 
-        # 3. LOOKUPS BOUWEN
-        comp_lookup = {}
+        # 3. LOOKUPS BOUWEN (behaalde competenties, 1 rij per staffGID + norm)
+        behaald = None
         if not competences.empty:
             comp_id_col = id_col if id_col in competences. columns else "staffGID"
             comp_name_col = next((c for c in ["Competence", "CompName", "Vaardigheid"] if c in competences. columns), "Competence")
-            for _, row in competences. iterrows():
-                sid = str(row. get(comp_id_col, "")).strip()
-                if sid in valid_staff_ids: 
-                    cnorm = self.normalize_certname(str(row.get(comp_name_col, "")))
-                    comp_lookup[(sid, cnorm)] = row
-
-        existing_tasks = set()
-        if not todo.empty:
-            t_id = id_col if id_col in todo.columns else "staffGID"
-            for _, row in todo. iterrows():
-                sid = str(row.get(t_id, "")).strip()
-                if sid in valid_staff_ids:
-                    cnorm = self.normalize_certname(str(row.get("CertName", "")))
-                    stat = str(row.get("Status", "")).lower()
-                    if str(row.get("TaskType", "")).lower() == "vaardigheid":
-                        if stat not in ["afgewerkt", "closed", "gesloten"]: 
-                            existing_tasks.add((sid, cnorm))
-
-        staff_lookup = {}
-        for _, row in staff. iterrows():
-            sid = str(row.get(id_col, "")).strip()
-            staff_lookup[sid] = {
-                "name": str(row.get("MedewerkerNaam", row.get("FullName", ""))).strip(),
-                "cc": str(row.get("staffCOSTCENTER315", row.get("CostCenter", ""))).strip(),
-                "sap": str(row.get("staffSAPNR", "")).strip()
-            }
+            exp_col = next((c for c in ["ValidUntil", "ExpiryDate", "Valid_Until"] if c in competences.columns), None)
+            if comp_id_col in competences.columns and comp_name_col in competences.columns:
+                behaald = pd.DataFrame({
+                    "staffGID": competences[comp_id_col].astype(str).str.strip(),
+                    "CertName_norm": self._norm_series(competences[comp_name_col].astype(str)),
+                    "_exp_raw": competences[exp_col] if exp_col else np.nan,
+                })
+                behaald = behaald[behaald["staffGID"].isin(valid_staff_ids)]
 
         # 4. VERWERK & GENEREER
-        new_tasks = []
-        stats = {"nieuw": 0, "renewal": 0, "skip_actief":  0, "skip_taak_bestaat": 0, "skip_geen_staff": 0, "naam_genormaliseerd": 0}
-        
-        now = datetime.now()
-        threshold_days = 180
         comp_col = "Competence" if "Competence" in cfg_nodig. columns else "CertName"
+        cand, core_stats = self._generate_required_tasks(
+            cfg_nodig, staff, todo,
+            id_col=cfg_id_col, name_col=comp_col,
+            lookups={"_behaald": behaald},
+            task_type="vaardigheid",
+            closed_statuses=("afgewerkt", "closed", "gesloten"),
+            todo_norm_col=None,
+        )
+        stats = {"nieuw": 0, "renewal": 0, "skip_actief":  0, **core_stats}
 
-        for idx, row in cfg_nodig.iterrows():
-            sid = str(row.get(cfg_id_col, "")).strip()
-            comp_name_original = str(row.get(comp_col, "")).strip()
-            comp_name = self. normalize_certname(comp_name_original)
-            
-            if comp_name != comp_name_original. lower():
-                stats["naam_genormaliseerd"] += 1
-            
-            # Veiligheid:  dubbele check of ID in onze CC lijst zit
-            if sid not in valid_staff_ids:
-                stats["skip_geen_staff"] += 1
-                continue
-            
-            if (sid, comp_name) in existing_tasks:
-                stats["skip_taak_bestaat"] += 1
-                continue
-
-            s_info = staff_lookup.get(sid)
-            if not s_info:  
-                stats["skip_geen_staff"] += 1
-                continue
-
-            # Status bepaling
-            status, detail, expiry, days = "Open", "Vaardigheid nog niet behaald", None, None
-            exist = comp_lookup.get((sid, comp_name))
-            
-            if exist is not None:
-                # Competentie GEVONDEN in behaald - check vervaldatum
-                exp_col = next((c for c in ["ValidUntil", "ExpiryDate", "Valid_Until"] if c in exist. index), None)
-                if exp_col and pd.notna(exist[exp_col]):
-                    val_str = str(exist[exp_col]).lower()
-                    
-                    # Als er "onbeperkt" staat, is de competentie geldig -> SKIP taak
-                    if "onbeperkt" in val_str or "unlimited" in val_str:
-                        stats["skip_actief"] += 1
-                        continue
-                    
-                    try:
-                        expiry = pd.to_datetime(exist[exp_col], errors='coerce')
-                        if pd. notna(expiry):
-                            days = int((expiry - now).days)
-                            if days > threshold_days:  
-                                stats["skip_actief"] += 1
-                                continue 
-                            status, detail = "Open", f"Vernieuwing nodig ({days} dagen)"
-                            stats["renewal"] += 1
-                    except Exception as e: 
-                        print(f"⚠️ Datumfout bij {sid} - {comp_name}:  {e}")
-                        status, detail = "Open", "Check datum formaat"
-                else:
-                    # Gevonden in behaald maar geen verloopdatum -> competentie is geldig
-                    stats["skip_actief"] += 1
-                    continue
-            else: 
-                # Competentie NIET gevonden in behaald -> taak nodig!
-                status = "Open"
-                detail = "Nieuwe vaardigheid nodig"
-
-            # Taak toevoegen
-            new_tasks.append({
-                "staffGID": sid, 
-                "staffSAPNR": s_info["sap"], 
-                "MedewerkerID": sid,
-                "MedewerkerNaam":  s_info["name"], 
-                "CostCenter": s_info["cc"],
-                "CertName": comp_name_original, 
-                "CertName_norm": comp_name, 
+        now = datetime.now()
+        threshold_days = 180
+        new_df = pd.DataFrame()
+
+        if not cand.empty:
+            gevonden = cand["_behaald"]
+            raw = cand["_exp_raw"] if "_exp_raw" in cand.columns else pd.Series(np.nan, index=cand.index)
+            heeft_exp = gevonden & raw.notna()
+            raw_lc = raw.astype(str).str.lower()
+
+            # Als er "onbeperkt" staat, is de competentie geldig -> SKIP taak
+            onbeperkt = heeft_exp & (raw_lc.str.contains("onbeperkt", regex=False) | raw_lc.str.contains("unlimited", regex=False))
+            expiry = pd.to_datetime(raw.where(heeft_exp & ~onbeperkt), errors="coerce")
+            days = (expiry - now).dt.days
+            renewal = heeft_exp & ~onbeperkt & expiry.notna()
+            nog_geldig = renewal & (days > threshold_days)
+            renewal &= ~nog_geldig
+            # Gevonden in behaald maar geen verloopdatum -> competentie is geldig
+            skip = onbeperkt | nog_geldig | (gevonden & ~heeft_exp)
+
+            detail = np.select(
+                [renewal, ~gevonden],
+                ["Vernieuwing nodig (" + days.astype("Int64").astype(str) + " dagen)", "Nieuwe vaardigheid nodig"],
+                default="Vaardigheid nog niet behaald",
+            )
+            if "Commentaar" in cand.columns:
+                commentaar = cand["Commentaar"].fillna("").astype(str)
+            else:
+                commentaar = pd.Series("", index=cand.index)
+            if "Opmerking" in cand.columns:
+                commentaar = commentaar.where(commentaar != "", cand["Opmerking"].fillna("").astype(str))
+
+            new_df = pd.DataFrame({
+                "staffGID": cand["staffGID"],
+                "staffSAPNR": cand["_staff_sap"],
+                "MedewerkerID": cand["staffGID"],
+                "MedewerkerNaam": cand["_staff_name"],
+                "CostCenter": cand["_staff_cc"],
+                "CertName": cand["CertName"],
+                "CertName_norm": cand["CertName_norm"],
                 "TaskType": "Vaardigheid",
-                "Status": status, 
-                "Status_Detail": detail, 
+                "Status": "Open",
+                "Status_Detail": detail,
                 "Nodig": True,
-                "Strategisch":  row.get("Strategisch", False),
-                "Commentaar":  row.get("Commentaar", "") or row.get("Opmerking", ""),
-                "ExpiryDate": expiry, 
-                "DaysUntilExpiry": days,
-                "CreatedAt": now, 
-                "LastUpdatedAt":  now, 
-                "CreatedBy": "sync_competence_tasks"
-            })
-            stats["nieuw"] += 1
+                "Strategisch": cand["Strategisch"] if "Strategisch" in cand.columns else False,
+                "Commentaar": commentaar,
+                "ExpiryDate": expiry,
+                "DaysUntilExpiry": days.where(renewal),
+                "CreatedAt": now,
+                "LastUpdatedAt": now,
+                "CreatedBy": "sync_competence_tasks",
+            }, index=cand.index)[~skip]
+
+            stats["skip_actief"] = int(skip.sum())
+            stats["renewal"] = int((renewal & ~skip).sum())
+            stats["nieuw"] = len(new_df)
 
         # 5. SAMENVOEGEN & OPSLAAN
-        if new_tasks: 
-            self.df["todo"] = pd.concat([todo, pd.DataFrame(new_tasks)], ignore_index=True)
-            if self.USE_SQL_FOR_TODO:  
+        if not new_df.empty:
+            self.df["todo"] = pd.concat([todo, new_df], ignore_index=True)
+            if self.USE_SQL_FOR_TODO:
                 self. save_todo_planner()
-        
+
         # 6. VOLLEDIGE RAPPORTAGE
         print(f"\n✅ sync_competence_tasks() RESULTAAT:")
         print(f"   • Nieuwe vaardigheden: {stats['nieuw']}")
@@ -2704,7 +2714,7 @@ class DataStore:
         print(f"   • Overgeslagen (taak bestaat): {stats['skip_taak_bestaat']}")
         print(f"   • Overgeslagen (niet in costcenter): {stats['skip_geen_staff']}")
         print(f"   • 🔄 Namen genormaliseerd:  {stats['naam_genormaliseerd']}")
-        print(f"   • TOTAAL NIEUWE TAKEN: {len(new_tasks)}")
+        print(f"   • TOTAAL NIEUWE TAKEN: {len(new_df)}")
         print("="*60)
     
     def _append_comment(self, existing_comment: Any, new_info: str) -> str:
@@ -2773,8 +2783,83 @@ class DataStore:
                 "LaatsteWijziging": pd.Timestamp.now()
             }
             self.df["config_cert"] = pd.concat([df_cfg, pd.DataFrame([new_row])], ignore_index=True)
-            
+
         return success
+
+    def add_medewerker_configs(self, cert_name: str = None, staff_ids=None, pairs=None,
+                               nodig: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Bulk-variant van add_medewerker_config: 1 certificaat voor veel medewerkers
+        (cert_name + staff_ids) of een frame/lijst van (staffGID, CertName) paren.
+        SQL: 1 MERGE via sql_training_manager.add_medewerker_configs; daarna wordt
+        config_cert (en de 'config' alias) in het geheugen bijgewerkt.
+        Returns frame (ConfigID, staffGID, CertName, CertName_norm, Nodig, Action = INSERT/UPDATE)
+        of None bij fout.
+        """
+        if pairs is None:
+            pairs = pd.DataFrame({"staffGID": list(staff_ids or []), "CertName": cert_name})
+        elif not isinstance(pairs, pd.DataFrame):
+            pairs = pd.DataFrame(list(pairs), columns=["staffGID", "CertName"])
+
+        if self.sql_training_manager is None:
+            print("⚠️ Geen SQL connectie beschikbaar via sql_training_manager.")
+            return None
+        result = self.sql_training_manager.add_medewerker_configs(pairs, nodig=nodig)
+        if result is None or result.empty:
+            return result
+
+        res = result.copy()
+        res["staffGID"] = res["staffGID"].astype(str).str.strip()
+        res["Nodig"] = res["Nodig"].astype(bool)
+        now = pd.Timestamp.now()
+
+        cfg = self.df.get("config_cert", pd.DataFrame())
+        is_alias = self.df.get("config") is cfg
+
+        # 1. UPDATE: Nodig + LaatsteWijziging op de bestaande rijen
+        upd = res[res["Action"] == "UPDATE"]
+        if not upd.empty and not cfg.empty and {"staffGID", "CertName_norm"} <= set(cfg.columns):
+            key = pd.MultiIndex.from_arrays([
+                cfg["staffGID"].astype(str).str.strip(), cfg["CertName_norm"].astype(str).str.strip(),
+            ])
+            nodig_map = pd.Series(upd["Nodig"].to_numpy(),
+                                  index=pd.MultiIndex.from_arrays([upd["staffGID"], upd["CertName_norm"]]))
+            hit = key.isin(nodig_map.index)
+            if hit.any():
+                cfg = cfg.copy()
+                cfg.loc[hit, "Nodig"] = nodig_map.reindex(key[hit]).to_numpy()
+                cfg.loc[hit, "LaatsteWijziging"] = now
+
+        # 2. INSERT: nieuwe rijen (MedewerkerNaam zoals add_medewerker_config)
+        ins = res[res["Action"] == "INSERT"]
+        if not ins.empty:
+            staff = self.df.get("staff", pd.DataFrame())
+            namen = pd.Series(dtype=object)
+            if not staff.empty and "staffGID" in staff.columns:
+                s = staff.drop_duplicates("staffGID")
+                namen = pd.Series(
+                    (s.get("staffLASTNAME", pd.Series("", index=s.index)).fillna("").astype(str) + ", "
+                     + s.get("staffFIRSTNAME", pd.Series("", index=s.index)).fillna("").astype(str)).str.strip(", ").to_numpy(),
+                    index=s["staffGID"].astype(str).str.strip().to_numpy(),
+                )
+            m_naam = ins["staffGID"].map(namen)
+            new_rows = pd.DataFrame({
+                "ConfigID": ins["ConfigID"],
+                "staffGID": ins["staffGID"],
+                "MedewerkerNaam": m_naam.where(m_naam.notna(), "Onbekend (" + ins["staffGID"] + ")"),
+                "CertName": ins["CertName"],
+                "CertName_norm": ins["CertName_norm"],
+                "Nodig": ins["Nodig"],
+                "Strategisch": False,
+                "Interval_maanden": 0,
+                "LaatsteWijziging": now,
+            })
+            cfg = pd.concat([cfg, new_rows], ignore_index=True)
+
+        self.df["config_cert"] = cfg
+        if is_alias:
+            self.df["config"] = cfg
+        return result
     
    
     # --- HELPER FUNCTIE ---
@@ -2932,6 +3017,8 @@ class DataStore:
         Doel: als iemand niet geslaagd is maar er nog geen taak bestaat, toch een open taak tonen.
         
         V2-FIX: CostCenter lookup volgorde aangepast om te werken na kolom-hernoemen in load_all().
+        V3: Set-based. Laatste resultaat per (staffGID, CertName_norm), daarna 1 merge met
+            de todo-sleutels om te classificeren: overslaan / heropenen / nieuw (alles in bulk).
         """
         import pandas as pd
 
@@ -2945,19 +3032,11 @@ class DataStore:
         id_col = self.get_id_column() or "staffGID"
 
         # bepaal kolommen in results
-        res_id_col = None
-        for c in ("staffGID", "staffSAPNR", id_col):
-            if c in results. columns:
-                res_id_col = c
-                break
+        res_id_col = next((c for c in ("staffGID", "staffSAPNR", id_col) if c in results.columns), None)
         if not res_id_col:
             return 0
 
-        res_cert_col = None
-        for c in ("CertName", "Certificaat"):
-            if c in results.columns:
-                res_cert_col = c
-                break
+        res_cert_col = next((c for c in ("CertName", "Certificaat") if c in results.columns), None)
         if not res_cert_col:
             return 0
 
@@ -2965,44 +3044,38 @@ class DataStore:
         if not res_status_col:
             return 0
 
-        res_date_col = None
-        for c in ("Behaald", "Exam_Date", "ExamDate", "Einde_sessie", "CompletedDate"):
-            if c in results.columns:
-                res_date_col = c
-                break
+        res_date_col = next((c for c in ("Behaald", "Exam_Date", "ExamDate", "Einde_sessie", "CompletedDate") if c in results.columns), None)
 
         # normaliseer staff ids set (costcenter selectie)
         staff_ids = set(staff[id_col].astype(str).str.strip().unique()) if id_col in staff.columns else set()
         if not staff_ids: 
             return 0
 
-        # normalize results
-        df = results.copy()
-        df[res_id_col] = df[res_id_col].astype(str).str.strip()
-        df[res_cert_col] = df[res_cert_col].astype(str).str.strip()
-        df["CertName_norm"] = df[res_cert_col].apply(self.normalize_certname)
-        df[res_status_col] = df[res_status_col]. astype(str).str.strip().str.lower()
-        if res_date_col:
-            df[res_date_col] = pd.to_datetime(df[res_date_col], errors="coerce")
+        keys = ["staffGID", "CertName_norm"]
+
+        # normalize results (enkel de kolommen die we nodig hebben)
+        df = pd.DataFrame({
+            "staffGID": results[res_id_col].astype(str).str.strip(),
+            "CertName": results[res_cert_col].astype(str).str.strip(),
+            "_status": results[res_status_col].astype(str).str.strip().str.lower(),
+            "_datum": pd.to_datetime(results[res_date_col], errors="coerce") if res_date_col else pd.NaT,
+        })
 
         # filter op huidig costcenter
-        df = df[df[res_id_col]. isin(staff_ids)].copy()
+        df = df[df["staffGID"].isin(staff_ids) & (df["staffGID"] != "")]
         if df.empty:
             return 0
+        df["CertName_norm"] = self._norm_series(df["CertName"])
+        df = df[df["CertName_norm"] != ""]
 
         failed_statuses = {"not certified", "failed", "niet geslaagd", "gefaald", "mislukt"}
-        certified_statuses = {"certified", "passed", "geslaagd", "behaald", "ok"}
 
         # Neem per medewerker+cert de meest recente result (of laatste rij als geen datum)
-        sort_cols = [res_id_col, "CertName_norm"]
-        if res_date_col: 
-            df = df.sort_values(sort_cols + [res_date_col], ascending=[True, True, False], kind="mergesort")
-        else:
-            df = df.sort_values(sort_cols, ascending=[True, True], kind="mergesort")
-        df = df.drop_duplicates(subset=[res_id_col, "CertName_norm"], keep="first").copy()
+        df = df.sort_values("_datum", ascending=False, kind="mergesort")
+        latest = df.groupby(keys, sort=False).head(1)
 
         # Bepaal welke combos latest = failed
-        df_failed = df[df[res_status_col]. isin(failed_statuses)].copy()
+        df_failed = latest[latest["_status"].isin(failed_statuses)]
         if df_failed. empty:
             return 0
 
@@ -3010,103 +3083,85 @@ class DataStore:
         todo_df = todo. copy() if todo is not None else pd. DataFrame()
         if todo_df.empty:
             todo_df = pd. DataFrame(columns=["staffGID", "CertName_norm", "TaskType", "Status"])
+        if not todo_df.index.is_unique:
+            todo_df = todo_df.reset_index(drop=True)
         if "staffGID" in todo_df.columns:
             todo_df["staffGID"] = todo_df["staffGID"]. astype(str).str.strip()
         if "CertName_norm" not in todo_df. columns and "CertName" in todo_df.columns:
-            todo_df["CertName_norm"] = todo_df["CertName"].astype(str).apply(self.normalize_certname)
+            todo_df["CertName_norm"] = self._norm_series(todo_df["CertName"].astype(str))
+
+        # Per todo-sleutel: is er al een actieve taak? + eerste rij (kandidaat om te heropenen)
+        if "staffGID" in todo_df.columns and "CertName_norm" in todo_df.columns and not todo_df.empty:
+            status_lc = (
+                todo_df["Status"].fillna("").astype(str).str.strip().str.lower()
+                if "Status" in todo_df.columns else pd.Series("", index=todo_df.index)
+            )
+            task_keys = (
+                pd.DataFrame({
+                    "staffGID": todo_df["staffGID"].astype(str),
+                    "CertName_norm": todo_df["CertName_norm"].astype(str),
+                    "_actief": status_lc.isin(("ingeschreven", "open", "in wachtrij", "gepland")),
+                    "_idx": todo_df.index,
+                })
+                .groupby(keys, sort=False)
+                .agg(_actief=("_actief", "any"), _idx=("_idx", "first"))
+                .reset_index()
+            )
+        else:
+            task_keys = pd.DataFrame(columns=keys + ["_actief", "_idx"])
 
-        def _status_lc(s):
-            return str(s or "").strip().lower()
+        merged = df_failed.merge(task_keys, on=keys, how="left", indicator=True)
+        heeft_taak = merged["_merge"] == "both"
+        te_heropenen = merged[heeft_taak & ~merged["_actief"].fillna(False).astype(bool)]
+        nieuw = merged[~heeft_taak]
 
-        created = 0
-        updated = 0
         now = pd.Timestamp.now()
 
-        # staff lookup voor velden
-        name_col_staff = None
-        for c in ("FullName", "Name+Firstname", "Naam", "Employee_Name", "MedewerkerNaam"):
-            if c in staff.columns:
-                name_col_staff = c
-                break
-        
-        # V2-FIX:  Zoek eerst naar CostCenter (na hernoemen in load_all), dan fallback naar originele naam
-        cc_col_staff = None
-        for c in ("CostCenter", "staffCOSTCENTER315"):
-            if c in staff.columns:
-                cc_col_staff = c
-                break
-        
-        sap_col_staff = "staffSAPNR" if "staffSAPNR" in staff.columns else None
-
-        staff_map = {}
-        for _, r in staff.iterrows():
-            sid = str(r. get(id_col, "")).strip()
-            if not sid:
-                continue
-            staff_map[sid] = {
-                "name":  str(r. get(name_col_staff, "") or "").strip() if name_col_staff else "",
-                "cc": str(r. get(cc_col_staff, "") or self.active_costcenter or "").strip() if cc_col_staff else str(self.active_costcenter or "").strip(),
-                "sap": str(r.get(sap_col_staff, "") or "").strip() if sap_col_staff else "",
-            }
-
-        new_rows = []
-
-        for _, r in df_failed.iterrows():
-            sid = str(r.get(res_id_col, "")).strip()
-            cert_name = str(r.get(res_cert_col, "")).strip()
-            cert_norm = str(r.get("CertName_norm", "")).strip()
-            if not sid or not cert_norm:
-                continue
-
-            # skip als er een ingeschreven taak bestaat
-            existing = todo_df[(todo_df. get("staffGID", "").astype(str) == sid) & (todo_df. get("CertName_norm", "").astype(str) == cert_norm)]
-            if not existing.empty:
-                # als er al een open/ingeschreven taak is, niets doen
-                statuses = existing["Status"].astype(str).map(_status_lc) if "Status" in existing. columns else pd.Series([])
-                if any(s in ("ingeschreven", "open", "in wachtrij", "gepland") for s in statuses. tolist()):
-                    continue
-                # als alleen "afgewerkt/gesloten" bestaat -> heropen
-                idx0 = existing.index[0]
-                todo_df.at[idx0, "Status"] = "Open"
-                datum = r.get(res_date_col) if res_date_col else pd.NaT
-                datum_str = ""
-                if isinstance(datum, pd.Timestamp) and not pd.isna(datum):
-                    datum_str = datum.strftime("%d-%m-%Y")
-                todo_df.at[idx0, "Status_Detail"] = f"Niet geslaagd ({datum_str}) - herinschrijving nodig" if datum_str else "Niet geslaagd - herinschrijving nodig"
-                todo_df.at[idx0, "LastUpdatedAt"] = now
-                todo_df.at[idx0, "Nodig"] = True
-                updated += 1
-                continue
-
-            info = staff_map. get(sid, {})
-            datum = r.get(res_date_col) if res_date_col else pd.NaT
-            datum_str = ""
-            if isinstance(datum, pd.Timestamp) and not pd.isna(datum):
-                datum_str = datum.strftime("%d-%m-%Y")
-
-            new_rows.append(
-                {
-                    "staffGID":  sid,
-                    "staffSAPNR": info.get("sap", ""),
-                    "MedewerkerID":  sid,
-                    "MedewerkerNaam": info. get("name", ""),
-                    "CostCenter": info. get("cc", ""),
-                    "CertName": cert_name,
-                    "CertName_norm": cert_norm,
-                    "TaskType": "Certificaat",
-                    "Status": "Open",
-                    "Status_Detail": f"Niet geslaagd ({datum_str}) - herinschrijving nodig" if datum_str else "Niet geslaagd - herinschrijving nodig",
-                    "Nodig": True,
-                    "Commentaar":  "",
-                    "CreatedAt": now,
-                    "LastUpdatedAt": now,
-                    "CreatedBy": "sync_failed_results_to_todo",
-                }
-            )
-            created += 1
-
-        if new_rows:
-            todo_df = pd. concat([todo_df, pd.DataFrame(new_rows)], ignore_index=True)
+        def _detail(datums: pd.Series) -> pd.Series:
+            datum_str = datums.dt.strftime("%d-%m-%Y") if res_date_col else pd.Series(pd.NA, index=datums.index)
+            return ("Niet geslaagd (" + datum_str + ") - herinschrijving nodig").fillna("Niet geslaagd - herinschrijving nodig")
+
+        # als alleen "afgewerkt/gesloten" bestaat -> heropen (in bulk)
+        updated = len(te_heropenen)
+        if updated:
+            idx = pd.Index(te_heropenen["_idx"])
+            todo_df.loc[idx, "Status"] = "Open"
+            todo_df.loc[idx, "Status_Detail"] = _detail(te_heropenen["_datum"]).to_numpy()
+            todo_df.loc[idx, "LastUpdatedAt"] = now
+            todo_df.loc[idx, "Nodig"] = True
+
+        # staff velden voor nieuwe taken
+        created = len(nieuw)
+        if created:
+            staff_ix = staff.assign(_sid=staff[id_col].astype(str).str.strip())
+            staff_ix = staff_ix[staff_ix["_sid"] != ""].drop_duplicates("_sid", keep="last").set_index("_sid")
+
+            def _staff_field(candidates, fallback=""):
+                col = next((c for c in candidates if c in staff_ix.columns), None)
+                if not col:
+                    return pd.Series(fallback, index=nieuw.index)
+                vals = nieuw["staffGID"].map(staff_ix[col].fillna("").astype(str).str.strip()).fillna("")
+                return vals.where(vals != "", fallback)
+
+            new_rows = pd.DataFrame({
+                "staffGID": nieuw["staffGID"],
+                "staffSAPNR": _staff_field(("staffSAPNR",)),
+                "MedewerkerID": nieuw["staffGID"],
+                "MedewerkerNaam": _staff_field(("FullName", "Name+Firstname", "Naam", "Employee_Name", "MedewerkerNaam")),
+                # V2-FIX:  Zoek eerst naar CostCenter (na hernoemen in load_all), dan fallback naar originele naam
+                "CostCenter": _staff_field(("CostCenter", "staffCOSTCENTER315"), str(self.active_costcenter or "").strip()),
+                "CertName": nieuw["CertName"],
+                "CertName_norm": nieuw["CertName_norm"],
+                "TaskType": "Certificaat",
+                "Status": "Open",
+                "Status_Detail": _detail(nieuw["_datum"]),
+                "Nodig": True,
+                "Commentaar": "",
+                "CreatedAt": now,
+                "LastUpdatedAt": now,
+                "CreatedBy": "sync_failed_results_to_todo",
+            })
+            todo_df = pd. concat([todo_df, new_rows], ignore_index=True)
 
         if created > 0 or updated > 0:
             self.df["todo"] = todo_df
@@ -3114,206 +3169,255 @@ class DataStore:
 
         return created + updated
     
+    def _build_catalog_index(self) -> Dict[str, Any]:
+        """
+        Voorbewerkte training catalogus voor find_training_url_for_cert (1x per load, STAP 11).
+
+        - "norm":  CertName_norm -> url (eerste rij wint)
+        - "codes": per codekolom een dict CODE -> url (kolomvolgorde = zoekvolgorde)
+        - "texts": per tekstkolom de upper-teksten + index "-123" -> rijposities,
+                   zodat de contains-fallback enkel kandidaat-rijen afloopt.
+        """
+        cat = getattr(self, "training_catalog", None)
+        idx: Dict[str, Any] = {"cat_id": self._frame_version(cat), "norm": {}, "codes": [], "texts": [], "url": None}
+        self._catalog_index = idx
+        self._catalog_url_cache = {}
+        if cat is None or cat.empty:
+            return idx
+
+        base_col = next((c for c in ("CertName", "raw_text", "title", "Title") if c in cat.columns), None)
+        url_col = next((c for c in ("url", "Url", "URL") if c in cat.columns), None)
+        if base_col is None or url_col is None:
+            return idx
+
+        urls = cat[url_col].astype(str).reset_index(drop=True)
+        idx["url"] = url_col
+
+        norms = self._norm_series(cat[base_col].astype(str)).reset_index(drop=True)
+        first = ~norms.duplicated(keep="first")
+        idx["norm"] = dict(zip(norms[first], urls[first]))
+
+        for code_col in ("code", "Code", "training_id", "trainingID"):
+            if code_col in cat.columns:
+                codes = cat[code_col].astype(str).str.upper().str.strip().reset_index(drop=True)
+                first = ~codes.duplicated(keep="first")
+                idx["codes"].append(dict(zip(codes[first], urls[first])))
+
+        for text_col in ("raw_text", "title", "Title"):
+            if text_col in cat.columns:
+                texts = cat[text_col].astype(str).str.upper().reset_index(drop=True)
+                grams = texts.str.findall(r"-\d{3}").explode().dropna()
+                posities = {g: list(dict.fromkeys(p)) for g, p in grams.groupby(grams, sort=False).groups.items()}
+                idx["texts"].append((texts.tolist(), posities, urls.tolist()))
+
+        return idx
+
     def find_training_url_for_cert(self, cert_name: str) -> str | None:
-        """Zoek training URL in catalogus."""
+        """
+        Zoek training URL in catalogus.
+        Via _build_catalog_index (O(1) dict lookups) en gememoized per certnaam.
+        """
         if self.training_catalog is None or self.training_catalog.empty:
             return None
 
-        df = self.training_catalog.copy()
-        norm = self.normalize_certname
-
-        cert_norm = norm(cert_name)
-
-        base_col = None
-        for c in ("CertName", "raw_text", "title", "Title"):
-            if c in df.columns:
-                base_col = c
-                break
+        idx = getattr(self, "_catalog_index", None)
+        if not idx or idx.get("cat_id") != self._frame_version(self.training_catalog):
+            idx = self._build_catalog_index()
 
-        if not base_col:
-            return None
+        cache = self._catalog_url_cache
+        key = str(cert_name)
+        if key in cache:
+            return cache[key]
 
-        df["CertName_norm"] = df[base_col].astype(str).map(norm)
+        result = None
+        if idx["url"] is not None:
+            cert_norm = self.normalize_certname(cert_name)
+            result = idx["norm"].get(cert_norm)
+
+            if result is None:
+                code_pattern = r"\b([A-Za-z]{2}(?:-[A-Za-z])?-\d{3})\b"
+                code = None
+                m = re.search(code_pattern, str(cert_name))
+                if m:
+                    code = m.group(1).upper()
+
+                if not code:
+                    m = re.search(code_pattern, cert_norm)
+                    if m:
+                        code = m.group(1).upper()
+
+                if code:
+                    for code_map in idx["codes"]:
+                        if code in code_map:
+                            result = code_map[code]
+                            break
 
-        url_col = None
-        for c in ("url", "Url", "URL"):
-            if c in df.columns:
-                url_col = c
-                break
+                    if result is None:
+                        # Elke code eindigt op "-ddd": enkel rijen met dat fragment kunnen matchen
+                        gram = code[-4:]
+                        for texts, posities, urls in idx["texts"]:
+                            pos = next((p for p in posities.get(gram, ()) if code in texts[p]), None)
+                            if pos is not None:
+                                result = urls[pos]
+                                break
 
-        if url_col is None:
-            return None
+        cache[key] = result
+        return result
+    
+    def normalize_legacy_statuses(self) -> pd.Series:
+        """
+        Normaliseer oude statussen ('Overruled' -> Ingeschreven/Open).
 
-        mask = df["CertName_norm"] == cert_norm
-        if mask.any():
-            return str(df.loc[mask, url_col].iloc[0])
-
-        code_pattern = r"\b([A-Za-z]{2}(?:-[A-Za-z])?-\d{3})\b"
-        code = None
-        m = re.search(code_pattern, str(cert_name))
-        if m:
-            code = m.group(1).upper()
-
-        if not code:
-            m = re.search(code_pattern, cert_norm)
-            if m:
-                code = m.group(1).upper()
-
-        if code:
-            for code_col in ("code", "Code", "training_id", "trainingID"):
-                if code_col in df.columns:
-                    mask_code = df[code_col].astype(str).str.upper().str.strip() == code
-                    if mask_code.any():
-                        return str(df.loc[mask_code, url_col].iloc[0])
-
-            for text_col in ("raw_text", "title", "Title"):
-                if text_col in df.columns:
-                    mask_code = df[text_col].astype(str).str.upper().str.contains(code, na=False)
-                    if mask_code.any():
-                        return str(df.loc[mask_code, url_col].iloc[0])
+        Regeltabel met vectorized masks. Geeft een boolean change-mask terug
+        (index = todo index) zodat de aanroeper weet welke rijen echt gewijzigd zijn.
+        """
+        import numpy as np
 
-        return None
-    
-    def normalize_legacy_statuses(self):
-        """Normaliseer oude statussen."""
         todo = self.df.get("todo", pd.DataFrame())
-        if todo is None or todo.empty:
-            return
-
-        changed = False
+        if todo is None or todo.empty or "Status" not in todo.columns:
+            return pd.Series(False, index=getattr(todo, "index", None), dtype=bool)
 
-        if "Status" in todo.columns:
-            todo["Status"] = todo["Status"].astype(str)
+        status_lc = todo["Status"].fillna("").astype(str).str.strip().str.lower()
         if "Status_Detail" in todo.columns:
-            todo["Status_Detail"] = todo["Status_Detail"].astype(str)
+            detail_lc = todo["Status_Detail"].fillna("nan").astype(str).str.strip().str.lower()
+        else:
+            detail_lc = pd.Series("", index=todo.index)
 
-        for idx, row in todo.iterrows():
-            status = str(row.get("Status", "") or "").strip()
-            detail = str(row.get("Status_Detail", "") or "").strip()
+        overruled = status_lc == "overruled"
+        if not overruled.any():
+            return overruled
 
-            status_lower = status.lower()
-            detail_lower = detail.lower()
+        # Werk op een kopie: self.df["todo"] (en zijn versie) wijzigt enkel bij echte wijzigingen
+        todo = todo.copy()
+        bevestigd = overruled & (
+            detail_lc.str.contains("geconfirmeerd in req", regex=False) |
+            detail_lc.str.contains("bevestigd in req", regex=False)
+        )
 
-            if status_lower == "overruled":
-                if "geconfirmeerd in req" in detail_lower or "bevestigd in req" in detail_lower:
-                    todo.at[idx, "Status"] = "Ingeschreven"
-                    todo.at[idx, "Status_Detail"] = "Bevestigd in Xaurum"
-                else:
-                    todo.at[idx, "Status"] = "Open"
-                    if detail_lower == "nan":
-                        todo.at[idx, "Status_Detail"] = ""
-                changed = True
+        # Regeltabel Status: bevestigd in REQ -> Ingeschreven, anders terug naar Open
+        todo.loc[overruled, "Status"] = np.select(
+            [bevestigd[overruled]], ["Ingeschreven"], default="Open"
+        )
+        todo.loc[bevestigd, "Status_Detail"] = "Bevestigd in Xaurum"
+        todo.loc[overruled & ~bevestigd & (detail_lc == "nan"), "Status_Detail"] = ""
 
-        if changed:
-            self.df["todo"] = todo
-            try:
-                self.save_todo()
-            except Exception:
-                pass
+        self.df["todo"] = todo
+        try:
+            self.save_todo()
+        except Exception:
+            pass
+        return overruled
+
+    def update_status_from_tasktype_and_xaurum(self) -> pd.Series:
+        """
+        Update status vanuit Xaurum.
+
+        Open taken met een geplande sessie in training_req -> Ingeschreven (auto).
+        Open taken zonder detail krijgen een detail op basis van TaskType (regeltabel).
+        Alles kolomsgewijs; geeft een boolean change-mask terug (index = todo index).
+        """
+        import numpy as np
 
-    def update_status_from_tasktype_and_xaurum(self):
-        """Update status vanuit Xaurum."""
         todo = self.df.get("todo", pd.DataFrame())
         req = self.df.get("training_req", pd.DataFrame())
 
         if todo is None or todo.empty:
-            return
+            return pd.Series(False, index=getattr(todo, "index", None), dtype=bool)
 
+        # Werk op kopieën: self.df (en de frame-versies) wijzigt enkel als er echt iets verandert,
+        # anders invalideert een no-op run alle versie-gebonden caches.
+        todo = todo.copy()
         if "Status_Detail" not in todo.columns:
             todo["Status_Detail"] = ""
 
-        if req is not None and not req.empty:
-            req = req.copy()
-            if "staffGID" in req.columns:
-                req["staffGID"] = req["staffGID"].astype(str).str.strip()
-            if "CertName" in req.columns:
-                req["CertName"] = req["CertName"].astype(str).str.strip()
-            if "RequestStatus" in req.columns:
-                req["RequestStatus"] = req["RequestStatus"].astype(str)
-            if "ScheduledDate" in req.columns:
-                req["ScheduledDateParsed"] = pd.to_datetime(
-                    req["ScheduledDate"], errors="coerce"
-                )
-        else:
-            req = pd.DataFrame()
-
-        # 🔧 FIX: self. toevoegen!
-        if "CertName" in todo.columns:
-            todo["CertName_norm"] = todo["CertName"].astype(str).apply(self.normalize_certname)
-        else:
-            todo["CertName_norm"] = ""
-
-        if not req.empty and "CertName" in req.columns:
-            # 🔧 FIX: self. toevoegen!
-            req["CertName_norm"] = req["CertName"].astype(str).apply(self.normalize_certname)
+        # Enkel ontbrekende *_norm waarden aanvullen (geen volledige her-normalisatie per call)
+        todo = self._ensure_norm_column(todo)
+        changed = pd.Series(False, index=todo.index)
 
-        today = pd.Timestamp.today().normalize()
-        changed = False
+        def _col(df, c):
+            if c in df.columns:
+                return df[c].fillna("").astype(str).str.strip()
+            return pd.Series("", index=df.index)
+
+        status_lc = _col(todo, "Status").str.lower()
+        staff_id = _col(todo, "staffGID")
+        cert_name = _col(todo, "CertName")
+        cert_norm = _col(todo, "CertName_norm")
+        is_open = status_lc == "open"
+        req_afgeleid = False
+
+        # 1. Open + ingepland in Xaurum -> Ingeschreven
+        if (
+            req is not None and not req.empty and is_open.any()
+            and {"staffGID", "CertName", "ScheduledDate"}.issubset(req.columns)
+        ):
+            req = self._ensure_norm_column(req.copy())
+            # Altijd opnieuw parsen: een bestaande ScheduledDateParsed kan verouderd zijn
+            req["ScheduledDateParsed"] = pd.to_datetime(req["ScheduledDate"], errors="coerce")
+            req_afgeleid = True
+
+            sessies = pd.DataFrame({
+                "staffGID": _col(req, "staffGID"),
+                "_norm": _col(req, "CertName_norm"),
+                "_naam": _col(req, "CertName"),
+                "_datum": req["ScheduledDateParsed"],
+                "_loc": _col(req, "Location"),
+            })
+            sessies = sessies[sessies["_datum"].notna()]
+
+            # Sessies vindbaar op norm (n:) en op ruwe CertName (c:); taken zonder norm matchen op de naam
+            sessies = pd.concat([
+                sessies.assign(_key="n:" + sessies["_norm"]),
+                sessies.assign(_key="c:" + sessies["_naam"]),
+            ], ignore_index=True)
+
+            # Per sleutel: eerstvolgende sessie vanaf vandaag, anders de vroegste uit het verleden
+            today = pd.Timestamp.today().normalize()
+            sessies["_verleden"] = sessies["_datum"] < today
+            gekozen = (
+                sessies.sort_values(["_verleden", "_datum"], kind="mergesort")
+                .drop_duplicates(["staffGID", "_key"], keep="first")
+            )
 
-        for idx, row in todo.iterrows():
-            status = str(row.get("Status", "") or "").strip().lower()
-            tasktype = str(row.get("TaskType", "") or "").strip()
-            staff_id = str(row.get("staffGID", "") or "").strip()
-            cert_name = str(row.get("CertName", "") or "").strip()
-            cert_name_norm = str(row.get("CertName_norm", "") or "").strip()
-
-            if status == "open":
-                if not req.empty and staff_id and cert_name:
-                    base_mask = (req["staffGID"] == staff_id)
-
-                    if "CertName_norm" in req.columns and cert_name_norm:
-                        mask_cert = (req["CertName_norm"] == cert_name_norm)
-                    else:
-                        mask_cert = (req["CertName"] == cert_name)
-
-                    if not mask_cert.any() and cert_name_norm:
-                        m = re.match(r"([A-Za-z]{2}-[A-Za-z]-\d{3})", cert_name_norm)
-                        if m and "CertName_norm" in req.columns:
-                            code = m.group(1)
-                            mask_cert = req["CertName_norm"].astype(str).str.startswith(code)
-
-                    mask = base_mask & mask_cert
-                    match_req = req[mask]
-
-                    if not match_req.empty:
-                        cand = match_req.copy()
-                        cand = cand[cand["ScheduledDateParsed"].notna()]
-                        if not cand.empty:
-                            future = cand[cand["ScheduledDateParsed"] >= today]
-                            if not future.empty:
-                                chosen = future.sort_values("ScheduledDateParsed").iloc[0]
-                            else:
-                                chosen = cand.sort_values("ScheduledDateParsed").iloc[0]
-
-                            sched_dt = chosen["ScheduledDateParsed"]
-                            loc = str(chosen.get("Location", "") or "").strip()
-
-                            todo.at[idx, "Status"] = "Ingeschreven"
-                            todo.at[idx, "Status_Detail"] = "Bevestigd in Xaurum (auto)"
-                            todo.at[idx, "Ingeschreven_Datum"] = sched_dt
-                            todo.at[idx, "Ingeschreven_Locatie"] = loc
-                            changed = True
-                            continue
-
-                detail = str(todo.at[idx, "Status_Detail"] or "").strip()
-                if not detail:
-                    tt = tasktype.lower()
-                    if "vervalt binnen 6 maanden" in tt:
-                        todo.at[idx, "Status_Detail"] = "Vervalt binnen 6 maanden"
-                        changed = True
-                    elif tt == "auto":
-                        todo.at[idx, "Status_Detail"] = "Vervallen"
-                        changed = True
-                    elif "nieuwe vereiste opleiding" in tt:
-                        todo.at[idx, "Status_Detail"] = "Geen certificaat / nieuwe vereiste opleiding"
-                        changed = True
-
-        if changed:
+            kandidaten = pd.DataFrame({
+                "staffGID": staff_id,
+                "_key": np.where(cert_norm != "", "n:" + cert_norm, "c:" + cert_name),
+                "_rij": todo.index,
+            })[is_open & (staff_id != "") & (cert_name != "")]
+            hits = kandidaten.merge(gekozen[["staffGID", "_key", "_datum", "_loc"]], on=["staffGID", "_key"], how="inner")
+
+            if not hits.empty:
+                rows = pd.Index(hits["_rij"])
+                todo.loc[rows, "Status"] = "Ingeschreven"
+                todo.loc[rows, "Status_Detail"] = "Bevestigd in Xaurum (auto)"
+                todo.loc[rows, "Ingeschreven_Datum"] = hits["_datum"].to_numpy()
+                todo.loc[rows, "Ingeschreven_Locatie"] = hits["_loc"].to_numpy()
+                changed.loc[rows] = True
+
+        # 2. Open taken zonder detail -> detail op basis van TaskType (regeltabel)
+        tt = _col(todo, "TaskType").str.lower()
+        zonder_detail = is_open & ~changed & (_col(todo, "Status_Detail") == "")
+        detail_rules = [
+            (tt.str.contains("vervalt binnen 6 maanden", regex=False), "Vervalt binnen 6 maanden"),
+            (tt == "auto", "Vervallen"),
+            (tt.str.contains("nieuwe vereiste opleiding", regex=False), "Geen certificaat / nieuwe vereiste opleiding"),
+        ]
+        new_detail = np.select([c for c, _ in detail_rules], [d for _, d in detail_rules], default="")
+        set_detail = zonder_detail & (new_detail != "")
+        if set_detail.any():
+            todo.loc[set_detail, "Status_Detail"] = new_detail[set_detail.to_numpy()]
+            changed |= set_detail
+
+        if changed.any():
             self.df["todo"] = todo
+            if req_afgeleid:
+                self.df["training_req"] = req
+            self._sync_replacement_rows(todo.index[changed.to_numpy()])
             try:
                 self.save_todo()
             except Exception:
                 pass
+        return changed
 
     def get_upcoming_trainings(self, days:  int = 21) -> pd.DataFrame:
         """
@@ -3565,20 +3669,16 @@ class DataStore:
 
         # 2. DE VERTAALSLAG (Hier zat het probleem)
         # We gebruiken nu self.translation_dict i.p.v. de lege dummy functie
-        def _translate_cert(x):
-            s = str(x).strip()
-            # Als we een vertaling hebben in het geheugen, gebruik die!
-            if self.translation_dict and s in self.translation_dict:
-                return self.translation_dict[s]
-            return s
-
-        # Pas vertaling toe: 'Secouriste' wordt 'Hulpverlener'
-        cfg["CertName"] = cfg["CertName"].apply(_translate_cert)
+        # Pas vertaling toe: 'Secouriste' wordt 'Hulpverlener' (dict map, geen per-rij functie)
+        namen = cfg["CertName"].astype(str).str.strip()
+        if self.translation_dict:
+            namen = namen.map(self.translation_dict).fillna(namen)
+        cfg["CertName"] = namen
         
         # 3. DE NORMALISATIESLAG
         # Maak de technische zoeksleutel: 'Hulpverlener' wordt 'hulpverlener'
         try:
-            cfg["CertName_norm"] = cfg["CertName"].apply(self.normalize_certname)
+            cfg["CertName_norm"] = self._norm_series(cfg["CertName"])
         except Exception:
             # Fallback als er iets misgaat
             if "CertName_norm" not in cfg.columns:
@@ -3598,13 +3698,13 @@ class DataStore:
         Herbouwt *_norm kolommen op basis van de huidige normalizer.
         Wordt (in sommige UI versies) na load_all() aangeroepen.
         """
-        norm = getattr(self, "normalize_certname", lambda x: str(x).strip().lower())
 
         def _safe_norm_series(series: pd.Series) -> pd.Series:
+            # 1x normalize_certname per unieke naam (zie _norm_series)
             try:
-                return series.astype(str).apply(norm)
+                return self._norm_series(series.astype(str))
             except Exception:
-                return series.apply(lambda x: norm(x) if x is not None else "")
+                return series.astype(str).str.strip().str.lower()
 
         # Cert-gerelateerde DF's
         for key in ("certificates", "cert_results", "training_req", "config_cert", "todo"):
@@ -3636,72 +3736,67 @@ class DataStore:
             pass
 
         # Display map cache invalidatie
+        self._invalidate_name_index()
+
+    def _invalidate_name_index(self) -> None:
+        """Wist de naam-index (display map + memo's). Aanroepen na wijziging van master data of mappings."""
         self._cert_display_map = {}
         self._cert_display_map_built = False
+        self._cert_display_map_version = None
+        self._display_name_cache = {}
+        self._standard_name_cache = {}
 
     def _build_cert_display_map(self) -> Dict[str, str]:
         """
         Bouwt een mapping van genormaliseerde certificaatnaam -> originele (leesbare) naam.
         Gebruikt alle beschikbare bronnen (master/config/certificates/training catalog).
+
+        V2: kolomsgewijs (1x per load, STAP 12); eerste bron wint. Wordt enkel herbouwd
+        als master_cert_all vervangen wordt of via _invalidate_name_index().
         """
-        if getattr(self, "_cert_display_map_built", False) and isinstance(getattr(self, "_cert_display_map", None), dict) and self._cert_display_map:
+        versie = self._frame_version(getattr(self, "master_cert_all", None))
+        if getattr(self, "_cert_display_map_built", False) and getattr(self, "_cert_display_map_version", None) == versie:
             return self._cert_display_map
 
-        norm = getattr(self, "normalize_certname", lambda x: str(x).strip().lower())
-        display_map: Dict[str, str] = {}
-
-        def _ingest_names(values) -> None:
-            try:
-                for v in values:
-                    if v is None or (isinstance(v, float) and pd.isna(v)):
-                        continue
-                    s = str(v).strip()
-                    if not s or s.lower() == "nan":
-                        continue
-                    try:
-                        k = str(norm(s))
-                    except Exception:
-                        k = ""
-                    if k and k not in display_map:
-                        display_map[k] = s
-            except Exception:
-                return
+        bronnen: List[pd.Series] = []
 
         # 1) Master certs (beste bron)
-        try:
-            df_master = getattr(self, "master_cert_all", None)
-            if isinstance(df_master, pd.DataFrame) and not df_master.empty and "CertName" in df_master.columns:
-                _ingest_names(df_master["CertName"].dropna().astype(str).tolist())
-        except Exception:
-            pass
+        df_master = getattr(self, "master_cert_all", None)
+        if isinstance(df_master, pd.DataFrame) and not df_master.empty and "CertName" in df_master.columns:
+            bronnen.append(df_master["CertName"])
 
         # 2) In-memory DF's
         for key in ("master_cert", "config_cert", "certificates", "training_req", "todo"):
-            try:
-                df = self.df.get(key)
-                if isinstance(df, pd.DataFrame) and not df.empty and "CertName" in df.columns:
-                    _ingest_names(df["CertName"].dropna().astype(str).tolist())
-            except Exception:
-                continue
+            df = self.df.get(key)
+            if isinstance(df, pd.DataFrame) and not df.empty and "CertName" in df.columns:
+                bronnen.append(df["CertName"])
 
         # 3) Training catalog (fallback, kolom kan title/Title/raw_text zijn)
-        try:
-            cat_df = getattr(self, "training_catalog", None)
-            if cat_df is None or (isinstance(cat_df, pd.DataFrame) and cat_df.empty):
-                cat_df = self.df.get("training_catalog")
-            if isinstance(cat_df, pd.DataFrame) and not cat_df.empty:
-                title_col = None
-                for c in ("title", "Title", "raw_text"):
-                    if c in cat_df.columns:
-                        title_col = c
-                        break
-                if title_col:
-                    _ingest_names(cat_df[title_col].dropna().astype(str).tolist())
-        except Exception:
-            pass
+        cat_df = getattr(self, "training_catalog", None)
+        if cat_df is None or (isinstance(cat_df, pd.DataFrame) and cat_df.empty):
+            cat_df = self.df.get("training_catalog")
+        if isinstance(cat_df, pd.DataFrame) and not cat_df.empty:
+            title_col = next((c for c in ("title", "Title", "raw_text") if c in cat_df.columns), None)
+            if title_col:
+                bronnen.append(cat_df[title_col])
+
+        display_map: Dict[str, str] = {}
+        if bronnen:
+            namen = pd.concat([b.dropna().astype(str).str.strip() for b in bronnen], ignore_index=True)
+            namen = namen[(namen != "") & (namen.str.lower() != "nan")].drop_duplicates()
+            try:
+                keys = self._norm_series(namen).astype(str)
+            except Exception:
+                keys = namen.str.lower()
+            paren = pd.Series(namen.to_numpy(), index=keys.to_numpy())
+            paren = paren[(paren.index != "") & ~paren.index.duplicated(keep="first")]
+            display_map = paren.to_dict()
 
         self._cert_display_map = display_map
         self._cert_display_map_built = True
+        self._cert_display_map_version = versie
+        self._display_name_cache = {}
+        self._standard_name_cache = {}
         return display_map
 
     def get_display_certname(self, certname: str, employee_language: Optional[str] = None) -> str:
@@ -3710,6 +3805,7 @@ class DataStore:
         Geeft een leesbare naam terug voor een (mogelijk al-genormaliseerde) cert key.
         employee_language wordt genegeerd (geen vertaalbron beschikbaar), maar blijft in signature
         zodat oudere UI code niet crasht.
+        V2: gememoized per (naam, taal) bovenop de display map.
         """
         if certname is None:
             return ""
@@ -3722,29 +3818,43 @@ class DataStore:
             return raw
 
         display_map = self._build_cert_display_map()
+        cache = self._display_name_cache
+        key = (raw, employee_language)
+        if key in cache:
+            return cache[key]
+
+        result = raw
         # 1) direct match (sommige keys zijn al norm)
         if raw in display_map:
-            return display_map[raw]
-
-        # 2) normalized match
-        try:
-            k = str(self.normalize_certname(raw))
-            if k in display_map:
-                return display_map[k]
-        except Exception:
-            pass
+            result = display_map[raw]
+        else:
+            # 2) normalized match
+            try:
+                k = str(self.normalize_certname(raw))
+                if k in display_map:
+                    result = display_map[k]
+            except Exception:
+                pass
 
-        return raw
+        cache[key] = result
+        return result
 
     def normalize_certname_to_standard(self, name: str) -> str:
         """
         V19: DE MOOIE WASSTRAAT (Leesbare tekst maker)
         Zorgt dat 'EA-E-294 HS' opgeslagen wordt als 'EA-E-294 - BA5 Hoogspanning'
+        V20: gememoized per naam (cache leeg bij wijziging van master data of mappings).
         """
         import re
         if not name: return ""
         s = str(name).strip()
 
+        self._build_cert_display_map()
+        cache = self._standard_name_cache
+        if s in cache:
+            return cache[s]
+        key = s
+
         # 1. Reverse lookup (Behoud ID-vertaling uit je oude versie)
         try:
             if " " not in s and "-" not in s and len(s) >= 5:
@@ -3762,6 +3872,7 @@ class DataStore:
             if s in self.translation_dict:
                 s = self.translation_dict[s]
         
+        cache[key] = s
         return s
     
     def create_tasks_for_expiring_certificates(self) -> int:
@@ -3816,10 +3927,11 @@ class DataStore:
         - BEHOUDT:  Negeert TaskType bij het checken van bestaande taken. 
         - FIX: Gebruikt 'self.normalize_certname' (geen globals/crashes meer).
         - V10-FIX: CostCenter lookup aangepast om te werken na kolom-hernoemen in load_all().
+        - V11: Kolomsgewijs. Beste expiry per sleutel via groupby max, left join op de
+          config, anti-join op bestaande taken en new_rows als 1 frame.
         """
-        # Helper:  Gebruik de interne functie (veilig)
-        norm = self.normalize_certname
-        
+        import numpy as np
+
         # 1. DATA LADEN
         cfg = self.df. get("config_cert")
         if cfg is None or cfg.empty:
@@ -3842,260 +3954,230 @@ class DataStore:
             self.df["todo"] = todo
             return
 
-        print(f"\n   🔄 sync_todo_with_config() V10 [SAFE PORT]")
+        print(f"\n   🔄 sync_todo_with_config() V11 [KOLOMSGEWIJS]")
         print(f"      Config: {len(cfg)} | Todo: {len(todo)}")
 
         # 2. NORMALISATIE (ID kolommen)
         # Zorg dat alle ID kolommen strings zijn voor correcte matching
-        for df_tmp, name in [(cfg, "cfg"), (todo, "todo"), (certs, "certs"), (results, "results"), (staff, "staff")]:
+        for df_tmp in (cfg, todo, certs, results, staff):
             if not df_tmp.empty and id_cfg in df_tmp.columns:
                 df_tmp[id_cfg] = df_tmp[id_cfg].astype(str).str.strip()
 
-        # 3. NORMALISATIE (CertName) - DE FIX
-        # We gebruiken hier self.normalize_certname in plaats van de onveilige globals
+        # 3. NORMALISATIE (CertName) - via _norm_series (1x per unieke naam, gecached)
         if "CertName" in cfg. columns:
-            cfg["CertName_norm"] = cfg["CertName"].apply(norm)
+            cfg["CertName_norm"] = self._norm_series(cfg["CertName"])
         
         if not todo.empty and "CertName" in todo.columns:
-            todo["CertName_norm"] = todo["CertName"].astype(str).apply(norm)
+            todo["CertName_norm"] = self._norm_series(todo["CertName"].astype(str))
             
         # Zorg dat results en certs ook een norm kolom hebben voor de lookups
         if not certs.empty and "CertName" in certs.columns and "CertName_norm" not in certs.columns:
-            certs["CertName_norm"] = certs["CertName"].astype(str).apply(norm)
+            certs["CertName_norm"] = self._norm_series(certs["CertName"].astype(str))
         
         if not results.empty and "CertName" in results.columns and "CertName_norm" not in results.columns:
-             # Probeer CertName, anders Certificaat
-            col = "CertName" if "CertName" in results.columns else "Certificaat"
-            if col in results.columns:
-                results["CertName_norm"] = results[col].astype(str).apply(norm)
+            results["CertName_norm"] = self._norm_series(results["CertName"].astype(str))
 
         # 4. FILTER OP NODIG = TRUE
         if "Nodig" in cfg.columns:
-            def is_true(x): return str(x).lower() in ['true', '1', 'ja', 'yes', 't']
-            cfg_needed = cfg[cfg["Nodig"]. apply(is_true)].copy()
+            cfg_needed = cfg[self._truthy_mask(cfg["Nodig"])].copy()
         else:
             cfg_needed = cfg. copy()
 
-        if cfg_needed.empty:
+        if cfg_needed.empty or "CertName_norm" not in cfg_needed.columns:
             self.df["todo"] = todo
             return
 
         cfg_needed = cfg_needed.drop_duplicates(subset=[id_cfg, "CertName_norm"])
+        cfg_needed["_sid"] = cfg_needed[id_cfg].astype(str).str.strip()
+        cfg_needed["_norm"] = cfg_needed["CertName_norm"].astype(str).str.strip()
+        cfg_needed = cfg_needed[(cfg_needed["_sid"] != "") & (cfg_needed["_norm"] != "")]
+        keys = ["_sid", "_norm"]
 
-        # 5. BOUW EXISTING TASKS MAP (CRUCIAAL:  JOUW V8 LOGICA)
-        # We negeren TaskType, we willen weten of ERGGENS al een taak is voor dit certificaat
-        existing_task_map = {}
-        
-        if not todo.empty and id_cfg in todo. columns and "CertName_norm" in todo.columns:
-            for _, row in todo. iterrows():
-                sid = str(row[id_cfg]).strip()
-                cn = str(row. get("CertName_norm", "")).strip()
-                status = str(row. get("Status", "")).strip().lower()
-                
-                key = (sid, cn)
-                if key not in existing_task_map:
-                    existing_task_map[key] = []
-                existing_task_map[key].append(status)
+        # Check actieve medewerker + Costcenter filter
+        # V10-FIX:  Bepaal welke CostCenter kolom we moeten gebruiken
+        cc_col = next((c for c in ("CostCenter", "staffCOSTCENTER315") if c in staff.columns), None)
+        staff_first = pd.DataFrame()
+        if not staff.empty and id_cfg in staff.columns:
+            staff_first = staff.drop_duplicates(subset=[id_cfg], keep="first").set_index(id_cfg)
+            cfg_needed = cfg_needed[cfg_needed["_sid"].isin(staff_first.index)]
+            if getattr(self, "active_costcenter", None) and cc_col:
+                staff_cc = cfg_needed["_sid"].map(staff_first[cc_col].astype(str).str.strip())
+                cfg_needed = cfg_needed[staff_cc == str(self.active_costcenter).strip()]
+
+        # 5. ANTI-JOIN OP BESTAANDE TAKEN (CRUCIAAL:  JOUW V8 LOGICA)
+        # We negeren TaskType: als ERGENS een taak met een beschermde/open status bestaat -> skip
+        if not todo.empty and id_cfg in todo.columns and "CertName_norm" in todo.columns:
+            protected_states = ["ingeschreven", "gepland", "in wachtrij", "on hold", "afgewerkt", "recent behaald", "open"]
+            status_lc = (
+                todo["Status"].astype(str).str.strip().str.lower()
+                if "Status" in todo.columns else pd.Series("", index=todo.index)
+            )
+            blocked = status_lc.str.contains("|".join(re.escape(p) for p in protected_states), regex=True)
+            blocked_keys = pd.DataFrame({
+                "_sid": todo[id_cfg].astype(str).str.strip(),
+                "_norm": todo["CertName_norm"].astype(str).str.strip(),
+            })[blocked].drop_duplicates()
+            cfg_needed = cfg_needed.merge(blocked_keys.assign(_blocked=True), on=keys, how="left")
+            cfg_needed = cfg_needed[cfg_needed["_blocked"].isna()].drop(columns="_blocked")
 
-        # 6. CERT LOOKUP (Expiry info ophalen uit 2 bronnen)
-        cert_lookup = {}
-        
-        # 6a.  Uit certificates
+        if cfg_needed.empty:
+            print("      ℹ️ Geen nieuwe taken nodig.")
+            return
+
+        # 6. CERT LOOKUP: beste (laatste) expiry per sleutel uit certificates + geslaagde results
+        lookup_parts = []
         certs_expiry_col = next((c for c in ["Expiry_Date", "ExpiryDate", "Geldig_Tot"] if c in certs.columns), None)
-        if not certs.empty and "CertName_norm" in certs.columns: 
-            for _, row in certs.iterrows():
-                k = (str(row. get(id_cfg, "")).strip(), str(row.get("CertName_norm", "")).strip())
-                exp = None
-                if certs_expiry_col:
-                    try:  exp = pd.to_datetime(row[certs_expiry_col])
-                    except: pass
-                cert_lookup[k] = {"source": "certificates", "expiry": exp, "behaald": None}
-                
-        # 6b. Uit cert_results
+        if not certs.empty and "CertName_norm" in certs.columns and id_cfg in certs.columns:
+            lookup_parts.append(pd.DataFrame({
+                "_sid": certs[id_cfg].astype(str).str.strip(),
+                "_norm": certs["CertName_norm"].astype(str).str.strip(),
+                "_exp": pd.to_datetime(certs[certs_expiry_col], errors="coerce") if certs_expiry_col else pd.NaT,
+                "_source": "certificates",
+            }))
+
         results_expiry_col = next((c for c in ["Geldig_Tot", "ExpiryDate", "ValidUntil"] if c in results.columns), None)
-        results_date_col = next((c for c in ["Behaald", "Exam_Date", "CompletedDate", "Behaald_Datum"] if c in results.columns), None)
-        
-        if not results.empty and "CertName_norm" in results.columns:
-            # Check of kolom Status bestaat, zo ja filter op passed
-            mask = slice(None) # Alles selecteren als default
+        if not results.empty and "CertName_norm" in results.columns and id_cfg in results.columns:
+            passed = pd.Series(True, index=results.index)
             if "Status" in results.columns:
-                mask = results["Status"].astype(str).str.lower().isin(["certified", "passed", "geslaagd", "behaald"])
-            
-            for _, row in results[mask].iterrows():
-                k = (str(row.get(id_cfg, "")).strip(), str(row.get("CertName_norm", "")).strip())
-                exp = None
-                if results_expiry_col: 
-                    try: exp = pd.to_datetime(row[results_expiry_col])
-                    except:  pass
-                beh = None
-                if results_date_col:
-                    try:  beh = pd. to_datetime(row[results_date_col])
-                    except: pass
-                
-                # Update als deze recenter/beter is
-                if k not in cert_lookup or (exp and (cert_lookup[k]["expiry"] is None or exp > cert_lookup[k]["expiry"])):
-                    cert_lookup[k] = {"source": "cert_results", "expiry": exp, "behaald": beh}
+                passed = results["Status"].astype(str).str.lower().isin(["certified", "passed", "geslaagd", "behaald"])
+            r = results[passed]
+            # results eerst: bij gelijke expiry wint certificates (zoals vroeger)
+            lookup_parts.insert(0, pd.DataFrame({
+                "_sid": r[id_cfg].astype(str).str.strip(),
+                "_norm": r["CertName_norm"].astype(str).str.strip(),
+                "_exp": pd.to_datetime(r[results_expiry_col], errors="coerce") if results_expiry_col else pd.NaT,
+                "_source": "cert_results",
+            }))
+
+        lookup_parts = [p for p in lookup_parts if not p.empty]
+        if lookup_parts:
+            cert_lookup = pd.concat(lookup_parts, ignore_index=True)
+            cert_lookup = (
+                cert_lookup.sort_values("_exp", na_position="first", kind="mergesort")
+                .drop_duplicates(keys, keep="last")
+                .assign(_in_lookup=True)
+            )
+        else:
+            cert_lookup = pd.DataFrame(columns=keys + ["_exp", "_source", "_in_lookup"])
+
+        cand = cfg_needed.merge(cert_lookup, on=keys, how="left")
+        in_lookup = cand["_in_lookup"].notna()
+        exp = pd.to_datetime(cand["_exp"], errors="coerce")
 
-        new_rows = []
         now = pd.Timestamp.now()
         today = pd.Timestamp.today().normalize()
         threshold_days = 180 
-        
-        # V10-FIX:  Bepaal welke CostCenter kolom we moeten gebruiken
-        cc_col = None
-        for c in ("CostCenter", "staffCOSTCENTER315"):
-            if c in staff.columns:
-                cc_col = c
-                break
-        
-        # 7. LOOP DOOR CONFIG
-        for _, row in cfg_needed.iterrows():
-            staff_id = str(row[id_cfg]).strip()
-            cert_name_norm = str(row. get("CertName_norm", "")).strip()
-            cert_name_orig = str(row. get("CertName", "")).strip()
-
-            if not staff_id or not cert_name_norm:  continue
-
-            # Check actieve medewerker + Costcenter filter
-            if not staff.empty:
-                staff_rows = staff[staff[id_cfg] == staff_id]
-                if staff_rows.empty: continue
-                # V10-FIX: Gebruik de gevonden cc_col in plaats van hardcoded naam
-                if hasattr(self, 'active_costcenter') and self.active_costcenter and cc_col:
-                    staff_cc = str(staff_rows[cc_col]. iloc[0]).strip()
-                    if staff_cc != str(self.active_costcenter).strip(): continue
-
-            # 🛑 CRUCIALE FIX UIT JOUW V8: PROTECTED STATUS CHECK
-            key_simple = (staff_id, cert_name_norm)
-            
-            if key_simple in existing_task_map:
-                statuses = existing_task_map[key_simple]
-                
-                # Lijst van statussen die we NIET mogen overschrijven (uit jouw code)
-                protected_states = ["ingeschreven", "gepland", "in wachtrij", "on hold", "afgewerkt", "recent behaald"]
-                
-                # Als een van deze statussen voorkomt -> Skip
-                if any(any(p in s for p in protected_states) for s in statuses):
-                    continue
-                
-                # Als er al een 'open' taak is -> Skip
-                if any("open" in s for s in statuses):
-                    continue
-
-            # ...  Vanaf hier is het een NIEUWE taak ... 
-            
-            needs_task = True
-            reason = "Nieuw certificaat nodig"
-            expiry_date = None
-            days_until = None
-
-            # Check of het behaald is via de lookup
-            if key_simple in cert_lookup:
-                d = cert_lookup[key_simple]
-                exp = d["expiry"]
-                if exp and pd.notna(exp):
-                    days_until = (pd.to_datetime(exp) - today).days
-                    if days_until < 0:
-                        reason = f"Certificaat verlopen ({d. get('source')})"
-                    elif days_until <= threshold_days:
-                        reason = f"Verloopt over {days_until} dagen"
-                        expiry_date = exp
-                    else: 
-                        needs_task = False # Nog lang geldig
-                elif d.get("behaald"):
-                    needs_task = False # Behaald zonder verloopdatum
-                else:
-                    needs_task = False 
-
-            # 🛑 CRUCIALE CHECK UIT JOUW V8: FAILED RESULTS
-            # Als hij niet nodig lijkt (omdat er geen data is), check of hij misschien GEFAALD is
-            if not needs_task and not results.empty:
-                results_id_col = id_cfg if id_cfg in results. columns else "staffGID"
-                if "CertName_norm" in results. columns:
-                    mask = ((results[results_id_col]. astype(str).str.strip() == staff_id) &
-                            (results["CertName_norm"].astype(str).str.strip() == cert_name_norm))
-                            
-                    if mask. any():
-                        sub = results[mask].copy()
-                        # Sorteer op datum
-                        sort_col = next((c for c in ["Behaald", "Exam_Date", "CompletedDate"] if c in sub.columns), None)
-                        if sort_col: 
-                            sub[sort_col] = pd.to_datetime(sub[sort_col], errors="coerce")
-                            sub = sub.sort_values(sort_col, ascending=False)
-                        
-                        # Check status van de laatste poging
-                        last_status = str(sub.iloc[0].get("Status", "")).strip().lower()
-                        if last_status in ["not certified", "failed", "niet geslaagd", "gefaald", "gezakt"]:  
-                            reason = "Niet geslaagd - herinschrijving nodig"
-                            needs_task = True
 
-            if not needs_task: 
-                continue
+        days_until = (exp - today).dt.days
+        heeft_exp = in_lookup & exp.notna()
+        verlopen = heeft_exp & (days_until < 0)
+        verloopt = heeft_exp & (days_until >= 0) & (days_until <= threshold_days)
+        # Behaald zonder verloopdatum of nog lang geldig -> geen taak
+        needs_task = ~in_lookup | verlopen | verloopt
+
+        reason = pd.Series(
+            np.select(
+                [~in_lookup, verlopen, verloopt],
+                [
+                    "Nieuw certificaat nodig",
+                    "Certificaat verlopen (" + cand["_source"].astype(str) + ")",
+                    "Verloopt over " + days_until.astype("Int64").astype(str) + " dagen",
+                ],
+                default="",
+            ),
+            index=cand.index,
+        )
 
-            # Maak nieuwe rij
-            medewerker = ""
-            sapnr = ""
-            cc = ""
-            if not staff.empty:
-                s_row = staff[staff[id_cfg] == staff_id]
-                if not s_row.empty:
-                    medewerker = str(s_row.iloc[0].get("FullName", "") or s_row. iloc[0].get("MedewerkerNaam", "")).strip()
-                    sapnr = str(s_row. iloc[0].get("staffSAPNR", "")).strip()
-                    # V10-FIX: Gebruik cc_col of fallback naar active_costcenter
-                    cc = str(s_row.iloc[0].get(cc_col, "") if cc_col else "").strip() or str(self.active_costcenter or "").strip()
-            
-            # Gebruik de interne USERNAME variabele (veilig)
-            creator = getattr(self, "USERNAME", "System")
+        # 🛑 CRUCIALE CHECK UIT JOUW V8: FAILED RESULTS
+        # Als hij niet nodig lijkt, check of de laatste poging GEFAALD is
+        if (~needs_task).any() and not results.empty and "CertName_norm" in results.columns:
+            results_id_col = id_cfg if id_cfg in results. columns else "staffGID"
+            if results_id_col in results.columns:
+                sort_col = next((c for c in ["Behaald", "Exam_Date", "CompletedDate"] if c in results.columns), None)
+                laatste = pd.DataFrame({
+                    "_sid": results[results_id_col].astype(str).str.strip(),
+                    "_norm": results["CertName_norm"].astype(str).str.strip(),
+                    "_last_status": results["Status"].astype(str).str.strip().str.lower() if "Status" in results.columns else "",
+                    "_datum": pd.to_datetime(results[sort_col], errors="coerce") if sort_col else pd.NaT,
+                })
+                laatste = laatste.sort_values("_datum", ascending=False, kind="mergesort").drop_duplicates(keys, keep="first")
+                last_status = cand[keys].merge(laatste[keys + ["_last_status"]], on=keys, how="left")["_last_status"]
+                gefaald = (~needs_task) & last_status.isin(["not certified", "failed", "niet geslaagd", "gefaald", "gezakt"]).to_numpy()
+                reason = reason.mask(gefaald, "Niet geslaagd - herinschrijving nodig")
+                needs_task |= gefaald
+
+        cand = cand[needs_task]
+        if cand.empty:
+            print("      ℹ️ Geen nieuwe taken nodig.")
+            return
 
-            new_row = {
-                id_cfg:  staff_id,
-                "staffGID": staff_id,
-                "staffSAPNR": sapnr,
-                "MedewerkerNaam": medewerker,
-                "CostCenter": cc,
-                "CertName":  cert_name_orig,
-                "CertName_norm":  cert_name_norm,
-                "TaskType": "Certificaat",
-                "Status": "Open",
-                "Status_Detail": reason,
-                "Nodig": True,
-                "Strategisch":  row.get("Strategisch", False),
-                "Commentaar": row.get("Commentaar", ""),
-                "CreatedAt": now,
-                "LastUpdatedAt": now,
-                "CreatedBy": creator,
-                "ExpiryDate": expiry_date,
-                "DaysUntilExpiry": days_until
-            }
-            new_rows.append(new_row)
-            
-            # Voeg toe aan map om dubbele in deze loop te voorkomen
-            if key_simple not in existing_task_map:  existing_task_map[key_simple] = []
-            existing_task_map[key_simple].append("open")
+        # 7. NIEUWE RIJEN (1 frame)
+        def _staff_field(cols):
+            vals = pd.Series("", index=cand.index, dtype=object)
+            if staff_first.empty:
+                return vals
+            for c in cols:
+                if c in staff_first.columns:
+                    v = cand["_sid"].map(staff_first[c].fillna("").astype(str).str.strip()).fillna("")
+                    vals = vals.where(vals != "", v)
+            return vals
+
+        medewerker = _staff_field(["FullName", "MedewerkerNaam"])
+        sapnr = _staff_field(["staffSAPNR"])
+        # V10-FIX: Gebruik cc_col of fallback naar active_costcenter
+        cc = _staff_field([cc_col] if cc_col else [])
+        cc = cc.where(cc != "", str(self.active_costcenter or "").strip())
+        if staff_first.empty:
+            cc = pd.Series("", index=cand.index)
+
+        # Gebruik de interne USERNAME variabele (veilig)
+        creator = getattr(self, "USERNAME", "System")
+
+        new_df = pd.DataFrame({
+            id_cfg: cand["_sid"],
+            "staffGID": cand["_sid"],
+            "staffSAPNR": sapnr,
+            "MedewerkerNaam": medewerker,
+            "CostCenter": cc,
+            "CertName": cand["CertName"].astype(str).str.strip() if "CertName" in cand.columns else "",
+            "CertName_norm": cand["_norm"],
+            "TaskType": "Certificaat",
+            "Status": "Open",
+            "Status_Detail": reason[needs_task],
+            "Nodig": True,
+            "Strategisch": cand["Strategisch"] if "Strategisch" in cand.columns else False,
+            "Commentaar": cand["Commentaar"] if "Commentaar" in cand.columns else "",
+            "CreatedAt": now,
+            "LastUpdatedAt": now,
+            "CreatedBy": creator,
+            "ExpiryDate": exp[needs_task].where(verloopt[needs_task]),
+            "DaysUntilExpiry": days_until[needs_task],
+        }, index=cand.index)
 
         # 8. SAMENVOEGEN EN OPSLAAN
-        if new_rows:
-            new_df = pd.DataFrame(new_rows)
-            # Voorkom warnings met pd.concat
-            if not new_df.empty:
-                if not todo.empty:
-                    new_df = new_df.dropna(axis=1, how='all')
-                    
-                self. df["todo"] = pd.concat([todo, new_df], ignore_index=True)
-            print(f"      ✅ {len(new_rows)} nieuwe taken toegevoegd.")
-        else:
-            print("      ℹ️ Geen nieuwe taken nodig.")
+        # Voorkom warnings met pd.concat
+        if not todo.empty:
+            new_df = new_df.dropna(axis=1, how='all')
+        self. df["todo"] = pd.concat([todo, new_df], ignore_index=True)
+        print(f"      ✅ {len(new_df)} nieuwe taken toegevoegd.")
     
-    def apply_overrule_with_zweef(self):
+    def apply_overrule_with_zweef(self) -> pd.Series:
         """
         Apply overrule logic met zweef detection.
+
+        Kolomsgewijs: de ingeschreven taken worden 1x gejoind met training_req
+        (bevestiging binnen 10 dagen + locatie) en daarna met cert_results
+        (niet geslaagd). Alle uitkomsten worden in 1 .loc toegekend.
+        Geeft een boolean change-mask terug (index = todo index).
         """
+        import numpy as np
+
         if "todo" not in self.df:
-            return
+            return pd.Series(dtype=bool)
 
         todo = self.df["todo"]
-        if todo.empty:
-            return
+        if todo.empty or "Status" not in todo.columns:
+            return pd.Series(False, index=todo.index, dtype=bool)
 
         req = self.df.get("training_req", pd.DataFrame())
         results = self.df.get("cert_results", pd.DataFrame())
@@ -4103,123 +4185,323 @@ class DataStore:
         if "staffGID" in todo.columns:
             todo["staffGID"] = todo["staffGID"].astype(str).str.strip()
 
-        if not req.empty:
-            req = req.copy()
-            id_col_req = "staffGID" if "staffGID" in req.columns else self.get_id_column()
-            if id_col_req and id_col_req in req.columns:
-                req["staffGID"] = req[id_col_req].astype(str).str.strip()
-
-        if not results.empty:
-            results = results.copy()
-            id_col_res = "staffGID" if "staffGID" in results.columns else self.get_id_column()
-            if id_col_res and id_col_res in results.columns:
-                results["staffGID"] = results[id_col_res].astype(str).str.strip()
-            if "CertName" in results.columns:
-                results["CertName"] = results["CertName"].astype(str).str.strip()
-
-        sched_col = None
-        loc_col = None
-        if not req.empty:
-            for cand in ["ScheduledDate", "Planned_Date", "PlannedDate"]:
-                if cand in req.columns:
-                    sched_col = cand
-                    break
-            for cand in ["Location", "Locatie", "Plaats"]:
-                if cand in req.columns:
-                    loc_col = cand
-                    break
-
-        res_date_col = None
-        if not results.empty:
-            for cand in ["Einde_sessie", "Exam_Date", "ExamDate", "Date"]:
-                if cand in results.columns:
-                    res_date_col = cand
-                    break
-
-        for idx, row in todo.iterrows():
-            if str(row.get("Status", "")).strip() != "Ingeschreven":
-                continue
+        def _txt(df, c):
+            if c in df.columns:
+                return df[c].fillna("").astype(str).str.strip()
+            return pd.Series("", index=df.index)
+
+        def _bevat(naald: pd.Series, hooiberg: pd.Series, leeg_ok: bool = False) -> np.ndarray:
+            # Elementwise 'naald in hooiberg' (hoofdletterongevoelig).
+            # Lege naald: geen match, tenzij leeg_ok (= filter niet toepassen, zoals bij locatie)
+            return np.fromiter(
+                ((a in b) if a else leeg_ok for a, b in zip(naald.str.lower(), hooiberg.str.lower())),
+                dtype=bool, count=len(naald),
+            )
 
-            staff_id = str(row.get("staffGID", "")).strip()
-            if not staff_id:
-                continue
+        sched_col = next((c for c in ["ScheduledDate", "Planned_Date", "PlannedDate"] if c in req.columns), None) if not req.empty else None
+        loc_col = next((c for c in ["Location", "Locatie", "Plaats"] if c in req.columns), None) if not req.empty else None
+        res_date_col = next((c for c in ["Einde_sessie", "Exam_Date", "ExamDate", "Date"] if c in results.columns), None) if not results.empty else None
+
+        # Ingeschreven taken (1 rij per todo rij, _rij = todo index)
+        staff_ids = _txt(todo, "staffGID")
+        ingeschreven = (todo["Status"].astype(str).str.strip() == "Ingeschreven") & (staff_ids != "")
+        tasks = pd.DataFrame({
+            "_rij": todo.index,
+            "staffGID": staff_ids,
+            "_cert": _txt(todo, "CertName"),
+            "_datum": pd.to_datetime(todo["Ingeschreven_Datum"], errors="coerce") if "Ingeschreven_Datum" in todo.columns else pd.NaT,
+            "_loc": _txt(todo, "Ingeschreven_Locatie"),
+        }, index=todo.index)[ingeschreven]
+
+        if tasks.empty:
+            return pd.Series(False, index=todo.index, dtype=bool)
+
+        # A. Bevestigd in Xaurum: zelfde medewerker, sessie binnen 10 dagen, locatie klopt
+        # Lege placeholders met datetime-kolom, zodat .dt ook werkt als maar 1 tak treffers heeft
+        bevestigd = pd.DataFrame({"_rij": pd.Series(dtype=object), "_sched": pd.Series(dtype="datetime64[ns]")})
+        if sched_col and "staffGID" in req.columns:
+            sessies = pd.DataFrame({
+                "staffGID": req["staffGID"].astype(str).str.strip(),
+                "_sched": pd.to_datetime(req[sched_col], errors="coerce"),
+                "_rloc": _txt(req, loc_col) if loc_col else "",
+                "_pos": np.arange(len(req)),
+            })
+            m = tasks.merge(sessies, on="staffGID", how="inner")
+            # Vergelijk de geplande datum met de ingeschreven datum binnen een ruimere marge (10 dagen).
+            ok = m["_datum"].isna() | ((m["_sched"] - m["_datum"]).dt.days.abs() <= 10)
+            if loc_col:
+                ok &= _bevat(m["_loc"], m["_rloc"], leeg_ok=True)
+            bevestigd = m[ok].sort_values("_pos", kind="mergesort").drop_duplicates("_rij")
+
+        # B. Niet geslaagd: resultaat voor deze medewerker/cert dat niet 'Certified' is
+        gefaald = pd.DataFrame({"_rij": pd.Series(dtype=object), "_rdatum": pd.Series(dtype="datetime64[ns]")})
+        rest = tasks[~tasks["_rij"].isin(bevestigd["_rij"])]
+        if not rest.empty and res_date_col and "staffGID" in results.columns and "CertName" in results.columns:
+            res = pd.DataFrame({
+                "staffGID": results["staffGID"].astype(str).str.strip(),
+                "_rcert": _txt(results, "CertName"),
+                "_rdatum": pd.to_datetime(results[res_date_col], errors="coerce"),
+                "_pos": np.arange(len(results)),
+            })
+            if "Status" in results.columns:
+                res = res[(results["Status"].astype(str) != "Certified").to_numpy()]
+            m = rest.merge(res, on="staffGID", how="inner")
+            gefaald = m[_bevat(m["_cert"], m["_rcert"])].sort_values("_pos", kind="mergesort").drop_duplicates("_rij")
 
-            cert_name = str(row.get("CertName", "")).strip()
-            inschrijf_datum = row.get("Ingeschreven_Datum", pd.NaT)
-            locatie = str(row.get("Ingeschreven_Locatie", "") or "").strip()
-            commentaar = str(row.get("Commentaar", "") or "").strip()
+        if bevestigd.empty and gefaald.empty:
+            return pd.Series(False, index=todo.index, dtype=bool)
 
-            match_req = pd.DataFrame()
-            if not req.empty and sched_col and "staffGID" in req.columns:
-                mask = req["staffGID"] == staff_id
+        commentaar = _txt(todo, "Commentaar")
 
-                if not pd.isna(inschrijf_datum):
-                    sched_series = pd.to_datetime(req[sched_col], errors="coerce")
-                    delta_days = (sched_series - pd.to_datetime(inschrijf_datum)).dt.days.abs()
-                    # Vergelijk de geplande datum met de ingeschreven datum binnen een ruimere marge.
-                    # Voorheen 3 dagen, nu 10 dagen om meer realistische planningswijzigingen op te vangen.
-                    mask &= delta_days <= 10
+        def _bevestig_comment(base: str, date_str) -> str:
+            if isinstance(date_str, str):
+                extra_text = f"Bevestigd in Xaurum op {date_str}."
+                pattern = rf"(?:\s*Bevestigd in Xaurum op\s+{re.escape(date_str)}\.)+"
+                base = re.sub(pattern, "", base).strip()
+            else:
+                extra_text = "Bevestigd in Xaurum (planning)."
+            if extra_text not in base:
+                if base:
+                    base = base.rstrip()
+                    if not base.endswith((".", "!", "?")):
+                        base += "."
+                    base += " "
+                base += extra_text
+            return base
+
+        def _gefaald_comment(base: str, date_str) -> str:
+            if isinstance(date_str, str):
+                extra = f"Niet geslaagd op {date_str}; herinschrijving nodig."
+            else:
+                extra = "Niet geslaagd; herinschrijving nodig."
+            return self.add_unique_comment(base, extra)
+
+        bev_rows = pd.Index(bevestigd["_rij"])
+        fail_rows = pd.Index(gefaald["_rij"])
+        updates = pd.DataFrame({
+            "Status": ["Ingeschreven"] * len(bev_rows) + ["Open"] * len(fail_rows),
+            "Status_Detail": ["Bevestigd in Xaurum"] * len(bev_rows) + ["Niet geslaagd"] * len(fail_rows),
+            "Commentaar": [
+                _bevestig_comment(c, d)
+                for c, d in zip(commentaar.loc[bev_rows], bevestigd["_sched"].dt.strftime("%Y-%m-%d"))
+            ] + [
+                _gefaald_comment(c, d)
+                for c, d in zip(commentaar.loc[fail_rows], gefaald["_rdatum"].dt.strftime("%Y-%m-%d"))
+            ],
+        }, index=bev_rows.append(fail_rows))
+
+        cols = ["Status", "Status_Detail", "Commentaar"]
+        for c in cols:
+            if c not in todo.columns:
+                todo[c] = pd.Series(np.nan, index=todo.index, dtype=object)
+        before = pd.DataFrame({c: _txt(todo, c).loc[updates.index] for c in cols})
+        diff = (before != updates).any(axis=1)
+
+        todo.loc[updates.index, cols] = updates[cols].to_numpy()
+        self.df["todo"] = todo
+        self._sync_replacement_rows(updates.index)
+
+        changed = pd.Series(False, index=todo.index, dtype=bool)
+        changed.loc[diff.index[diff.to_numpy()]] = True
+        return changed
+
+    # =========================================================
+    # VERVANGKANDIDATEN-INDEX
+    # =========================================================
+    def _replacement_staff_info(self, staff: pd.DataFrame, id_col: str) -> pd.DataFrame:
+        """Staff-info (naam/costcenter/pool) per ID, zoals find_replacement_candidates die toont."""
+        if staff is None or staff.empty or id_col not in staff.columns:
+            return pd.DataFrame(columns=["_naam", "_cc", "_pool"])
+
+        name_col = next((c for c in ["FullName", "Name+Firstname", "Employee_Name", "Naam"] if c in staff.columns), None)
+        sid = staff[id_col].astype(str).str.strip()
+        info = pd.DataFrame({
+            "_naam": self._first_txt(staff, [name_col] if name_col else []),
+            "_cc": self._first_txt(staff, ["staffCOSTCENTER315", "CostCenter"]),
+            "_pool": self._first_txt(staff, ["Service", "Pool", "OA"]),
+        }).set_index(sid)
+        info = info[info.index != ""]
+        # Laatste rij wint (zoals de vroegere dict-opbouw)
+        return info[~info.index.duplicated(keep="last")]
+
+    @staticmethod
+    def _first_txt(df: pd.DataFrame, cols: List[str]) -> pd.Series:
+        """Eerste niet-lege tekstwaarde over de kolommen `cols` (links naar rechts)."""
+        out = pd.Series("", index=df.index, dtype=object)
+        for c in cols:
+            if c in df.columns:
+                v = df[c].astype(object).where(df[c].notna(), "").astype(str).str.strip()
+                out = out.where(out != "", v)
+        return out
+
+    def _replacement_records(self, frame: pd.DataFrame, staff_info: pd.DataFrame, source: str) -> pd.DataFrame:
+        """Vult naam/costcenter/pool aan uit staff_info (fallback = waarde uit de bronrij)."""
+        joined = frame.join(staff_info, on="staff_id")
+        for col, fb in (("name", "_naam"), ("costcenter", "_cc"), ("pool", "_pool")):
+            staff_val = joined[fb].fillna("")
+            frame[col] = staff_val.where(staff_val != "", frame[col])
+        frame["source"] = source
+        return frame
+
+    def _replacement_todo_frame(self, todo: pd.DataFrame, staff_info: pd.DataFrame) -> pd.DataFrame:
+        """1 kandidaat-rij per todo-rij met status Ingeschreven of Open (index = todo-index)."""
+        import numpy as np
 
-                if loc_col and locatie:
-                    mask &= req[loc_col].astype(str).str.contains(locatie, case=False, na=False)
+        id_col = self.get_id_column() or "staffGID"
+        id_col_todo = "staffGID" if "staffGID" in todo.columns else (id_col if id_col in todo.columns else None)
+        if todo.empty or id_col_todo is None or "CertName" not in todo.columns or "Status" not in todo.columns:
+            return pd.DataFrame()
 
-                match_req = req[mask]
+        status = todo["Status"].astype(str).str.lower()
+        ins = status == "ingeschreven"
+        rows = todo[ins | (status == "open")]
+        if rows.empty:
+            return pd.DataFrame()
+        ins = ins[rows.index]
 
-            if not match_req.empty:
-                todo.at[idx, "Status"] = "Ingeschreven"
-                todo.at[idx, "Status_Detail"] = "Bevestigd in Xaurum"
+        datum = (
+            pd.to_datetime(rows["Ingeschreven_Datum"], errors="coerce")
+            if "Ingeschreven_Datum" in rows.columns else pd.Series(pd.NaT, index=rows.index)
+        )
+        frame = pd.DataFrame({
+            "staff_id": rows[id_col_todo].astype(str).str.strip(),
+            "name": self._first_txt(rows, ["MedewerkerNaam"]),
+            "costcenter": self._first_txt(rows, ["CostCenter"]),
+            "pool": self._first_txt(rows, ["Service", "Pool", "OA"]),
+            "type": np.where(ins, "Reeds ingeschreven (andere dag)", "Open in planner (nog niet ingeschreven)"),
+            "_datum": datum.where(ins),
+            "location": self._first_txt(rows, ["Ingeschreven_Locatie"]).where(
+                ins, self._first_txt(rows, ["PlannedLocation", "Ingeschreven_Locatie"])
+            ),
+            "_norm": self._norm_series(rows["CertName"].astype(str)),
+        }, index=rows.index)
+        frame["date"] = frame["_datum"].dt.strftime("%Y-%m-%d").fillna("")
+        return self._replacement_records(frame, staff_info, "todo")
+
+    def _build_replacement_index(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Bouwt (of hergebruikt) de index CertName_norm -> vervangkandidaten.
+
+        - training_req: geplande inschrijvingen (datumfilter gebeurt bij het opzoeken)
+        - todo: taken met status Ingeschreven/Open, per todo-rij bijgehouden zodat
+          refresh_replacement_index() enkel gewijzigde rijen opnieuw verwerkt.
+        Staff-info zit al in de records. De index wordt opnieuw gebouwd wanneer
+        df["staff"], df["training_req"] of df["todo"] een nieuwe versie krijgt; de
+        statuspasses op todo werken enkel hun rijen bij via _sync_replacement_rows().
+        """
+        staff = self.df.get("staff", pd.DataFrame())
+        req = self.df.get("training_req", pd.DataFrame())
+        todo = self.df.get("todo", pd.DataFrame())
+        sig = self._frame_version
 
-                base_comment = str(commentaar or "").strip()
+        idx = getattr(self, "_repl_index", None)
+        if not force and idx and idx["staff_sig"] == sig(staff) and idx["req_sig"] == sig(req):
+            if idx["todo_sig"] != self._todo_index_sig(todo):
+                self.refresh_replacement_index()
+            return self._repl_index
 
-                try:
-                    conf_date = pd.to_datetime(match_req[sched_col].iloc[0]).date()
-                    date_str = conf_date.isoformat()
-                    extra_text = f"Bevestigd in Xaurum op {date_str}."
-                except Exception:
-                    extra_text = "Bevestigd in Xaurum (planning)."
-                    date_str = None
-
-                if date_str is not None:
-                    # 🔧 FIX: Geen spatie tussen ? en :
-                    pattern = rf"(?:\s*Bevestigd in Xaurum op\s+{re.escape(date_str)}\.)+"
-                    base_comment = re.sub(pattern, "", base_comment).strip()
-
-                if extra_text not in base_comment:
-                    if base_comment:
-                        base_comment = base_comment.rstrip()
-                        if not base_comment.endswith((".", "!", "?")):
-                            base_comment += "."
-                        base_comment += " "
-                    base_comment += extra_text
-
-                todo.at[idx, "Commentaar"] = base_comment
-                continue
-               
+        id_col = self.get_id_column() or "staffGID"
+        staff_info = self._replacement_staff_info(staff, id_col)
+
+        # --- training_req ---
+        req_by_norm: Dict[str, List[Dict[str, Any]]] = {}
+        req_dated = False
+        if req is not None and not req.empty and "CertName" in req.columns:
+            id_col_req = "staffGID" if "staffGID" in req.columns else (id_col if id_col in req.columns else None)
+            date_col = next((c for c in ["ScheduledDateParsed", "Planned_Date", "ScheduledDate", "PlannedDate"] if c in req.columns), None)
+            req_dated = date_col is not None
+            try:
+                name_col_req = detect_name_column(req)
+            except Exception:
+                name_col_req = None
+
+            frame = pd.DataFrame({
+                "staff_id": req[id_col_req].astype(str).str.strip() if id_col_req else "",
+                "name": self._first_txt(req, [name_col_req] if name_col_req else []),
+                "costcenter": self._first_txt(req, ["CostCenter", "OA"]),
+                "pool": self._first_txt(req, ["Service", "Pool", "OA"]),
+                "type": "Binnen 6 maanden ingepland",
+                "_datum": pd.to_datetime(req[date_col], errors="coerce") if date_col else pd.NaT,
+                "location": self._first_txt(req, ["Location", "Locatie"]),
+                "_norm": self._norm_series(req["CertName"].astype(str)),
+            }, index=req.index)
+            if req_dated:
+                frame = frame[frame["_datum"].notna()].copy()
+            frame["date"] = frame["_datum"].dt.strftime("%Y-%m-%d").fillna("")
+            frame = self._replacement_records(frame, staff_info, "training_req")
+            for norm, grp in frame.groupby("_norm", sort=False):
+                req_by_norm[norm] = grp.drop(columns="_norm").to_dict("records")
+
+        self._repl_index = {
+            "staff_sig": sig(staff),
+            "req_sig": sig(req),
+            "todo_sig": None,
+            "staff_info": staff_info,
+            "req": req_by_norm,
+            "req_dated": req_dated,
+            "todo": {},
+            "todo_row_norm": {},
+        }
+        self.refresh_replacement_index()
+        return self._repl_index
 
-            match_res = pd.DataFrame()
-            if not results.empty and res_date_col and "staffGID" in results.columns and "CertName" in results.columns:
-                mask_r = results["staffGID"] == staff_id
-                if cert_name:
-                    mask_r &= results["CertName"].astype(str).str.contains(cert_name, case=False, na=False)
-                if "Status" in results.columns:
-                    mask_r &= results["Status"].astype(str) != "Certified"
-                match_res = results[mask_r]
+    def refresh_replacement_index(self, rows=None) -> None:
+        """
+        Werkt het todo-deel van de vervangkandidaten-index bij.
 
-            if not match_res.empty:
-                todo.at[idx, "Status"] = "Open"
-                todo.at[idx, "Status_Detail"] = "Niet geslaagd"
+        rows=None herbouwt het volledige todo-deel; een lijst todo-indexlabels
+        verwerkt enkel die rijen (bv. na een statuswijziging in de planner).
+        """
+        idx = getattr(self, "_repl_index", None)
+        if not idx:
+            self._build_replacement_index()
+            return
 
-                base_comment = str(commentaar or "").strip()
-                try:
-                    fail_date = pd.to_datetime(match_res[res_date_col].iloc[0]).date()
-                    extra = f"Niet geslaagd op {fail_date}; herinschrijving nodig."
-                except Exception:
-                    extra = "Niet geslaagd; herinschrijving nodig."
+        todo = self.df.get("todo", pd.DataFrame())
+        by_norm: Dict[str, Dict[Any, Dict[str, Any]]] = idx["todo"]
+        row_norm: Dict[Any, str] = idx["todo_row_norm"]
 
-                new_comment = self.add_unique_comment(base_comment, extra)
-                todo.at[idx, "Commentaar"] = new_comment
+        if rows is None:
+            by_norm.clear()
+            row_norm.clear()
+            subset = todo
+        else:
+            labels = list(rows)
+            for lbl in labels:
+                old = row_norm.pop(lbl, None)
+                if old is not None:
+                    by_norm.get(old, {}).pop(lbl, None)
+            subset = todo.loc[todo.index.intersection(labels)] if not todo.empty else todo
+
+        frame = self._replacement_todo_frame(subset, idx["staff_info"])
+        if not frame.empty:
+            for lbl, norm, rec in zip(frame.index, frame["_norm"], frame.drop(columns="_norm").to_dict("records")):
+                by_norm.setdefault(norm, {})[lbl] = rec
+                row_norm[lbl] = norm
+
+        idx["todo_sig"] = self._todo_index_sig(todo)
+
+    def _todo_index_sig(self, todo: pd.DataFrame) -> Tuple[Any, int]:
+        """
+        Sleutel van het todo-deel: frameversie + hash van de Status kolom, zodat ook een
+        in-place statuswijziging zonder nieuwe toekenning (todo.loc[...] = ...) gezien wordt.
+        """
+        status = int(pd.util.hash_pandas_object(todo["Status"].astype(str), index=False).sum()) \
+            if todo is not None and "Status" in todo.columns else 0
+        return (self._frame_version(todo), status)
 
-        self.df["todo"] = todo
+    def _sync_replacement_rows(self, rows) -> None:
+        """
+        Na een in-place statuswijziging + self.df["todo"] = todo (versie al gebumpt):
+        was de vervangkandidaten-index actueel vóór die wijziging, dan worden enkel
+        de gewijzigde rijen herwerkt. Anders herbouwt de volgende opzoeking het todo-deel.
+        """
+        idx = getattr(self, "_repl_index", None)
+        todo = self.df.get("todo")
+        if not idx or todo is None:
+            return
+        if idx.get("todo_sig") is not None and idx["todo_sig"][0] == self._frame_previous_version(todo):
+            self.refresh_replacement_index(list(rows))
 
     def find_replacement_candidates(
         self,
@@ -4228,13 +4510,9 @@ class DataStore:
     ) -> List[Dict[str, Any]]:
         """
         Zoekt vervangkandidaten voor een taak.
+        Opzoeking via de vervangkandidaten-index (zie _build_replacement_index).
         """
-        candidates: List[Dict[str, Any]] = []
-
-        todo = self.df.get("todo", pd.DataFrame())
-        req = self.df.get("training_req", pd.DataFrame())
-        staff = self.df.get("staff", pd.DataFrame())
-
+        idx = self._build_replacement_index()
         id_col = self.get_id_column() or "staffGID"
 
         current_id = str(
@@ -4252,250 +4530,320 @@ class DataStore:
         today = pd.Timestamp.today().normalize()
         horizon = today + pd.DateOffset(months=months_ahead)
 
-        staff_map: Dict[str, Dict[str, str]] = {}
-        name_col_staff = None
-
-        if staff is not None and not staff.empty and id_col in staff.columns:
-            for c in ["FullName", "Name+Firstname", "Employee_Name", "Naam"]:
-                if c in staff.columns:
-                    name_col_staff = c
-                    break
+        cur_ts = pd.to_datetime(current_task.get("Ingeschreven_Datum", pd.NaT), errors="coerce")
+        cur_date_norm = cur_ts.normalize() if isinstance(cur_ts, pd.Timestamp) and not pd.isna(cur_ts) else None
 
-            for _, r in staff.iterrows():
-                sid = str(r.get(id_col, "")).strip()
-                if not sid:
-                    continue
-
-                name = str(r.get(name_col_staff, "") or "") if name_col_staff else ""
-                cc = str(
-                    r.get("staffCOSTCENTER315", "")
-                    or r.get("CostCenter", "")
-                    or ""
-                )
-                pool = str(
-                    r.get("Service", "")
-                    or r.get("Pool", "")
-                    or r.get("OA", "")
-                    or ""
-                )
+        candidates: List[Dict[str, Any]] = []
+        for rec in idx["req"].get(cert_norm, ()):
+            if current_id and rec["staff_id"] == current_id:
+                continue
+            if idx["req_dated"] and not (today <= rec["_datum"] <= horizon):
+                continue
+            candidates.append(rec)
 
-                staff_map[sid] = {
-                    "name": name,
-                    "costcenter": cc,
-                    "pool": pool,
-                }
-
-        def get_staff_info(
-            sid: str,
-            fallback_name: str = "",
-            fallback_cc: str = "",
-            fallback_pool: str = "",
-        ) -> tuple:
-            info = staff_map.get(str(sid).strip())
-            if info:
-                name = info.get("name") or fallback_name
-                cc = info.get("costcenter") or fallback_cc
-                pool = info.get("pool") or fallback_pool
-                return name, cc, pool
-            return fallback_name, fallback_cc, fallback_pool
-
-        if not req.empty and "CertName" in req.columns:
-            df_req = req.copy()
-
-            if "staffGID" in df_req.columns:
-                id_col_req = "staffGID"
-            elif id_col in df_req.columns:
-                id_col_req = id_col
-            else:
-                id_col_req = None
+        for rec in idx["todo"].get(cert_norm, {}).values():
+            if current_id and rec["staff_id"] == current_id:
+                continue
+            # Ingeschreven op dezelfde dag als de huidige taak -> geen vervanger
+            if cur_date_norm is not None and not pd.isna(rec["_datum"]) and rec["_datum"].normalize() == cur_date_norm:
+                continue
+            candidates.append(rec)
 
-            if id_col_req:
-                df_req[id_col_req] = df_req[id_col_req].astype(str).str.strip()
+        current_cc = str(current_task.get("CostCenter", "") or "").strip()
+        out = []
+        for rec in candidates:
+            c = {k: v for k, v in rec.items() if k != "_datum"}
+            c["same_costcenter"] = bool(current_cc and c["costcenter"].strip() == current_cc)
+            out.append(c)
 
-            df_req["CertName_norm"] = df_req["CertName"].astype(str).apply(
-                self.normalize_certname
+        def sort_key(c: Dict[str, Any]):
+            return (
+                0 if c.get("same_costcenter") else 1,
+                c.get("type", ""),
+                c.get("date", ""),
+                c.get("name", ""),
             )
 
-            mask = df_req["CertName_norm"] == cert_norm
-            if current_id and id_col_req:
-                mask &= df_req[id_col_req] != current_id
+        out.sort(key=sort_key)
+        return out
 
-            date_col = None
-            for c in ["ScheduledDateParsed", "Planned_Date", "ScheduledDate", "PlannedDate"]:
-                if c in df_req.columns:
-                    df_req[c] = pd.to_datetime(df_req[c], errors="coerce")
-                    date_col = c
-                    break
+    def find_replacement_candidates_bulk(
+        self,
+        tasks: pd.DataFrame,
+        months_ahead: int = 6,
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        """Vervangkandidaten voor meerdere taken tegelijk: {todo-index: [kandidaten]}."""
+        self._build_replacement_index()
+        if tasks is None or tasks.empty:
+            return {}
+        return {
+            lbl: self.find_replacement_candidates(row, months_ahead=months_ahead)
+            for lbl, row in zip(tasks.index, tasks.to_dict("records"))
+        }
 
-            if date_col:
-                d = df_req[date_col]
-                mask &= d.notna() & (d >= today) & (d <= horizon)
-
-            df_req = df_req[mask]
-
-            if not df_req.empty:
-                name_col_req = detect_name_column(df_req)
-                for _, r in df_req.iterrows():
-                    sid = str(r.get(id_col_req, "")).strip() if id_col_req else ""
-                    d = r.get(date_col)
-                    date_str = ""
-                    if isinstance(d, pd.Timestamp) and not pd.isna(d):
-                        date_str = d.date().isoformat()
-
-                    fallback_name = str(r.get(name_col_req or "", "") or "")
-                    fallback_cc = str(r.get("CostCenter", "") or r.get("OA", "") or "")
-                    fallback_pool = str(
-                        r.get("Service", "")
-                        or r.get("Pool", "")
-                        or r.get("OA", "")
-                        or ""
-                    )
+    # ===============================================================
+    # PROFIEL-INDEX PER MEDEWERKER (Medewerkers-tab)
+    # ===============================================================
+    # bron -> (kandidaat ID-kolommen, naamkolom); None = get_id_column()
+    _PROFILE_SOURCES = {
+        "certificates": ([None], "CertName"),
+        "competences": ([None], "Competence"),
+        "training_req": (["staffGID", "staffSAPNR", None], "CertName"),
+        "config_cert": ([None], "CertName"),
+        "competence_config": ([None], "Competence"),
+    }
+
+    def _build_profile_part(self, df: pd.DataFrame, id_cols: List[str], name_col: str) -> Dict[str, Any]:
+        """
+        Eén bron van de profiel-index.
+        rows: staffGID -> rijposities, names: (staffGID, naam_norm) -> eerste rijpositie.
+        Enkel posities worden bewaard; de rijen zelf komen live uit het frame.
+        """
+        import numpy as np
 
-                    name, cc, pool = get_staff_info(sid, fallback_name, fallback_cc, fallback_pool)
-                    loc = str(r.get("Location", "") or r.get("Locatie", "") or "")
-
-                    candidates.append(
-                        {
-                            "staff_id": sid,
-                            "name": name,
-                            "costcenter": cc,
-                            "pool": pool,
-                            "type": "Binnen 6 maanden ingepland",
-                            "date": date_str,
-                            "location": loc,
-                            "source": "training_req",
-                        }
-                    )
+        part = {"rows": {}, "names": {}}
+        if df is None or df.empty:
+            return part
+        col = next((c for c in id_cols if c in df.columns), None)
+        if col is None:
+            return part
+
+        gids = df[col].astype(str).str.strip().to_numpy()
+        part["rows"] = pd.Series(np.arange(len(df))).groupby(gids, sort=False).indices
+
+        if name_col in df.columns:
+            names = df[name_col].astype(str).str.strip()
+            geldig = ((names != "") & (names.str.lower() != "nan")).to_numpy()
+            keys = pd.DataFrame({
+                "gid": gids,
+                "norm": self._norm_series(names).to_numpy(),
+                "pos": np.arange(len(df)),
+            })[geldig].drop_duplicates(["gid", "norm"], keep="first")
+            part["names"] = dict(zip(zip(keys["gid"], keys["norm"]), keys["pos"]))
+        return part
+
+    def _build_profile_index(self) -> Dict[str, Any]:
+        """
+        Bouwt (of hergebruikt) de profiel-index achter load_certificates_for_employee.
+        Per bron een groupby op staffGID; enkel bronnen waarvan het frame vervangen werd
+        (bv. config_cert na on_save) worden opnieuw opgebouwd.
+        """
+        idx = getattr(self, "_profile_index", None)
+        if idx is None:
+            idx = self._profile_index = {}
+        id_col = self.get_id_column() or "staffGID"
 
-        if not todo.empty and "CertName" in todo.columns and "Status" in todo.columns:
-            df_todo = todo.copy()
+        for key, (id_cols, name_col) in self._PROFILE_SOURCES.items():
+            df = self.df.get(key, pd.DataFrame())
+            sig = (self._frame_version(df), id_col)
+            if key not in idx or idx[key]["sig"] != sig:
+                part = self._build_profile_part(df, [c or id_col for c in id_cols], name_col)
+                part["sig"] = sig
+                idx[key] = part
 
-            if "staffGID" in df_todo.columns:
-                id_col_todo = "staffGID"
-            elif id_col in df_todo.columns:
-                id_col_todo = id_col
-            else:
-                id_col_todo = None
+        # Taal per medewerker
+        staff = self.df.get("staff", pd.DataFrame())
+        if "language" not in idx or idx["staff_sig"] != self._frame_version(staff):
+            language = {}
+            if not staff.empty and "staffGID" in staff.columns and "staffLANGUAGE" in staff.columns:
+                lang = pd.Series(
+                    staff["staffLANGUAGE"].astype(str).str.strip().str.upper().to_numpy(),
+                    index=staff["staffGID"].astype(str).str.strip().to_numpy(),
+                )
+                language = lang[~lang.index.duplicated(keep="first")].to_dict()
+            idx["language"] = language
+            idx["staff_sig"] = self._frame_version(staff)
+
+        # Strategische namen (master) als set
+        m_cert = getattr(self, "master_cert_all", None)
+        m_comp = getattr(self, "master_comp_all", None)
+        master_sig = (self._frame_version(m_cert), self._frame_version(m_comp))
+        if "strategic_cert" not in idx or idx["master_sig"] != master_sig:
+            idx["strategic_cert"] = set(m_cert["CertName"].dropna().astype(str)) if isinstance(m_cert, pd.DataFrame) and "CertName" in m_cert.columns else set()
+            idx["strategic_comp"] = set(m_comp["Competence"].dropna().astype(str)) if isinstance(m_comp, pd.DataFrame) and "Competence" in m_comp.columns else set()
+            idx["master_sig"] = master_sig
+
+        return idx
+
+    def get_employee_profile(self, staff_gid) -> Dict[str, Any]:
+        """
+        Alle gegevens van één medewerker via de profiel-index (O(rijen van die medewerker)).
 
-            if id_col_todo:
-                df_todo[id_col_todo] = df_todo[id_col_todo].astype(str).str.strip()
+        Returns dict met per bron (certificates, competences, training_req, config_cert,
+        competence_config) het deelframe, plus language, strategic_cert en strategic_comp.
+        """
+        idx = self._build_profile_index()
+        gid = str(staff_gid).strip()
+        profile = {
+            "language": idx["language"].get(gid, "N"),
+            "strategic_cert": idx["strategic_cert"],
+            "strategic_comp": idx["strategic_comp"],
+        }
+        for key in self._PROFILE_SOURCES:
+            df = self.df.get(key, pd.DataFrame())
+            pos = idx[key]["rows"].get(gid)
+            profile[key] = df.iloc[pos] if pos is not None else df.iloc[0:0]
+        return profile
+
+    def get_profile_row(self, source: str, staff_gid, name_norm: str) -> Optional[pd.Series]:
+        """Eerste rij van een bron voor (staffGID, CertName_norm), of None."""
+        idx = self._build_profile_index()
+        pos = idx[source]["names"].get((str(staff_gid).strip(), name_norm))
+        return self.df[source].iloc[pos] if pos is not None else None
+
+    # ===============================================================
+    # AFDELING / MEDEWERKER DIRECTORY (Medewerkers-tab)
+    # ===============================================================
+    def get_staff_directory(self) -> Dict[str, Any]:
+        """
+        Directory voor de dropdowns van de Medewerkers-tab, 1x opgebouwd per staff-frame.
 
-            df_todo["CertName_norm"] = df_todo["CertName"].astype(str).apply(
-                self.normalize_certname
-            )
+        Returns dict met:
+        - cc_col: gebruikte CostCenter kolom (of None)
+        - departments: [(cc, label)] gesorteerd, label = "cc – org unit"
+        - names: {cc: [gesorteerde FullNames]}, sleutel None = alle medewerkers
+        - name_to_id: {FullName: staffGID} (eerste rij per naam)
+        """
+        staff = self.df.get("staff", pd.DataFrame())
+        id_col = self.get_id_column()
+        sig = (self._frame_version(staff), id_col)
+        directory = getattr(self, "_staff_directory", None)
+        if directory and directory["sig"] == sig:
+            return directory
 
-            same_cert = df_todo["CertName_norm"] == cert_norm
-            status_series = df_todo["Status"].astype(str).str.lower()
+        directory = {"sig": sig, "cc_col": None, "departments": [], "names": {None: []}, "name_to_id": {}}
+        self._staff_directory = directory
+        if staff is None or staff.empty:
+            return directory
 
-            if "Ingeschreven_Datum" in df_todo.columns:
-                df_todo["Ingeschreven_Datum"] = pd.to_datetime(
-                    df_todo["Ingeschreven_Datum"], errors="coerce"
-                )
-            else:
-                df_todo["Ingeschreven_Datum"] = pd.NaT
+        cc_col = next((c for c in ("CostCenter", "staffCOSTCENTER315") if c in staff.columns), None)
+        directory["cc_col"] = cc_col
 
-            cur_raw = current_task.get("Ingeschreven_Datum", pd.NaT)
-            cur_ts = pd.to_datetime(cur_raw, errors="coerce")
-            if isinstance(cur_ts, pd.Timestamp) and not pd.isna(cur_ts):
-                cur_date_norm = cur_ts.normalize()
+        if "FullName" in staff.columns:
+            names = staff["FullName"].dropna().astype(str)
+            directory["names"][None] = sorted(names.unique().tolist())
+            if id_col and id_col in staff.columns:
+                first = staff.loc[names.index].drop_duplicates("FullName", keep="first")
+                directory["name_to_id"] = dict(zip(
+                    first["FullName"].astype(str), first[id_col].astype(str).str.strip()
+                ))
+
+        if cc_col:
+            cc = staff[cc_col].astype(object).where(staff[cc_col].notna(), "nan").astype(str)
+            if "staffORGUNIT" in staff.columns:
+                units = staff["staffORGUNIT"].groupby(cc, sort=False).first()
             else:
-                cur_date_norm = None
-
-            if id_col_todo:
-                mask_ins = same_cert & (status_series == "ingeschreven")
-                if current_id:
-                    mask_ins &= df_todo[id_col_todo] != current_id
-                if cur_date_norm is not None:
-                    mask_ins &= (
-                        df_todo["Ingeschreven_Datum"].isna()
-                        | (df_todo["Ingeschreven_Datum"].dt.normalize() != cur_date_norm)
-                    )
+                units = pd.Series(dtype=object)
+            for value in sorted(cc.unique().tolist()):
+                if value.lower() == "nan":
+                    continue
+                unit = units.get(value)
+                unit = "" if unit is None or pd.isna(unit) else str(unit)
+                directory["departments"].append((value, f"{value} – {unit}" if unit else value))
+
+            if "FullName" in staff.columns:
+                pairs = pd.DataFrame({"cc": cc, "name": staff["FullName"]}).dropna(subset=["name"])
+                pairs["name"] = pairs["name"].astype(str)
+                pairs = pairs.drop_duplicates().sort_values("name", kind="stable")
+                for value, grp in pairs.groupby("cc", sort=False):
+                    directory["names"][value] = grp["name"].tolist()
+
+        return directory
+
+    # ===============================================================
+    # ZOEKINDEX MASTER-NAMEN (typeahead Medewerkers-tab)
+    # ===============================================================
+    @staticmethod
+    def _ngrams(text: str, n_max: int = 3) -> set:
+        """Alle substrings van lengte 1..n_max (1- en 2-grams dekken korte zoektermen)."""
+        return {text[i:i + n] for n in range(1, n_max + 1) for i in range(len(text) - n + 1)}
+
+    def _build_search_index(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Bouwt (of hergebruikt) de zoekindex over all_cert_names + all_competence_names.
+        Per naam: lowercase en genormaliseerde sleutel; n-gram index (1..3) over beide.
+        Wordt opnieuw gebouwd wanneer de naamsets vervangen worden.
+        """
+        certs = getattr(self, "all_cert_names", None) or set()
+        comps = getattr(self, "all_competence_names", None) or set()
+        sig = (self._frame_version(certs), self._frame_version(comps))
+        idx = getattr(self, "_search_index", None)
+        if not force and idx and idx["sig"] == sig:
+            return idx
+
+        kinds, names = [], []
+        for kind, subset in (("CERT", certs), ("VAARD", comps)):
+            for name in sorted(subset):
+                kinds.append(kind); names.append(name)
+        lowers = [n.lower() for n in names]
+        norms = self._norm_series(pd.Series(names, dtype=object)).tolist() if names else []
+
+        grams: Dict[str, set] = {}
+        for i, (low, norm) in enumerate(zip(lowers, norms)):
+            for g in self._ngrams(low) | self._ngrams(norm):
+                grams.setdefault(g, set()).add(i)
+
+        self._search_index = {
+            "sig": sig, "kind": kinds, "name": names, "lower": lowers, "norm": norms, "grams": grams,
+        }
+        self._search_last = None
+        return self._search_index
+
+    @staticmethod
+    def _search_candidates(idx: Dict[str, Any], q: str) -> set:
+        """Kandidaat-ids via de n-gram index (superset; wordt daarna exact gecontroleerd)."""
+        if len(q) <= 3:
+            return set(idx["grams"].get(q, ()))
+        sets = sorted((idx["grams"].get(q[i:i + 3], set()) for i in range(len(q) - 2)), key=len)
+        cand = set(sets[0])
+        for st in sets[1:]:
+            if not cand:
+                break
+            cand &= st
+        return cand
 
-                df_ins = df_todo[mask_ins]
-                for _, r in df_ins.iterrows():
-                    sid = str(r.get(id_col_todo, "")).strip()
-                    d = r.get("Ingeschreven_Datum")
-                    date_str = ""
-                    if isinstance(d, pd.Timestamp) and not pd.isna(d):
-                        date_str = d.date().isoformat()
-
-                    fallback_name = str(r.get("MedewerkerNaam", "") or "")
-                    fallback_cc = str(r.get("CostCenter", "") or "")
-                    fallback_pool = str(
-                        r.get("Service", "")
-                        or r.get("Pool", "")
-                        or r.get("OA", "")
-                        or ""
-                    )
+    def search_master_names(self, query: str, prefer: str = "CERT", limit: int = 50) -> List[Tuple[str, str]]:
+        """
+        Typeahead over master certificaten + vaardigheden: [(type, naam)], type = "CERT" / "VAARD".
 
-                    name, cc, pool = get_staff_info(sid, fallback_name, fallback_cc, fallback_pool)
-                    loc = str(r.get("Ingeschreven_Locatie", "") or "")
-
-                    candidates.append(
-                        {
-                            "staff_id": sid,
-                            "name": name,
-                            "costcenter": cc,
-                            "pool": pool,
-                            "type": "Reeds ingeschreven (andere dag)",
-                            "date": date_str,
-                            "location": loc,
-                            "source": "todo",
-                        }
-                    )
+        Match op lowercase naam of op de genormaliseerde sleutel (bv. "hs" -> HOOGSPANNING via de vertaaltabel).
+        Rangschikking: voorkeurstype eerst, dan prefix-matches, dan overige, dan naam.
+        Groeit de zoekterm ten opzichte van de vorige, dan wordt enkel binnen de vorige resultaten gezocht.
+        """
+        import heapq
 
-            if id_col_todo:
-                mask_open = same_cert & (status_series == "open")
-                if current_id:
-                    mask_open &= df_todo[id_col_todo] != current_id
-
-                df_open = df_todo[mask_open]
-                for _, r in df_open.iterrows():
-                    sid = str(r.get(id_col_todo, "")).strip()
-                    fallback_name = str(r.get("MedewerkerNaam", "") or "")
-                    fallback_cc = str(r.get("CostCenter", "") or "")
-                    fallback_pool = str(
-                        r.get("Service", "")
-                        or r.get("Pool", "")
-                        or r.get("OA", "")
-                        or ""
-                    )
+        s = str(query or "").strip().lower()
+        if not s:
+            self._search_last = None
+            return []
 
-                    name, cc, pool = get_staff_info(sid, fallback_name, fallback_cc, fallback_pool)
-                    loc = str(
-                        r.get("PlannedLocation", "")
-                        or r.get("Ingeschreven_Locatie", "")
-                        or ""
-                    )
+        idx = self._build_search_index()
+        q_norm = self.normalize_certname(s)
 
-                    candidates.append(
-                        {
-                            "staff_id": sid,
-                            "name": name,
-                            "costcenter": cc,
-                            "pool": pool,
-                            "type": "Open in planner (nog niet ingeschreven)",
-                            "date": "",
-                            "location": loc,
-                            "source": "todo",
-                        }
-                    )
+        last = getattr(self, "_search_last", None)
+        if last and last[0] is idx and last[1] in s and ((last[2] and last[2] in q_norm) or (not last[2] and not q_norm)):
+            pool = last[3]
+        else:
+            pool = self._search_candidates(idx, s)
+            if q_norm:
+                pool = pool | self._search_candidates(idx, q_norm)
 
-        current_cc = str(current_task.get("CostCenter", "") or "").strip()
-        for c in candidates:
-            cc = str(c.get("costcenter", "") or "").strip()
-            c["same_costcenter"] = bool(current_cc and cc == current_cc)
+        lowers, norms = idx["lower"], idx["norm"]
+        matched = {i for i in pool if s in lowers[i] or (q_norm and q_norm in norms[i])}
+        self._search_last = (idx, s, q_norm, matched)
 
-        def sort_key(c: Dict[str, Any]):
-            return (
-                0 if c.get("same_costcenter") else 1,
-                c.get("type", ""),
-                c.get("date", ""),
-                c.get("name", ""),
-            )
+        kinds, names = idx["kind"], idx["name"]
 
-        candidates.sort(key=sort_key)
-        return candidates
+        def rank(i):
+            if lowers[i].startswith(s) or (q_norm and norms[i].startswith(q_norm)):
+                r = 0
+            elif s in lowers[i]:
+                r = 1
+            else:
+                r = 2
+            return (0 if kinds[i] == prefer else 1, r, names[i])
+
+        return [(kinds[i], names[i]) for i in heapq.nsmallest(limit, matched, key=rank)]
 
     def apply_costcenter_filter(self, active_costcenter: str | None):
         """
@@ -4562,6 +4910,70 @@ class DataStore:
             self.df["todo"] = todo
    
     
+    @staticmethod
+    def _blank_mask(series: pd.Series) -> pd.Series:
+        """Leeg = NaN/None of tekst '', 'nan', 'none', 'nat' (ook voor category/string dtype)."""
+        txt = series.astype(object).where(series.notna(), "").astype(str).str.strip().str.lower()
+        return series.isna() | txt.isin(["", "nan", "none", "nat"])
+
+    def _enrich_todo_from_staff(
+        self,
+        todo: pd.DataFrame,
+        staff: pd.DataFrame,
+        fill_costcenter: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Kolomsgewijze staff-verrijking van todo (1 map per kolom op de staff-index).
+
+        - Vul (indien leeg): MedewerkerNaam, staffSAPNR, MedewerkerID
+        - fill_costcenter=True: ook lege CostCenter (STAP 10.5, volledige staff lijst)
+        - Bestaande waarden blijven staan (gestript als tekst).
+        """
+        id_col = self.get_id_column() or "staffGID"
+        join_col = next((c for c in ("staffGID", "staffSAPNR", id_col) if c in todo.columns and c in staff.columns), None)
+        if join_col is None:
+            return todo
+
+        staff_key = staff[join_col].astype(str).str.strip()
+        todo[join_col] = todo[join_col].astype(str).str.strip()
+        keys = todo[join_col]
+
+        def _fill(target: str, source: Optional[str], keep: str = "first") -> None:
+            if target not in todo.columns:
+                todo[target] = ""
+            blank = self._blank_mask(todo[target])
+            current = todo[target].astype(object).where(blank, todo[target].astype(str).str.strip())
+            if source is None or source not in staff.columns:
+                fill = pd.Series("", index=todo.index, dtype=object)
+            else:
+                vals = staff[source].astype(object).where(~self._blank_mask(staff[source]), "")
+                lookup = pd.Series(vals.astype(str).str.strip().to_numpy(), index=staff_key)
+                lookup = lookup[~lookup.index.duplicated(keep=keep)]
+                fill = keys.map(lookup).fillna("")
+            todo[target] = current.where(~blank, fill)
+
+        name_col = next((c for c in ("FullName", "Name+Firstname", "Employee_Name", "Naam", "MedewerkerNaam") if c in staff.columns), None)
+        sap_col = next((c for c in ("staffSAPNR", "SAPNR", "PersNr", "PersoneelsNr") if c in staff.columns), None)
+
+        if fill_costcenter:
+            # V10-FIX: staff kan CostCenter of staffCOSTCENTER315 hebben; laatste staff-rij wint (zoals vroeger)
+            cc_col = next((c for c in ("CostCenter", "staffCOSTCENTER315") if c in staff.columns), None)
+            _fill("CostCenter", cc_col, keep="last")
+            _fill("staffSAPNR", sap_col, keep="last")
+        else:
+            _fill("staffSAPNR", sap_col)
+        _fill("MedewerkerNaam", name_col)
+
+        # MedewerkerID: fallback op staffGID als leeg
+        if "MedewerkerID" not in todo.columns:
+            todo["MedewerkerID"] = ""
+        if "staffGID" in todo.columns:
+            blank = self._blank_mask(todo["MedewerkerID"])
+            gid = todo["staffGID"].astype(object).where(~self._blank_mask(todo["staffGID"]), "")
+            todo["MedewerkerID"] = todo["MedewerkerID"].where(~blank, gid.astype(str).str.strip())
+
+        return todo
+
     def enrich_todo_with_staff_info(self) -> None:
         """
         UI-compat helper (wordt door main_window.py aangeroepen):
@@ -4571,114 +4983,41 @@ class DataStore:
         - OVERSCHRIJFT GEEN COSTCENTER MEER (handmatige costcenters blijven behouden bij afdelingswissel)
         
         V2-FIX: CostCenter lookup voorbereid voor beide mogelijke kolomnamen (indien ooit geactiveerd).
+        V3: Kolomsgewijs via _enrich_todo_from_staff (zelfde stap als STAP 10.5).
         """
-        import pandas as pd
-
         todo = self.df. get("todo", pd.DataFrame())
         staff = self.df.get("staff", pd. DataFrame())
         if todo is None or todo.empty or staff is None or staff.empty:
             return
 
-        # Bepaal join kolom (voorkeur staffGID)
-        id_col = self.get_id_column() or "staffGID"
-        join_col = None
-        for c in ("staffGID", "staffSAPNR", id_col):
-            if c in todo. columns and c in staff.columns:
-                join_col = c
-                break
-        if not join_col: 
-            return
-
-        # Kandidaten in staff
-        name_col = None
-        for c in ("FullName", "Name+Firstname", "Employee_Name", "Naam", "MedewerkerNaam"):
-            if c in staff.columns:
-                name_col = c
-                break
-
-        sap_col = None
-        for c in ("staffSAPNR", "SAPNR", "PersNr", "PersoneelsNr"):
-            if c in staff. columns:
-                sap_col = c
-                break
-
-        # V2-FIX: CostCenter kolom zoeken in beide mogelijke namen (voor toekomstig gebruik)
-        # cc_col = None
-        # for c in ("CostCenter", "staffCOSTCENTER315"):  # <-- Volgorde aangepast! 
-        #     if c in staff.columns:
-        #         cc_col = c
-        #         break
-
-        # Prepare subsets (dedupe staff op join)
-        staff_sub_cols = [join_col]
-        if name_col:
-            staff_sub_cols. append(name_col)
-        if sap_col and sap_col not in staff_sub_cols: 
-            staff_sub_cols.append(sap_col)
-        # if cc_col and cc_col not in staff_sub_cols:
-        #     staff_sub_cols.append(cc_col)
-
-        staff_sub = staff[staff_sub_cols].copy()
-        staff_sub[join_col] = staff_sub[join_col].astype(str).str.strip()
-        staff_sub = staff_sub.drop_duplicates(subset=[join_col], keep="first")
-
-        todo2 = todo. copy()
-        todo2[join_col] = todo2[join_col].astype(str).str.strip()
-
-        merged = todo2.merge(staff_sub, on=join_col, how="left", suffixes=("", "_staff"))
-
-        def _is_blank(v) -> bool:
-            if v is None: 
-                return True
-            try:
-                if pd.isna(v):
-                    return True
-            except Exception:
-                pass
-            s = str(v).strip()
-            return (s == "") or (s.lower() == "nan")
-
-        # MedewerkerNaam
-        if "MedewerkerNaam" not in merged.columns:
-            merged["MedewerkerNaam"] = ""
-        if name_col: 
-            staff_name_series = merged[name_col]
-            mask = merged["MedewerkerNaam"].apply(_is_blank)
-            merged.loc[mask, "MedewerkerNaam"] = staff_name_series.loc[mask].astype(str).fillna("").map(
-                lambda x: "" if str(x).strip().lower() == "nan" else str(x).strip()
-            )
+        self.df["todo"] = self._enrich_todo_from_staff(todo, staff, fill_costcenter=False)
+        print("   ✅ enrich_todo_with_staff_info: todo verrijkt (CostCenter ongewijzigd gelaten)")
+    
+    def _dedupe_frame(
+        self,
+        df: pd.DataFrame,
+        keys: List[str],
+        sort_cols: Optional[List[str]] = None,
+        ascending: Optional[List[bool]] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Sort + drop_duplicates op reeds genormaliseerde sleutelkolommen
+        (datumkolommen in sort_cols moeten al datetime zijn).
 
-        # staffSAPNR
-        if "staffSAPNR" not in merged.columns:
-            merged["staffSAPNR"] = ""
-        if sap_col:
-            mask = merged["staffSAPNR"].apply(_is_blank)
-            merged.loc[mask, "staffSAPNR"] = merged[sap_col].loc[mask].astype(str).fillna("").map(
-                lambda x: "" if str(x).strip().lower() == "nan" else str(x).strip()
-            )
+        Returns: (df zonder dubbels, dubbele groepen met kolom '_behouden').
+        Zonder dubbels wordt df ongewijzigd teruggegeven (geen sort/copy).
+        """
+        dup_any = df.duplicated(subset=keys, keep=False)
+        if not dup_any.any():
+            return df, df.iloc[0:0]
 
-        # MedewerkerID:  fallback op staffGID/ID kolom als leeg
-        if "MedewerkerID" not in merged.columns:
-            merged["MedewerkerID"] = ""
-        if "staffGID" in merged.columns:
-            mask = merged["MedewerkerID"].apply(_is_blank)
-            merged.loc[mask, "MedewerkerID"] = merged["staffGID"].loc[mask].astype(str).fillna("").map(
-                lambda x: "" if str(x).strip().lower() == "nan" else str(x).strip()
-            )
+        if sort_cols:
+            df = df.sort_values(sort_cols, ascending=ascending or False, kind="mergesort")
 
-        # Opruimen extra staff kolommen (behalve join)
-        drop_cols = []
-        if name_col and name_col not in ("MedewerkerNaam", join_col):
-            drop_cols.append(name_col)
-        if sap_col and sap_col not in ("staffSAPNR", join_col) and sap_col in merged.columns:
-            drop_cols.append(sap_col)
-        # if cc_col and cc_col not in ("CostCenter", join_col) and cc_col in merged. columns:
-        #     drop_cols. append(cc_col)
-        merged.drop(columns=[c for c in drop_cols if c in merged.columns], inplace=True, errors="ignore")
+        keep = ~df.duplicated(subset=keys, keep="first")
+        groups = df[dup_any.reindex(df.index).to_numpy()].assign(_behouden=keep)
+        return df[keep], groups.sort_values(keys, kind="mergesort")
 
-        self.df["todo"] = merged
-        print("   ✅ enrich_todo_with_staff_info: todo verrijkt (CostCenter ongewijzigd gelaten)")
-    
     def remove_duplicate_tasks(self) -> int:
         """
         UI-compat helper:
@@ -4693,98 +5032,64 @@ class DataStore:
         - voorkeur voor rijen met TaskID
         - daarna meest recente LastUpdatedAt, dan CreatedAt
 
+        De dubbele groepen (incl. '_behouden') staan daarna in self.last_duplicate_tasks.
+
         Returns: aantal verwijderde rijen.
         """
-        import pandas as pd
-
         todo = self.df.get("todo", pd.DataFrame())
+        self.last_duplicate_tasks = pd.DataFrame()
         if todo is None or todo.empty:
             return 0
 
-        df = todo.copy()
-
         # bepaal id kolom
         id_candidates = ["staffGID", "MedewerkerID", "staffSAPNR", self.get_id_column()]
-        id_col = None
-        for c in id_candidates:
-            if c and c in df.columns:
-                id_col = c
-                break
+        id_col = next((c for c in id_candidates if c and c in todo.columns), None)
         if not id_col:
             return 0
 
-        # taaktype kolom
-        task_type_col = "TaskType" if "TaskType" in df.columns else None
-
-        # naam kolommen
-        norm = getattr(self, "normalize_certname", lambda x: str(x).strip().lower())
-
         # zorg dat we een norm kolom hebben om op te dedupen
-        if "CertName_norm" in df.columns:
+        if "CertName_norm" in todo.columns:
             name_norm_col = "CertName_norm"
-        elif "Competence_norm" in df.columns:
+        elif "Competence_norm" in todo.columns:
             name_norm_col = "Competence_norm"
         else:
             # bouw best effort norm vanuit CertName/Competence
-            src_col = None
-            for c in ("CertName", "Competence"):
-                if c in df.columns:
-                    src_col = c
-                    break
+            src_col = next((c for c in ("CertName", "Competence") if c in todo.columns), None)
             if not src_col:
                 return 0
             name_norm_col = "_Name_norm_tmp"
-            df[name_norm_col] = df[src_col].astype(str).apply(norm)
 
-        # normaliseer id strings
-        df[id_col] = df[id_col].astype(str).str.strip()
+        df = todo
+        if name_norm_col == "_Name_norm_tmp":
+            df = todo.assign(_Name_norm_tmp=self._norm_series(todo[src_col].astype(str)))
 
-        # sorteer zodat "beste" rij eerst staat
-        def _has_taskid(val) -> int:
-            try:
-                if pd.isna(val):
-                    return 0
-            except Exception:
-                pass
-            s = str(val).strip()
-            return 0 if (s == "" or s.lower() == "nan") else 1
+        # normaliseer id strings (sleutel) + TaskID voorkeur
+        df = df.assign(
+            _id_key=df[id_col].astype(str).str.strip(),
+            _has_taskid=(~self._blank_mask(df["TaskID"])).astype(int) if "TaskID" in df.columns else 0,
+        )
 
-        if "TaskID" in df.columns:
-            df["_has_taskid"] = df["TaskID"].apply(_has_taskid)
-        else:
-            df["_has_taskid"] = 0
+        # Vervang door (voeg Status toe):
+        dedup_cols = ["_id_key", name_norm_col, "Status"]
+        if "TaskType" in df.columns:
+            dedup_cols.append("TaskType")
 
+        # sorteer zodat "beste" rij eerst staat
+        sort_cols = ["_has_taskid"]
         for dt_col in ("LastUpdatedAt", "CreatedAt"):
             if dt_col in df.columns:
                 df[dt_col] = pd.to_datetime(df[dt_col], errors="coerce")
-
-        sort_cols = ["_has_taskid"]
-        sort_asc = [False]
-        if "LastUpdatedAt" in df.columns:
-            sort_cols.append("LastUpdatedAt")
-            sort_asc.append(False)
-        if "CreatedAt" in df.columns:
-            sort_cols.append("CreatedAt")
-            sort_asc.append(False)
-
-        df = df.sort_values(sort_cols, ascending=sort_asc, kind="mergesort")
-        
-        # Vervang door (voeg Status toe):
-        dedup_cols = [id_col, name_norm_col, "Status"]
-        #dedup_cols = [id_col, name_norm_col]
-        if task_type_col:
-            dedup_cols.append(task_type_col)
-
+                sort_cols.append(dt_col)
         before = len(df)
-        df = df.drop_duplicates(subset=dedup_cols, keep="first").copy()
+        df, groups = self._dedupe_frame(df, dedup_cols, sort_cols, [False] * len(sort_cols))
         removed = before - len(df)
 
-        # cleanup helper cols
-        df.drop(columns=["_has_taskid"], inplace=True, errors="ignore")
-        if name_norm_col == "_Name_norm_tmp":
-            df.drop(columns=[name_norm_col], inplace=True, errors="ignore")
+        helper_cols = ["_has_taskid", "_id_key", "_Name_norm_tmp"]
+        self.last_duplicate_tasks = groups.drop(columns=helper_cols, errors="ignore")
 
         if removed > 0:
+            df = df.drop(columns=helper_cols, errors="ignore")
+            df[id_col] = df[id_col].astype(str).str.strip()
             self.df["todo"] = df
             print(f"   🧹 remove_duplicate_tasks: {before} → {len(df)} (verwijderd: {removed})")
         else:
@@ -4798,122 +5103,70 @@ class DataStore:
         Dedupe in-memory dataframes voor config/certificates/training_req zodat
         dubbele rijen niet voor rare sync-issues zorgen.
 
+        Norm kolommen worden enkel aangevuld waar ze leeg zijn (_ensure_norm_column).
+        De dubbele groepen staan daarna in self.last_duplicate_configs (kolom '_bron').
+
         Returns: totaal aantal verwijderde rijen.
         """
-        import pandas as pd
-
         removed_total = 0
-        norm = getattr(self, "normalize_certname", lambda x: str(x).strip().lower())
         id_col = self.get_id_column() or "staffGID"
+        audit = []
 
-        def _to_dt(s):
-            return pd.to_datetime(s, errors="coerce")
+        def _dedupe(key: str, rid: Optional[str], norm_col: str, name_col: str, sort_candidates, date_keys=None) -> Optional[pd.DataFrame]:
+            nonlocal removed_total
+            df = self.df.get(key, pd.DataFrame())
+            if df is None or df.empty or rid is None or rid not in df.columns:
+                return None
+            df[rid] = df[rid].astype(str).str.strip()
+            if name_col in df.columns:
+                self._ensure_norm_column(df, name_col=name_col, norm_col=norm_col)
+            if norm_col not in df.columns:
+                return None
 
-        # --- Config certificaten
-        cfg = self.df.get("config_cert", pd.DataFrame())
-        if cfg is not None and not cfg.empty:
-            df = cfg.copy()
-            if id_col in df.columns:
-                df[id_col] = df[id_col].astype(str).str.strip()
-            if "CertName_norm" not in df.columns and "CertName" in df.columns:
-                df["CertName_norm"] = df["CertName"].astype(str).apply(norm)
-
-            sort_col = None
-            for c in ("LaatsteWijziging", "LastUpdatedAt", "CreatedAt"):
-                if c in df.columns:
-                    df[c] = _to_dt(df[c])
-                    sort_col = c
-                    break
+            subset = [rid, norm_col]
+            sort_col = next((c for c in sort_candidates if c in df.columns), None)
+            if sort_col:
+                df[sort_col] = pd.to_datetime(df[sort_col], errors="coerce")
+            if date_keys is not None:
+                date_col = next((c for c in date_keys if c in df.columns), None)
+                if date_col:
+                    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+                    subset.append(date_col)
 
             before = len(df)
-            if sort_col:
-                df = df.sort_values(sort_col, ascending=False, kind="mergesort")
-            df = df.drop_duplicates(subset=[id_col, "CertName_norm"], keep="first")
+            df, groups = self._dedupe_frame(df, subset, [sort_col] if sort_col else None, [False])
             removed_total += before - len(df)
+            if not groups.empty:
+                audit.append(groups.assign(_bron=key))
+            return df
 
+        # --- Config certificaten
+        df = _dedupe("config_cert", id_col, "CertName_norm", "CertName", ("LaatsteWijziging", "LastUpdatedAt", "CreatedAt"))
+        if df is not None:
             self.df["config_cert"] = df
             self.df["config"] = df  # alias consistent houden
 
         # --- Config competenties
-        ccfg = self.df.get("competence_config", pd.DataFrame())
-        if ccfg is not None and not ccfg.empty:
-            df = ccfg.copy()
-            if id_col in df.columns:
-                df[id_col] = df[id_col].astype(str).str.strip()
-            if "Competence_norm" not in df.columns and "Competence" in df.columns:
-                df["Competence_norm"] = df["Competence"].astype(str).apply(norm)
-
-            sort_col = None
-            for c in ("LaatsteWijziging", "LastUpdatedAt", "CreatedAt"):
-                if c in df.columns:
-                    df[c] = _to_dt(df[c])
-                    sort_col = c
-                    break
-
-            before = len(df)
-            if sort_col:
-                df = df.sort_values(sort_col, ascending=False, kind="mergesort")
-            df = df.drop_duplicates(subset=[id_col, "Competence_norm"], keep="first")
-            removed_total += before - len(df)
-
+        df = _dedupe("competence_config", id_col, "Competence_norm", "Competence", ("LaatsteWijziging", "LastUpdatedAt", "CreatedAt"))
+        if df is not None:
             self.df["competence_config"] = df
 
         # --- Certificates: behoud nieuwste expiry per medewerker+cert
-        certs = self.df.get("certificates", pd.DataFrame())
-        if certs is not None and not certs.empty:
-            df = certs.copy()
-            if id_col in df.columns:
-                df[id_col] = df[id_col].astype(str).str.strip()
-            if "CertName_norm" not in df.columns and "CertName" in df.columns:
-                df["CertName_norm"] = df["CertName"].astype(str).apply(norm)
-
-            exp_col = None
-            for c in ("Expiry_Date", "ExpiryDate", "Valid_Until", "Geldig_tot", "Geldig_Tot"):
-                if c in df.columns:
-                    exp_col = c
-                    df[c] = _to_dt(df[c])
-                    break
-
-            before = len(df)
-            if exp_col:
-                df = df.sort_values(exp_col, ascending=False, kind="mergesort")
-            df = df.drop_duplicates(subset=[id_col, "CertName_norm"], keep="first")
-            removed_total += before - len(df)
-
+        df = _dedupe("certificates", id_col, "CertName_norm", "CertName", ("Expiry_Date", "ExpiryDate", "Valid_Until", "Geldig_tot", "Geldig_Tot"))
+        if df is not None:
             self.df["certificates"] = df
 
         # --- Training requests: voorkom exacte dubbels (staff+cert+datum)
         req = self.df.get("training_req", pd.DataFrame())
         if req is not None and not req.empty:
-            df = req.copy()
-            rid = None
-            for c in ("staffGID", "staffSAPNR", id_col):
-                if c in df.columns:
-                    rid = c
-                    df[rid] = df[rid].astype(str).str.strip()
-                    break
-
-            if rid:
-                if "CertName_norm" not in df.columns and "CertName" in df.columns:
-                    df["CertName_norm"] = df["CertName"].astype(str).apply(norm)
-
-                date_col = None
-                for c in ("ScheduledDateParsed", "ScheduledDate", "Planned_Date", "PlannedDate"):
-                    if c in df.columns:
-                        df[c] = _to_dt(df[c])
-                        date_col = c
-                        break
-
-                subset = [rid, "CertName_norm"]
-                if date_col:
-                    subset.append(date_col)
-
-                before = len(df)
-                df = df.drop_duplicates(subset=subset, keep="first")
-                removed_total += before - len(df)
-
+            rid = next((c for c in ("staffGID", "staffSAPNR", id_col) if c in req.columns), None)
+            df = _dedupe("training_req", rid, "CertName_norm", "CertName", (),
+                         date_keys=("ScheduledDateParsed", "ScheduledDate", "Planned_Date", "PlannedDate"))
+            if df is not None:
                 self.df["training_req"] = df
 
+        self.last_duplicate_configs = pd.concat(audit, ignore_index=True) if audit else pd.DataFrame()
+
         if removed_total > 0:
             print(f"   🧹 remove_duplicate_configs: verwijderd totaal {removed_total} duplicaten")
 
@@ -4968,6 +5221,7 @@ class DataStore:
         
         # 3. LOGICA STARTEN
         updates = 0
+        changed_rows = []
         now = datetime.now()
 
         def is_failed(s): 
@@ -5016,6 +5270,7 @@ class DataStore:
                      todo.at[idx, "Status_Detail"] = "Niet meer vereist in config"
                      todo.at[idx, "LastUpdatedAt"] = now
                      updates += 1
+                     changed_rows.append(idx)
                      continue 
 
             # ═══════════════════════════════════════════════════════════
@@ -5046,6 +5301,7 @@ class DataStore:
                         todo.at[idx, "Behaald_Datum"] = behaald_dt
                         todo.at[idx, "LastUpdatedAt"] = now
                         updates += 1
+                        changed_rows.append(idx)
 
                 # SCENARIO: NIET GESLAAGD
                 elif is_failed(res_stat):
@@ -5055,9 +5311,11 @@ class DataStore:
                         todo.at[idx, "Ingeschreven_Datum"] = pd.NaT 
                         todo.at[idx, "LastUpdatedAt"] = now
                         updates += 1
+                        changed_rows.append(idx)
 
         if updates > 0:
             self.df["todo"] = todo
+            self._sync_replacement_rows(changed_rows)
             if self.USE_SQL_FOR_TODO:
                 self.save_todo_planner()
                 
@@ -5075,6 +5333,10 @@ class DataStore:
         
         Dit lost het probleem op waarbij iemand ziek is en geen resultaat heeft,
         maar de opleiding wel is afgelopen (omdat anderen wel resultaten hebben).
+
+        Kolomsgewijs: 1 join tussen de sessies (cert_norm + dag) en een resultaten-index
+        per cert_norm (venster van 7 dagen), daarna 1 groupby/anti-join. Lineair in
+        taken + resultaten i.p.v. sessies x resultaten.
         """
         import pandas as pd
         from datetime import datetime
@@ -5112,145 +5374,139 @@ class DataStore:
         
         # Filter op "Ingeschreven" taken met verstreken datum
         today = pd.Timestamp.today().normalize()
-        ingeschreven_tasks = todo[
+        ingeschreven = (
             (todo["Status"].astype(str).str.strip().str.lower() == "ingeschreven") &
             (todo["Ingeschreven_Datum"].notna())
-        ].copy()
-        
-        if ingeschreven_tasks.empty:
+        )
+        if not ingeschreven.any():
             print("   ℹ️ Geen ingeschreven taken met datum gevonden")
             return
         
-        # Converteer datum naar datetime
-        ingeschreven_tasks["Ingeschreven_Datum"] = pd.to_datetime(ingeschreven_tasks["Ingeschreven_Datum"], errors="coerce")
+        sessies = pd.DataFrame({
+            "_rij": todo.index[ingeschreven],
+            "staffGID": todo.loc[ingeschreven, "staffGID"].astype(str).str.strip() if "staffGID" in todo.columns else "",
+            "CertName": todo.loc[ingeschreven, "CertName"].astype(str),
+            "_datum": pd.to_datetime(todo.loc[ingeschreven, "Ingeschreven_Datum"], errors="coerce"),
+        })
         
         # Filter op verstreken datums (> 1 dag geleden)
-        ingeschreven_tasks["days_ago"] = (today - ingeschreven_tasks["Ingeschreven_Datum"]).dt.days
-        verstreken_tasks = ingeschreven_tasks[ingeschreven_tasks["days_ago"] > 1].copy()
-        
-        if verstreken_tasks.empty:
+        sessies = sessies[(today - sessies["_datum"]).dt.days > 1]
+        if sessies.empty:
             print("   ℹ️ Geen verstreken ingeschreven taken gevonden")
             return
         
-        # Normaliseer certnamen
-        verstreken_tasks["CertName_norm"] = verstreken_tasks["CertName"].astype(str).apply(self.normalize_certname)
-        
-        # Groepeer op CertName_norm + Ingeschreven_Datum (genormaliseerd naar datum zonder tijd)
-        verstreken_tasks["Training_Key"] = (
-            verstreken_tasks["CertName_norm"].astype(str) + "|" + 
-            verstreken_tasks["Ingeschreven_Datum"].dt.date.astype(str)
-        )
-        
-        updates = 0
-        now = datetime.now()
+        # Groepeer op CertName_norm + Ingeschreven_Datum (dag); sessies met 1 persoon tellen niet mee
+        sessies["CertName_norm"] = self._norm_series(sessies["CertName"])
+        sessies["_dag"] = sessies["_datum"].dt.normalize()
+        sessies = sessies[sessies.groupby(["CertName_norm", "_dag"])["_rij"].transform("size") >= 2]
+        if sessies.empty:
+            print(f"✅ detect_absent_from_completed_training: 0 taken gemarkeerd als afwezig voor {self.active_costcenter}.")
+            return
         
-        # Loop door elke unieke training (CertName + Datum combinatie)
-        for training_key, group in verstreken_tasks.groupby("Training_Key"):
-            if len(group) < 2:
-                continue  # Skip als er maar 1 persoon is ingeschreven
-            
-            # Check of er resultaten zijn voor deze training
-            cert_norm = group["CertName_norm"].iloc[0]
-            training_date = group["Ingeschreven_Datum"].iloc[0]
-            
-            # Zoek resultaten voor deze training (binnen 7 dagen van de opleidingsdatum)
-            training_results = cert_results[
-                (cert_results[res_cert_col].apply(self.normalize_certname) == cert_norm) &
-                (pd.to_datetime(cert_results.get("Behaald", pd.NaT), errors="coerce").notna())
-            ].copy()
+        # Resultaten-index: enkel certs met een verstreken sessie, met geldige 'Behaald' datum
+        behaald = pd.to_datetime(cert_results["Behaald"], errors="coerce") if "Behaald" in cert_results.columns else pd.Series(pd.NaT, index=cert_results.index)
+        res = pd.DataFrame({
+            "_rid": cert_results[res_id_col].astype(str).str.strip(),
+            "_rdag": behaald.dt.normalize(),
+            "_rcert": cert_results[res_cert_col],
+        })[behaald.notna()]
+        res["CertName_norm"] = self._norm_series(res["_rcert"])
+        res = res[res["CertName_norm"].isin(set(sessies["CertName_norm"]))]
+        
+        # Join sessie x resultaten per cert, venster van 7 dagen rond de opleidingsdatum
+        sessie_keys = sessies[["CertName_norm", "_dag"]].drop_duplicates()
+        hits = sessie_keys.merge(res[["CertName_norm", "_rdag", "_rid"]], on="CertName_norm", how="inner")
+        hits = hits[(hits["_rdag"] - hits["_dag"]).dt.days.abs() <= 7]
+        
+        # Sessies met minstens 1 resultaat; wie daar geen resultaat heeft = afwezig
+        met_resultaat = hits[["CertName_norm", "_dag"]].drop_duplicates()
+        kandidaten = sessies.merge(met_resultaat, on=["CertName_norm", "_dag"], how="inner")
+        aanwezig = hits[["CertName_norm", "_dag", "_rid"]].drop_duplicates().rename(columns={"_rid": "staffGID"})
+        kandidaten = kandidaten.merge(aanwezig.assign(_aanwezig=True), on=["CertName_norm", "_dag", "staffGID"], how="left")
+        afwezig = kandidaten[kandidaten["_aanwezig"].isna()]
+        
+        # Skip als niet van deze afdeling
+        if my_department_gids:
+            afwezig = afwezig[afwezig["staffGID"].isin(my_department_gids)]
+        
+        updates = len(afwezig)
+        if updates > 0:
+            now = datetime.now()
+            rows = pd.Index(afwezig["_rij"])
+            datum_txt = afwezig["_dag"].dt.strftime('%d-%m-%Y')
             
-            if training_results.empty:
-                continue  # Geen resultaten voor deze training
+            # Markeer als afwezig (ziekte)
+            todo.loc[rows, "Status"] = "Afwezig (ziekte)"
+            todo.loc[rows, "Status_Detail"] = ("Opleiding afgelopen op " + datum_txt + " - geen resultaat (waarschijnlijk afwezig)").to_numpy()
+            todo.loc[rows, "LastUpdatedAt"] = now
             
-            # Check welke mensen uit de groep resultaten hebben
-            people_with_results = set()
-            for _, result_row in training_results.iterrows():
-                result_staff_id = str(result_row.get(res_id_col, "")).strip()
-                result_date = pd.to_datetime(result_row.get("Behaald", pd.NaT), errors="coerce")
-                
-                # Check of resultaat binnen 7 dagen van opleidingsdatum valt
-                if pd.notna(result_date) and pd.notna(training_date):
-                    days_diff = abs((result_date.normalize() - training_date.normalize()).days)
-                    if days_diff <= 7:
-                        people_with_results.add(result_staff_id)
+            namen = todo.loc[rows, "MedewerkerNaam"] if "MedewerkerNaam" in todo.columns else afwezig["staffGID"]
+            for naam, cert_norm, dag in zip(namen.fillna("").astype(str).to_numpy(), afwezig["CertName_norm"], datum_txt):
+                print(f"   🏥 {naam} gemarkeerd als afwezig voor {cert_norm} op {dag}")
             
-            # Als er resultaten zijn voor sommigen maar niet voor allen
-            if len(people_with_results) > 0:
-                # Markeer mensen zonder resultaat als afwezig
-                for idx, task_row in group.iterrows():
-                    staff_id = str(task_row.get("staffGID", "")).strip()
-                    
-                    # Skip als niet van deze afdeling
-                    if my_department_gids and staff_id not in my_department_gids:
-                        continue
-                    
-                    # Skip als al afgewerkt of andere status
-                    current_status = str(task_row.get("Status", "")).strip().lower()
-                    if current_status not in ["ingeschreven"]:
-                        continue
-                    
-                    # Skip als deze persoon wel een resultaat heeft
-                    if staff_id in people_with_results:
-                        continue
-                    
-                    # Markeer als afwezig (ziekte)
-                    todo.at[idx, "Status"] = "Afwezig (ziekte)"
-                    todo.at[idx, "Status_Detail"] = f"Opleiding afgelopen op {training_date.strftime('%d-%m-%Y')} - geen resultaat (waarschijnlijk afwezig)"
-                    todo.at[idx, "LastUpdatedAt"] = now
-                    updates += 1
-                    
-                    print(f"   🏥 {task_row.get('MedewerkerNaam', staff_id)} gemarkeerd als afwezig voor {cert_norm} op {training_date.strftime('%d-%m-%Y')}")
-        
-        if updates > 0:
             self.df["todo"] = todo
+            self._sync_replacement_rows(rows)
             if self.USE_SQL_FOR_TODO:
                 self.save_todo_planner()
             
         print(f"✅ detect_absent_from_completed_training: {updates} taken gemarkeerd als afwezig voor {self.active_costcenter}.")
     
-    def convert_names_to_lastname_first(self):
-        """Converteer namen naar correct formaat."""
+    def convert_names_to_lastname_first(self) -> int:
+        """
+        Converteer namen naar correct formaat.
+        V2: naam-map (id -> FullName) gecached per staff versie, kolomsgewijs toegepast.
+        Wordt volledig overgeslagen als staff en todo niet veranderd zijn sinds de vorige run.
+        Returns: aantal gewijzigde namen.
+        """
         todo = self.df.get("todo", pd.DataFrame())
         staff = self.df.get("staff", pd.DataFrame())
         
         if todo.empty or staff.empty:
-            return
+            return 0
         
         if "MedewerkerNaam" not in todo.columns:
-            return
+            return 0
         
         id_col = self.get_id_column() or "staffGID"
         
         if id_col not in todo.columns or id_col not in staff.columns:
-            return
-        
-        name_lookup = {}
-        if "FullName" in staff.columns:
-            for _, row in staff.iterrows():
-                sid = str(row.get(id_col, "")).strip()
-                name = str(row.get("FullName", "")).strip()
-                if sid and name and name.lower() != "nan":
-                    name_lookup[sid] = name
-        
-        changed = 0
-        for idx, row in todo.iterrows():
-            staff_id = str(row.get(id_col, "")).strip()
-            current_name = str(row.get("MedewerkerNaam", "")).strip()
-            
-            if staff_id in name_lookup:
-                correct_name = name_lookup[staff_id]
-                
-                if current_name != correct_name:
-                    todo.at[idx, "MedewerkerNaam"] = correct_name
-                    changed += 1
+            return 0
+
+        versie = (self._frame_version(staff), self._frame_version(todo), id_col)
+        if getattr(self, "_names_converted_version", None) == versie:
+            return 0
+
+        # Naam-map: gecached zolang de staff frame dezelfde is
+        cache = getattr(self, "_staff_name_map", None)
+        if not cache or cache[0] != (self._frame_version(staff), id_col):
+            name_lookup = pd.Series(dtype=object)
+            if "FullName" in staff.columns:
+                sid = staff[id_col].astype(str).str.strip()
+                name = staff["FullName"].astype(str).str.strip()
+                ok = (sid != "") & (name != "") & (name.str.lower() != "nan")
+                # laatste rij wint (zoals de vroegere dict-opbouw)
+                name_lookup = pd.Series(name[ok].to_numpy(), index=sid[ok])
+                name_lookup = name_lookup[~name_lookup.index.duplicated(keep="last")]
+            self._staff_name_map = ((self._frame_version(staff), id_col), name_lookup)
+        name_lookup = self._staff_name_map[1]
+
+        correct = todo[id_col].astype(str).str.strip().map(name_lookup)
+        current = todo["MedewerkerNaam"].astype(str).str.strip()
+        mask = correct.notna() & (current != correct)
+        changed = int(mask.sum())
         
         if changed > 0:
+            todo.loc[mask, "MedewerkerNaam"] = correct[mask]
             self.df["todo"] = todo
             self.save_todo()
             print(f"✅ {changed} medewerkernamen geconverteerd naar 'Achternaam, Voornaam' formaat")
         else:
             print("✅ Alle namen zijn al in correct formaat")
 
+        todo = self.df.get("todo", pd.DataFrame())
+        self._names_converted_version = (self._frame_version(staff), self._frame_version(todo), id_col)
+        return changed
+
     def get_recent_certified_from_results(self, weeks:  int = 6):
         """
         Geeft een DataFrame terug met recent behaalde certificaten uit cert_results
@@ -5441,70 +5697,74 @@ class DataStore:
 # AANPASSING IN xaurum/core/datastore.py (close_tasks_no_longer_needed)
 # ===============================================================
 
-    def close_tasks_no_longer_needed(self):
+    def close_tasks_no_longer_needed(self) -> pd.Series:
         """
         Sluit alle Open of Ingeschreven taken in 'todo' af 
         waarvoor de configuratie 'Nodig' op False staat.
+
+        V2: key-set join op (staffGID, CertName_norm, TaskType) tegen de Nodig=False config,
+        1 .loc toewijzing. Returns: change mask (bool Series op todo.index).
         """
+        import numpy as np
+
         todo = self.df.get("todo", pd.DataFrame())
         cfg_cert = self.df.get("config_cert", pd.DataFrame())
         cfg_comp = self.df.get("competence_config", pd.DataFrame())
+        changed = pd.Series(False, index=todo.index, dtype=bool)
         
         if todo.empty or (cfg_cert.empty and cfg_comp.empty):
-            return 0
+            return changed
         
         id_col = self.get_id_column() or "staffGID"
         
         # 1. Bouw lookup van alle items die NIET NODIG zijn
-        niet_nodig_cert = cfg_cert[cfg_cert["Nodig"].apply(lambda x: not is_truthy_value(x))].copy()
-        if "CertName" in niet_nodig_cert.columns:
-            niet_nodig_cert["CertName_norm"] = niet_nodig_cert["CertName"].astype(str).apply(self.normalize_certname)
-            niet_nodig_cert["TaskType"] = "Certificaat"
-        
-        niet_nodig_comp = cfg_comp[cfg_comp["Nodig"].apply(lambda x: not is_truthy_value(x))].copy()
-        if "Competence" in niet_nodig_comp.columns:
-            niet_nodig_comp["CertName_norm"] = niet_nodig_comp["Competence"].astype(str).apply(self.normalize_certname)
-            niet_nodig_comp["TaskType"] = "Vaardigheid"
-        
-        needed_cols = [id_col, "CertName_norm", "TaskType"]
-        
-        niet_nodig_cert = niet_nodig_cert[needed_cols].copy()
-        niet_nodig_comp = niet_nodig_comp[needed_cols].copy()
-        
-        niet_nodig_keys = pd.concat([niet_nodig_cert, niet_nodig_comp], ignore_index=True)
-        niet_nodig_keys = set(tuple(x) for x in niet_nodig_keys.values)
+        def _niet_nodig_keys(cfg: pd.DataFrame, name_col: str, task_type: str) -> pd.DataFrame:
+            if cfg is None or cfg.empty or not {"Nodig", name_col, id_col} <= set(cfg.columns):
+                return pd.DataFrame(columns=["_sid", "_norm", "_type"])
+            # is_truthy_value 1x per unieke waarde
+            codes, uniek = pd.factorize(cfg["Nodig"].astype(object), use_na_sentinel=False)
+            nodig = np.array([bool(is_truthy_value(v)) for v in uniek], dtype=bool)
+            sub = cfg[~nodig[codes]]
+            return pd.DataFrame({
+                "_sid": sub[id_col].astype(str).str.strip(),
+                "_norm": self._norm_series(sub[name_col].astype(str)).str.strip(),
+                "_type": task_type,
+            })
+
+        keys = pd.concat([
+            _niet_nodig_keys(cfg_cert, "CertName", "Certificaat"),
+            _niet_nodig_keys(cfg_comp, "Competence", "Vaardigheid"),
+        ], ignore_index=True)
         
-        if not niet_nodig_keys:
-            return 0
+        if keys.empty:
+            return changed
+        niet_nodig_keys = pd.MultiIndex.from_frame(keys.drop_duplicates())
 
         # 2. Update de taken in de todo lijst (in geheugen)
-        modified_count = 0
-        now = pd.Timestamp.now()
+        def _col(c, default=""):
+            if c in todo.columns:
+                return todo[c].astype(str).str.strip()
+            return pd.Series(default, index=todo.index)
+
+        actief = _col("Status").str.lower().isin(["open", "ingeschreven", "on hold", "in wachtrij"])
+        todo_keys = pd.MultiIndex.from_arrays([_col(id_col), _col("CertName_norm"), _col("TaskType", "Certificaat")])
+        changed = pd.Series(actief.to_numpy() & todo_keys.isin(niet_nodig_keys), index=todo.index)
+        modified_count = int(changed.sum())
         
-        for idx, row in todo.iterrows():
-            current_status = str(row.get("Status", "")).strip().lower()
-            task_type = str(row.get("TaskType", "Certificaat")).strip()
-            
-            if current_status in ["open", "ingeschreven", "on hold", "in wachtrij"]:
-                
-                staff_id = str(row.get(id_col, "")).strip()
-                cert_norm = str(row.get("CertName_norm", "")).strip()
-                
-                key = (staff_id, cert_norm, task_type)
-                
-                if key in niet_nodig_keys:
-                    # Sluit de taak!
-                    todo.at[idx, 'Status'] = 'Afgewerkt'
-                    todo.at[idx, 'Status_Detail'] = 'Niet meer Nodig (Config aangepast)'
-                    todo.at[idx, 'LastUpdatedAt'] = now
-                    modified_count += 1
-                    
         if modified_count > 0:
+            for c in ("Status_Detail", "LastUpdatedAt"):
+                if c not in todo.columns:
+                    todo[c] = pd.Series(np.nan, index=todo.index, dtype=object)
+            # Sluit de taken!
+            todo.loc[changed, ["Status", "Status_Detail", "LastUpdatedAt"]] = [
+                "Afgewerkt", "Niet meer Nodig (Config aangepast)", pd.Timestamp.now()
+            ]
             self.df["todo"] = todo
+            self._sync_replacement_rows(todo.index[changed.to_numpy()])
             # self.save_todo() # <<< DEZE LIJN IS NU VERWIJDERD
             print(f"✅ {modified_count} taken in geheugen afgesloten omdat 'Nodig=False' in config.")
         
-        return modified_count
+        return changed
     
     def _normalize_sapnr(self, val) -> str:
         """Standaard SAPNR: digits-only string ZONDER leading zeros. Leeg/ongeldig => ''."""
@@ -5523,61 +5783,58 @@ class DataStore:
         🚑 NOODREPARATIE FUNCTIE:
         Herstelt leesbare namen (bv. 'EA-E-294...') in de Todo-lijst 
         waar deze per ongeluk zijn overschreven door genormaliseerde namen (bv. 'eae294...').
+        V2: lookup en toepassing kolomsgewijs (map); overgeslagen als todo en bronnen niet veranderd zijn.
         """
         print("\n🚑 START NAAM REPARATIE...")
         
         todo = self.df.get("todo", pd.DataFrame())
         if todo.empty: return
+        if "CertName" not in todo.columns:
+            print("   ℹ️ Geen namen hoeven gerepareerd te worden.")
+            return
 
-        # 1. Bouw een woordenboek: { 'eae294...': 'EA-E-294 - BA5...' }
-        # We halen de mooie namen uit Config, Master Certs en Catalogus
-        lookup = {}
-        
-        # Bron A: Config (Meest betrouwbaar voor jouw team)
         cfg = self.df.get("config_cert", pd.DataFrame())
-        if not cfg.empty and "CertName" in cfg.columns:
-            for _, row in cfg.iterrows():
-                orig = str(row["CertName"]).strip()
-                norm = self.normalize_certname(orig)
-                if orig and norm: lookup[norm] = orig
-
-        # Bron B: Master Certificaten
         master = self.df.get("master_cert", pd.DataFrame())
-        if not master.empty and "CertName" in master.columns:
-            for _, row in master.iterrows():
-                orig = str(row["CertName"]).strip()
-                norm = self.normalize_certname(orig)
-                if orig and norm and norm not in lookup: lookup[norm] = orig
-
-        # Bron C: Training Catalogus
         cat = getattr(self, "training_catalog", pd.DataFrame())
-        if not cat.empty:
-            col = next((c for c in ["title", "Title", "raw_text"] if c in cat.columns), None)
-            if col:
-                for _, row in cat.iterrows():
-                    orig = str(row[col]).strip()
-                    norm = self.normalize_certname(orig)
-                    if orig and norm and norm not in lookup: lookup[norm] = orig
+
+        versie = tuple(self._frame_version(d) for d in (todo, cfg, master, cat))
+        if getattr(self, "_names_repaired_version", None) == versie:
+            print("   ℹ️ Geen namen hoeven gerepareerd te worden (ongewijzigd).")
+            return
+
+        # 1. Bouw een woordenboek: { 'eae294...': 'EA-E-294 - BA5...' }
+        # We halen de mooie namen uit Config, Master Certs en Catalogus
+        def _namen(df: pd.DataFrame, col: Optional[str], keep: str) -> Dict[str, str]:
+            if df is None or df.empty or not col or col not in df.columns:
+                return {}
+            orig = df[col].dropna().astype(str).str.strip()
+            orig = orig[orig != ""]
+            norm = self._norm_series(orig)
+            pairs = pd.Series(orig.to_numpy(), index=norm.to_numpy())
+            pairs = pairs[pairs.index != ""]
+            return pairs[~pairs.index.duplicated(keep=keep)].to_dict()
+
+        cat_col = next((c for c in ["title", "Title", "raw_text"] if c in cat.columns), None) if cat is not None else None
+        lookup: Dict[str, str] = {}
+        # Bron C: Training Catalogus, Bron B: Master Certificaten (eerste wint)
+        lookup.update(_namen(cat, cat_col, keep="first"))
+        lookup.update(_namen(master, "CertName", keep="first"))
+        # Bron A: Config (Meest betrouwbaar voor jouw team, laatste wint)
+        lookup.update(_namen(cfg, "CertName", keep="last"))
 
         # 2. Pas toe op de Todo lijst
-        repaired_count = 0
-        for idx, row in todo.iterrows():
-            current_name = str(row.get("CertName", "")).strip()
-            
-            # Check of de naam "kapot" is (geen spaties, alles kleine letters, lijkt op technische key)
-            is_broken = (
-                len(current_name) > 0 and 
-                " " not in current_name and 
-                current_name == current_name.lower() and 
-                current_name in lookup
-            )
-            
-            if is_broken:
-                beautiful_name = lookup[current_name]
-                todo.at[idx, "CertName"] = beautiful_name
-                repaired_count += 1
+        # "Kapot" = geen spaties, alles kleine letters, lijkt op technische key
+        current = todo["CertName"].astype(str).str.strip()
+        is_broken = (
+            (current.str.len() > 0)
+            & ~current.str.contains(" ", regex=False)
+            & (current == current.str.lower())
+            & current.isin(lookup.keys())
+        )
+        repaired_count = int(is_broken.sum())
         
         if repaired_count > 0:
+            todo.loc[is_broken, "CertName"] = current[is_broken].map(lookup)
             self.df["todo"] = todo
             print(f"   ✅ {repaired_count} certificaatnamen hersteld naar leesbaar formaat!")
             # Meteen opslaan om de database te fixen
@@ -5585,7 +5842,147 @@ class DataStore:
                 self.save_todo_planner()
         else:
             print("   ℹ️ Geen namen hoeven gerepareerd te worden.")
+
+        self._names_repaired_version = tuple(
+            self._frame_version(d) for d in (self.df.get("todo", pd.DataFrame()), cfg, master, cat)
+        )
     
+    def run_planner_sync(self, reload: bool = True) -> Dict[str, int]:
+        """
+        Volledige planner-sync na een config-wijziging (on_save in de Medewerkers-tab, batch_sync --full-sync).
+        Herlaadt optioneel config + todo uit SQL, zet Nodig volgens de verse config, elimineert
+        onnodige open taken en draait daarna de sync-keten met een finale save.
+
+        Returns:
+            {"todo_voor": n, "verwijderd": n, "todo_na": n}
+        """
+        print("🔄 Start planner sync...")
+        if reload and self.sql_training_manager:
+            # 1. Herlaad CONFIG (Master bron)
+            fc = self.sql_training_manager.get_medewerker_certificaat_config()
+            if fc is not None:
+                self.df["config_cert"] = fc
+                self.df["config"] = fc
+
+            fcomp = self.sql_training_manager.get_medewerker_competentie_config()
+            if fcomp is not None:
+                self.df["competence_config"] = fcomp
+
+            print("   -> Config DF's in DataStore herladen vanuit SQL.")
+
+            # 2. Herlaad TODO (Haalt alle bestaande taken op)
+            todo_df = self.sql_training_manager.get_todo_planner()
+            if todo_df is not None:
+                self.df["todo"] = todo_df
+                print(f"   -> Todo herladen: {len(todo_df)} taken")
+
+        todo = self.df.get("todo", pd.DataFrame())
+        cfg_cert = self.df.get("config_cert", pd.DataFrame())
+        cfg_comp = self.df.get("competence_config", pd.DataFrame())
+        counts = {"todo_voor": len(todo), "verwijderd": 0, "todo_na": len(todo)}
+
+        # Definitie van is_truthy (indien nodig)
+        is_truthy = getattr(self, "is_truthy_value", None) or (lambda val: str(val).lower().strip() in ('true', '1', 'y', 'ja', 'yes'))
+
+        # >>> KRITIEKE FIX 1: Forceer de 'Nodig' vlag op basis van de verse Config
+        if not todo.empty and (not cfg_cert.empty or not cfg_comp.empty) and "CertName_norm" in todo.columns:
+
+            # Mapping van Configuratie (Certificaten)
+            cert_map = {}
+            if "staffGID" in cfg_cert.columns and "CertName" in cfg_cert.columns:
+                cfg_cert["CertName_norm"] = cfg_cert["CertName"].astype(str).apply(self.normalize_certname)
+                cert_map = cfg_cert.set_index(["staffGID", "CertName_norm"])["Nodig"].to_dict()
+
+            # Mapping van Configuratie (Vaardigheden)
+            comp_map = {}
+            if "staffGID" in cfg_comp.columns and "Competence" in cfg_comp.columns:
+                cfg_comp["CertName_norm"] = cfg_comp["Competence"].astype(str).apply(self.normalize_certname)
+                comp_map = cfg_comp.set_index(["staffGID", "CertName_norm"])["Nodig"].to_dict()
+
+            # Functie die de Nodig vlag uit de Master Config haalt
+            def check_nodig_status(row):
+                staff_id = str(row.get("staffGID", "")).strip()
+                cert_norm = str(row.get("CertName_norm", "")).strip()
+                task_type = str(row.get("TaskType", "")).strip()
+                key = (staff_id, cert_norm)
+                default_nodig = is_truthy(row.get("Nodig", True))
+
+                if "Certificaat" in task_type and key in cert_map:
+                    return is_truthy(cert_map.get(key, default_nodig))
+                elif "Vaardigheid" in task_type and key in comp_map:
+                    return is_truthy(comp_map.get(key, default_nodig))
+                return default_nodig
+
+            todo["Nodig"] = todo.apply(check_nodig_status, axis=1)
+            self.df["todo"] = todo
+            print("   -> 'Nodig' vlag in Todo DF bijgewerkt naar verse Config.")
+        # <<< EINDE KRITIEKE FIX 1
+
+        # 3. SLUIT TAKEN (In-memory update: Status -> Afgewerkt)
+        self.close_tasks_no_longer_needed()
+        print("   -> Taken in geheugen gemarkeerd als Afgewerkt.")
+
+        # >>> KRITIEKE FIX 2: BRUTE FORCE ELIMINATIE (Nodig=False moet verdwijnen)
+        # We gaan de NODIG=TRUE sleutels direct uit de verse config halen.
+        if not todo.empty:
+            before_count = len(todo)
+
+            # 1. Bepaal de sleutels (staffGID, CertName_norm) van ALLE taken die NODIG ZIJN
+
+            # Certificaten Nodig=True
+            cert_nodig = cfg_cert[cfg_cert["Nodig"].apply(is_truthy).astype(bool)].copy()
+            cert_nodig["CertName_norm"] = cert_nodig["CertName"].astype(str).apply(self.normalize_certname)
+            cert_keys = cert_nodig.set_index(["staffGID", "CertName_norm"]).index.tolist()
+
+            # Competenties Nodig=True
+            comp_nodig = cfg_comp[cfg_comp["Nodig"].apply(is_truthy).astype(bool)].copy()
+            comp_nodig["CertName_norm"] = comp_nodig["Competence"].astype(str).apply(self.normalize_certname)
+            comp_keys = comp_nodig.set_index(["staffGID", "CertName_norm"]).index.tolist()
+
+            needed_keys = set(cert_keys + comp_keys)
+
+            # 2. Filteren: Behoud ALLEEN taken die NODIG ZIJN OF AL DEFINITIEF GESLOTEN
+            todo["key"] = list(zip(todo["staffGID"], todo["CertName_norm"]))
+
+            is_needed = todo["key"].apply(lambda x: x in needed_keys)
+            is_closed_for_history = todo["Status"].astype(str).str.lower().isin(["afgewerkt", "gesloten", "certified"])
+
+            # Behoud alles wat Nodig is OF alles wat Gesloten is (dit voorkomt dat correct afgewerkte taken verdwijnen)
+            todo_to_keep = todo[is_needed | is_closed_for_history].drop(columns=["key"]).copy()
+
+            removed_count = before_count - len(todo_to_keep)
+            if removed_count > 0:
+                self.df["todo"] = todo_to_keep
+                counts["verwijderd"] = removed_count
+                print(f"   -> {removed_count} onnodige/verouderde taken (Nodig=False uit Config) VERWIJDERD uit geheugen.")
+            else:
+                print("   -> Geen onnodige taken om te verwijderen.")
+        # <<< EINDE KRITIEKE FIX 2
+
+        # 4. KRITIEKE STAP: SLA NU DE SCHONE STATUS DIRECT OP NAAR SQL
+        # Dit is de laatste stap die de taak definitief elimineert uit de database.
+        if self.USE_SQL_FOR_TODO:
+            self.save_todo()
+            print("   -> Schone takenlijst (zonder Nodig=False) opgeslagen naar SQL.")
+
+        # 5. Sync Logic (Creëert nieuwe taken/sync inschrijvingen)
+        self.sync_todo_with_config()
+        self.create_tasks_for_expiring_certificates()  # 🆕 Scan certificaten op vervaldata
+        self.sync_competence_tasks()
+        self.update_status_from_tasktype_and_xaurum()
+        self.apply_overrule_with_zweef()
+        self.close_finished_tasks()
+        # Detecteer afwezigen bij afgelopen opleidingen
+        self.detect_absent_from_completed_training()
+
+        # 6. Final Save (met staff info enrichment)
+        if self.USE_SQL_FOR_TODO:
+            self.enrich_todo_with_staff_info()  # 🆕 Vul CostCenter/MedewerkerNaam in
+            self.save_todo()
+            print("   -> Sync resultaten opgeslagen naar SQL")
+
+        counts["todo_na"] = len(self.df.get("todo", []))
+        return counts
 
     def save_todo_planner(self, df_to_save=None):
         """
@@ -5674,14 +6071,16 @@ class DataStore:
 
     def clean_sql_config_names(self):
         """
-        WASTRAAT V2: Vertaalt namen (Frans/LS/HS) in SQL maar voorkomt UNIQUE KEY fouten.
-        Maakt gebruik van de MERGE-logica in add_medewerker_config.
+        WASTRAAT V3: Vertaalt namen (Frans/LS/HS) in SQL maar voorkomt UNIQUE KEY fouten.
+        - Bepaalt in het geheugen een (ConfigID -> doelnaam) frame
+        - Server-side in 1 transactie: staging tabel, DELETE van de vervuilde rijen,
+          daarna 1 MERGE naar de doelnamen (dubbels per staffGID + norm samengevoegd).
         """
         if not self.engine:
             print("   ❌ Geen SQL connectie voor cleanup.")
             return
 
-        print("   🧼 START Config Cleanup (SQL Wasstraat V2)...")
+        print("   🧼 START Config Cleanup (SQL Wasstraat V3)...")
         
         # 1. Laad de vertaalmap uit het geheugen
         mapping = self.df.get("mapping_cert", pd.DataFrame())
@@ -5689,55 +6088,124 @@ class DataStore:
             print("   ⚠️ Geen mapping geladen, cleanup overgeslagen.")
             return
 
-        translation_map = {}
         src_col = next((c for c in ["OrigineleNaam", "OriginalName", "Frans"] if c in mapping.columns), mapping.columns[0])
         dst_col = next((c for c in ["VertaaldeNaam", "DutchName", "Nederlands"] if c in mapping.columns), mapping.columns[1])
-        
-        for _, row in mapping.iterrows():
-            orig = str(row[src_col]).strip()
-            target = str(row[dst_col]).strip()
-            if orig and target:
-                translation_map[self.normalize_certname(orig)] = target
 
-        # 2. Haal alle huidige configuraties op
+        orig = mapping[src_col].astype(str).str.strip()
+        target = mapping[dst_col].astype(str).str.strip()
+        ok = (orig != "") & (target != "")
+        # laatste mapping-regel wint (zoals de vroegere dict-opbouw)
+        translation_map = pd.Series(target[ok].to_numpy(), index=self._norm_series(orig[ok]).to_numpy())
+        translation_map = translation_map[~translation_map.index.duplicated(keep="last")]
+
+        # SQL-sleutel voor de doelnaam: dezelfde normalizer als add_medewerker_config in de manager
+        sql_norm = getattr(self.sql_training_manager, "_normalize_certname", None) or self.normalize_certname
+
+        import uuid
+        staging = f"temp_config_cleanup_{uuid.uuid4().hex[:12]}"
         try:
-            # We hebben ConfigID, staffGID en CertName nodig
+            # 2. Haal alle huidige configuraties op
             query = "SELECT ConfigID, staffGID, CertName, Nodig FROM dbo.TM_MedewerkerCertificaatConfig"
             df_sql = pd.read_sql(query, self.engine)
-            
-            repaired = 0
-            for _, row in df_sql.iterrows():
-                cid = row["ConfigID"]
-                gid = row["staffGID"]
-                cname = str(row["CertName"])
-                nodig_status = bool(row["Nodig"])
-                
-                # Check of de huidige naam "vervuild" is
-                norm = self.normalize_certname(cname)
-                
-                if norm in translation_map:
-                    target_name = translation_map[norm]
-                    
-                    # Alleen actie als de naam echt anders is
-                    if cname != target_name:
-                        # 3. GEBRUIK DE VEILIGE MERGE
-                        # Dit zorgt ervoor dat als 'target_name' al bestaat, deze wordt geüpdatet.
-                        # Als hij niet bestaat, wordt hij aangemaakt.
-                        if self.add_medewerker_config(gid, target_name, nodig=nodig_status):
-                            # 4. VERWIJDER HET OUDE RECORD
-                            # Nu de data veilig 'ge-merged' is in het correcte record, 
-                            # kunnen we de foute naam veilig verwijderen.
-                            with self.engine.begin() as conn:
-                                conn.execute(text("DELETE FROM dbo.TM_MedewerkerCertificaatConfig WHERE ConfigID = :id"), {"id": cid})
-                            repaired += 1
-            
-            if repaired > 0:
-                print(f"   ✅ {repaired} records succesvol hersteld en samengevoegd in SQL.")
-            else:
+
+            # 3. (ConfigID -> doelnaam) frame, enkel waar de naam echt anders is
+            cname = df_sql["CertName"].astype(str)
+            df_sql["TargetName"] = self._norm_series(cname).map(translation_map)
+            fix = df_sql[df_sql["TargetName"].notna() & (cname != df_sql["TargetName"])].copy()
+
+            if fix.empty:
                 print("   ✅ SQL Config tabel is reeds volledig gestandaardiseerd.")
+                return
+
+            doel_norm = {t: sql_norm(t) for t in fix["TargetName"].unique()}
+            fix["TargetNorm"] = fix["TargetName"].map(doel_norm)
+            fix["Nodig"] = fix["Nodig"].fillna(False).astype(bool).astype(int)
+            fix["staffGID"] = fix["staffGID"].astype(str)
+            # Dubbels samenvoegen: laatste rij per medewerker + doelnaam wint (zoals de vroegere volgorde)
+            fix["_keep"] = ~fix.duplicated(subset=["staffGID", "TargetNorm"], keep="last")
+
+            fix[["ConfigID", "staffGID", "TargetName", "TargetNorm", "Nodig", "_keep"]].to_sql(
+                staging, self.engine, if_exists="replace", index=False
+            )
+
+            with self.engine.begin() as conn:
+                result = conn.execute(text(f"""
+                    SET NOCOUNT ON;
+
+                    -- 1. Vervuilde rijen weg (eerst, anders botst de MERGE op de UNIQUE KEY)
+                    DELETE cfg FROM dbo.TM_MedewerkerCertificaatConfig cfg
+                    INNER JOIN dbo.{staging} s ON s.ConfigID = cfg.ConfigID;
+
+                    -- 2. MERGE naar de correcte namen
+                    MERGE INTO dbo.TM_MedewerkerCertificaatConfig AS target
+                    USING (SELECT staffGID, TargetName, TargetNorm, Nodig FROM dbo.{staging} WHERE _keep = 1) AS src
+                    ON (target.staffGID = src.staffGID AND target.CertName_norm = src.TargetNorm)
+                    WHEN MATCHED THEN
+                        UPDATE SET target.Nodig = src.Nodig, target.LaatsteWijziging = GETDATE()
+                    WHEN NOT MATCHED THEN
+                        INSERT (staffGID, CertName, CertName_norm, Nodig, Strategisch, LaatsteWijziging)
+                        VALUES (src.staffGID, src.TargetName, src.TargetNorm, src.Nodig, 0, GETDATE())
+                    OUTPUT inserted.ConfigID, inserted.staffGID, inserted.CertName_norm, $action;
+                """))
+                merged = pd.DataFrame([tuple(r) for r in result.fetchall()],
+                                      columns=["ConfigID", "staffGID", "TargetNorm", "Action"])
+                conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
+
+            repaired = len(fix)
+            print(f"   ✅ {repaired} records succesvol hersteld en samengevoegd in SQL (1 batch).")
+
+            # 4. In-memory config bijwerken met de ConfigIDs uit de MERGE (zoals na een herlaadbeurt)
+            cfg = self.df.get("config_cert", pd.DataFrame())
+            if not cfg.empty and "ConfigID" in cfg.columns and "CertName" in cfg.columns:
+                is_alias = self.df.get("config") is cfg
+                now = pd.Timestamp.now()
+                src = fix[fix["_keep"]].copy()
+                merged["staffGID"] = merged["staffGID"].astype(str)
+                src = src.merge(merged, on=["staffGID", "TargetNorm"], how="inner", suffixes=("_oud", ""))
+
+                # a. Verwijderde (vervuilde) rijen weg
+                cfg = cfg[~cfg["ConfigID"].isin(fix["ConfigID"])].copy()
+
+                # b. MATCHED: bestaande doelrij krijgt Nodig van de bron
+                upd = src[src["Action"] == "UPDATE"]
+                if not upd.empty and "Nodig" in cfg.columns:
+                    # zelfde dtype als de geladen config (bit uit SQL -> bool, of 0/1)
+                    nodig = pd.Series(upd["Nodig"].astype(bool if cfg["Nodig"].dtype == bool else int).to_numpy(),
+                                      index=upd["ConfigID"].to_numpy())
+                    hit = cfg["ConfigID"].isin(nodig.index)
+                    cfg.loc[hit, "Nodig"] = cfg.loc[hit, "ConfigID"].map(nodig).to_numpy()
+                    cfg.loc[hit, "LaatsteWijziging"] = now
+
+                # c. NOT MATCHED: nieuwe rij met de nieuwe ConfigID (zelfde velden als de INSERT),
+                #    enkel voor geladen medewerkers (zelfde scope als de STAP 8 filter)
+                ins = src[src["Action"] == "INSERT"]
+                staff = self.df.get("staff", pd.DataFrame())
+                geladen = set(cfg["staffGID"].astype(str).str.strip()) if "staffGID" in cfg.columns else set()
+                if "staffGID" in staff.columns:
+                    geladen |= set(staff["staffGID"].astype(str).str.strip())
+                ins = ins[ins["staffGID"].str.strip().isin(geladen)]
+                if not ins.empty:
+                    cfg = pd.concat([cfg, pd.DataFrame({
+                        "ConfigID": ins["ConfigID"].to_numpy(),
+                        "staffGID": ins["staffGID"].to_numpy(),
+                        "CertName": ins["TargetName"].to_numpy(),
+                        "CertName_norm": ins["TargetNorm"].to_numpy(),
+                        "Nodig": ins["Nodig"].astype(bool).to_numpy(),
+                        "Strategisch": False,
+                        "LaatsteWijziging": now,
+                    })], ignore_index=True)
+
+                self.df["config_cert"] = cfg
+                if is_alias:
+                    self.df["config"] = cfg
 
         except Exception as e:
             print(f"   ❌ Fout tijdens SQL Wasstraat: {e}")
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
+            except Exception:
+                pass
     # ============================================================
     # ACTIES VOOR DISCREPANTIES TRACKER
     # ============================================================
@@ -5948,6 +6416,11 @@ class DataStore:
         # 1.Update direct het Vertaalwoordenboek (Snelheid voor normalisatie)
         if hasattr(self, "translation_dict"):
             self.translation_dict[original.strip()] = target.strip()
+        self._norm_cache = {}
+        self._catalog_index = {}
+        self._profile_index = {}
+        self._search_index = {}
+        self._invalidate_name_index()
 
         # 2.Update de DataFrame (Zodat je het direct in de UI lijst ziet)
         df = self.df.get("mapping_cert", pd.DataFrame())
@@ -6066,44 +6539,196 @@ class DataStore:
             print("   ℹ️ Geen nieuwe datums gevonden in Excel om naar SQL te schrijven.")
 
         
-    def close_tasks_for_inactive_staff(self) -> int:
+    def close_tasks_for_inactive_staff(self) -> pd.Series:
         """
         Sluit alle openstaande taken af voor medewerkers die in dbo.tblSTAFF 
-        niet meer op status 1 (Actief) staan. Directe SQL uitvoering.
+        niet meer op status 1 (Actief) staan.
+
+        V2: de set-based SQL UPDATE blijft de globale pass (alle afdelingen, ook die
+        nooit geladen worden); het geladen frame wordt daarna in-memory gepatcht via
+        een key-set join op de inactieve GIDs uit STAP 1 (geen volledige herlaad van
+        de planner meer). Returns: change mask (bool Series op todo.index).
         """
-        if not self.sql_training_manager:
-            return 0
+        import numpy as np
 
-        print("   🔍 SQL check op inactieve medewerkers...")
-        try:
-            # We voeren een directe UPDATE uit op de SQL server
-            # We zoeken alle taken in de TodoPlanner waarvan de GID in tblSTAFF status <> 1 heeft
-            query = text("""
-                UPDATE todo
-                SET 
-                    todo.Status = 'Afgewerkt',
-                    todo.Status_Detail = 'Automatisch afgesloten: Medewerker uit dienst (Status 2)',
-                    todo.LastUpdatedAt = GETDATE()
-                FROM dbo.TM_TodoPlanner todo
-                INNER JOIN dbo.tblSTAFF s ON todo.staffGID = s.staffGID
-                WHERE s.staffSTAFFSTATUSID <> 1
-                AND todo.Status NOT IN ('Afgewerkt', 'Geweigerd')
-            """)
-            
-            with self.engine.begin() as conn:
-                result = conn.execute(query)
-                modified_count = result.rowcount
-            
-            if modified_count > 0:
-                # Belangrijk: we moeten de lokale data verversen zodat de tool het ook weet
-                self.load_todo_planner() 
-                return modified_count
-            return 0
-            
-        except Exception as e:
-            print(f"   ⚠️ SQL Fout bij opschonen inactieven: {e}")
-            return 0
+        # 1. Globale pass in SQL (zelfde UPDATE als voorheen, over alle costcenters)
+        if self.sql_training_manager and self.engine:
+            print("   🔍 SQL check op inactieve medewerkers...")
+            try:
+                query = text("""
+                    UPDATE todo
+                    SET 
+                        todo.Status = 'Afgewerkt',
+                        todo.Status_Detail = 'Automatisch afgesloten: Medewerker uit dienst (Status 2)',
+                        todo.LastUpdatedAt = GETDATE()
+                    FROM dbo.TM_TodoPlanner todo
+                    INNER JOIN dbo.tblSTAFF s ON todo.staffGID = s.staffGID
+                    WHERE s.staffSTAFFSTATUSID <> 1
+                    AND todo.Status NOT IN ('Afgewerkt', 'Geweigerd')
+                """)
+                with self.engine.begin() as conn:
+                    modified_count = conn.execute(query).rowcount
+                if modified_count > 0:
+                    print(f"   ✅ SQL: {modified_count} taken van inactieve medewerkers afgesloten.")
+            except Exception as e:
+                print(f"   ⚠️ SQL Fout bij opschonen inactieven: {e}")
+
+        # 2. Geladen frame in lijn brengen (in-memory, geen herlaad)
+        todo = self.df.get("todo", pd.DataFrame())
+        changed = pd.Series(False, index=todo.index, dtype=bool)
+        inactief = getattr(self, "inactive_staff_gids", set())
+
+        if todo.empty or not inactief or "staffGID" not in todo.columns or "Status" not in todo.columns:
+            return changed
+
+        status = todo["Status"]
+        open_taak = status.notna() & ~status.astype(str).str.strip().str.lower().isin(["afgewerkt", "geweigerd"])
+        changed = open_taak & todo["staffGID"].astype(str).str.strip().isin(inactief)
+
+        if changed.any():
+            for c in ("Status_Detail", "LastUpdatedAt"):
+                if c not in todo.columns:
+                    todo[c] = pd.Series(np.nan, index=todo.index, dtype=object)
+            todo.loc[changed, ["Status", "Status_Detail", "LastUpdatedAt"]] = [
+                "Afgewerkt", "Automatisch afgesloten: Medewerker uit dienst (Status 2)", pd.Timestamp.now()
+            ]
+            self.df["todo"] = todo
+            self._sync_replacement_rows(todo.index[changed.to_numpy()])
+
+        return changed
             
+    def _drop_deleted_rows(self, cert_keys=None, comp_keys=None, todo_keys=None) -> Dict[str, Any]:
+        """
+        In-memory tegenhanger van de SQL deletes (zelfde matching):
+        config_cert/config op (staffGID, CertName), competence_config op (staffGID, Competence),
+        beide hoofdletterongevoelig; todo op (staffGID, CertName_norm). Indexlabels blijven behouden.
+        Returns aantallen per bron + todo_labels (indexlabels van de verwijderde todo-rijen).
+        """
+        out = {"config_cert": 0, "config_comp": 0, "todo_labels": []}
+        id_col = self.get_id_column() or "staffGID"
+
+        def _wanted(keys, lower):
+            return pd.MultiIndex.from_tuples([
+                (str(g).strip(), str(n).strip().lower() if lower else str(n).strip()) for g, n in keys
+            ])
+
+        # 1. Config frames ('config' is vaak hetzelfde frame als 'config_cert')
+        for keys, frame_keys, name_col, count_key in (
+            (cert_keys, ["config_cert", "config"], "CertName", "config_cert"),
+            (comp_keys, ["competence_config"], "Competence", "config_comp"),
+        ):
+            if not keys:
+                continue
+            wanted = _wanted(keys, lower=True)
+            patched = {}
+            for key in frame_keys:
+                cfg = self.df.get(key)
+                if cfg is None or cfg.empty:
+                    continue
+                if id(cfg) in patched:
+                    self.df[key] = patched[id(cfg)]
+                    continue
+                gid_col = next((c for c in [id_col, "staffGID"] if c in cfg.columns), None)
+                if gid_col is None or name_col not in cfg.columns:
+                    continue
+                hit = pd.MultiIndex.from_arrays([
+                    cfg[gid_col].astype(str).str.strip(),
+                    cfg[name_col].astype(str).str.strip().str.lower(),
+                ]).isin(wanted)
+                if hit.any():
+                    patched[id(cfg)] = self.df[key] = cfg[~hit]
+                    out[count_key] = max(out[count_key], int(hit.sum()))
+
+        # 2. Todo
+        todo = self.df.get("todo", pd.DataFrame())
+        if todo_keys and not todo.empty and "staffGID" in todo.columns:
+            if "CertName_norm" in todo.columns:
+                todo_norm = todo["CertName_norm"].astype(str).str.strip()
+            elif "CertName" in todo.columns:
+                todo_norm = self._norm_series(todo["CertName"].astype(str))
+            else:
+                todo_norm = None
+            if todo_norm is not None:
+                hit = pd.MultiIndex.from_arrays([
+                    todo["staffGID"].astype(str).str.strip(), todo_norm,
+                ]).isin(_wanted(todo_keys, lower=False))
+                if hit.any():
+                    out["todo_labels"] = todo.index[hit].tolist()
+                    self.df["todo"] = todo[~hit]
+        return out
+
+    def delete_employee_item(self, staff_gid: str, cert_name: str, is_vaardigheid: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Verwijdert 1 certificaat/vaardigheid van een medewerker uit config + planner.
+        SQL in 1 batch (sql_training_manager.delete_medewerker_item); daarna worden config_cert/config,
+        competence_config en todo in het geheugen gepatcht i.p.v. volledig herladen.
+        Returns de getroffen sleutels (staffGID, CertName_norm, TaskType, todo_labels = indexlabels
+        van de verwijderde todo-rijen) of None als de SQL delete faalde (geheugen blijft ongewijzigd).
+        """
+        gid = str(staff_gid or "").strip()
+        name = str(cert_name or "").strip()
+        if not gid or not name:
+            return None
+
+        norm = self.normalize_certname(name)
+        change = {
+            "staffGID": gid, "CertName": name, "CertName_norm": norm,
+            "TaskType": "Vaardigheid" if is_vaardigheid else "Certificaat",
+            "sql": None, "config_rows": 0, "todo_labels": [],
+        }
+
+        # 1. SQL (1 round trip)
+        mgr = getattr(self, "sql_training_manager", None)
+        if self.USE_SQL_FOR_CONFIG and mgr is not None:
+            counts = mgr.delete_medewerker_item(gid, name, norm, is_vaardigheid)
+            if counts is None:
+                return None
+            change["sql"] = counts
+
+        # 2. Geheugen (zelfde match als de SQL)
+        dropped = self._drop_deleted_rows(
+            cert_keys=None if is_vaardigheid else [(gid, name)],
+            comp_keys=[(gid, name)] if is_vaardigheid else None,
+            todo_keys=[(gid, norm)],
+        )
+        change["config_rows"] = dropped["config_comp" if is_vaardigheid else "config_cert"]
+        change["todo_labels"] = dropped["todo_labels"]
+
+        print(f"   🧩 In-memory: {change['config_rows']} config / {len(change['todo_labels'])} taak/taken weg ({gid} / {norm})")
+        return change
+
+    def delete_employee_items(self, items) -> Optional[Dict[str, Any]]:
+        """
+        Batch-variant van delete_employee_item (bv. een certificaat weg bij een heel team).
+        items: iterable van (staffGID, naam, is_vaardigheid).
+        SQL: sleutels 1x gestaged, 1 set-based DELETE per tabel in 1 transactie
+        (sql_training_manager.delete_medewerker_items); daarna dezelfde in-memory patch.
+        Returns {"sql": aantallen, "config_cert", "config_comp", "todo_labels", "keys": [(staffGID, CertName_norm)]}
+        of None als de SQL delete faalde.
+        """
+        cert_keys, comp_keys, todo_keys = [], [], []
+        for gid, name, is_vaardigheid in items:
+            gid = str(gid or "").strip()
+            name = str(name or "").strip()
+            if not gid or not name:
+                continue
+            (comp_keys if is_vaardigheid else cert_keys).append((gid, name))
+            todo_keys.append((gid, self.normalize_certname(name)))
+        todo_keys = list(dict.fromkeys(todo_keys))
+
+        change = {"sql": None, "keys": todo_keys}
+        mgr = getattr(self, "sql_training_manager", None)
+        if todo_keys and self.USE_SQL_FOR_CONFIG and mgr is not None:
+            counts = mgr.delete_medewerker_items(cert_keys=cert_keys, comp_keys=comp_keys, todo_keys=todo_keys)
+            if counts is None:
+                return None
+            change["sql"] = counts
+
+        change.update(self._drop_deleted_rows(cert_keys, comp_keys, todo_keys))
+        print(f"   🧩 In-memory: {change['config_cert']} cert-config / {change['config_comp']} vaardigheid-config / "
+              f"{len(change['todo_labels'])} taak/taken weg ({len(todo_keys)} sleutels)")
+        return change
+
     def cancel_and_deactivate_task(self, task_row, deactivate_config=False) -> bool:
         """Annuleert taak in Planner en zet optioneel 'Nodig' op 0 in Config."""
         if not self.engine: return False
@@ -6,7 +6,7 @@ import pandas as pd
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
-    QLineEdit, QScrollArea, QPushButton, QMessageBox,
+    QLineEdit, QPushButton, QMessageBox,
     QButtonGroup, QRadioButton
 )
 from PyQt6.QtCore import Qt, QTimer
@@ -14,7 +14,7 @@ from PyQt6.QtCore import Qt, QTimer
 from xaurum.core.datastore import DataStore
 # Zorg dat InfoDialog en ConfirmationDialog in widgets.py staan!
 from xaurum.ui.widgets import (
-    CertificateRowWidget, SearchLineEdit, SearchResultsList, 
+    CertificateListView, SearchLineEdit, SearchResultsList, 
     ToggleSwitch, ConfirmationDialog, InfoDialog
 )
 from xaurum.utils import normalize_certname, format_medewerker_naam
@@ -25,12 +25,21 @@ class EmployeeManagementTab(QWidget):
         super().__init__()
         self.data = data
         self.current_emp_id = None
-        self.cert_widgets = [] 
         self.dirty = False
         
         self._last_emp_index = -1
         self._last_dept_index = -1
 
+        # Namenlijsten per afdeling (gedeeld door combobox + completer, zie _employee_name_model)
+        self._name_models = {}
+        self._name_models_sig = None
+
+        # Debounce voor de typeahead (zie on_search_changed / _run_search)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._run_search)
+
         self.init_ui()
     def init_ui(self):
         """Bouwt de interface op."""
@@ -167,21 +176,13 @@ class EmployeeManagementTab(QWidget):
         layout.addWidget(header_container)
 
         # ══════════════════════════════════════════════════════════════
-        # 2. SCROLL AREA
+        # 2. CERTIFICATEN LIJST (model/view: rijen worden getekend, geen widget per rij)
         # ══════════════════════════════════════════════════════════════
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border:  none; background: #f8fafc; }")
-        
-        self.cert_container = QWidget()
-        self.cert_container.setStyleSheet("background:  #f8fafc;")
-        self.cert_layout = QVBoxLayout(self. cert_container)
-        self.cert_layout.setContentsMargins(30, 20, 30, 20)
-        self.cert_layout.setSpacing(0)
-        self.cert_layout. setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        self.scroll.setWidget(self.cert_container)
-        layout.addWidget(self.scroll, 1)
+        self.cert_view = CertificateListView()
+        self.cert_model = self.cert_view.cert_model
+        self.cert_view.deleted.connect(self.on_certificate_deleted)
+        self.cert_model.edited.connect(self.mark_dirty)
+        layout.addWidget(self.cert_view, 1)
 
         # ══════════════════════════════════════════════════════════════
         # 3. FOOTER
@@ -271,44 +272,18 @@ class EmployeeManagementTab(QWidget):
         self.search_box. results_list = self.results_list
 
     def refresh(self):
-        """Ververst de dropdowns."""
+        """Ververst de dropdowns (uit de staff-directory van de DataStore)."""
         if "staff" not in self.data. df or self.data.df["staff"]. empty:
             return
         
-        staff = self.data. df["staff"]
-        
-        # V2-FIX: Zoek CostCenter kolom in beide mogelijke namen
-        cc_col = None
-        for c in ("CostCenter", "staffCOSTCENTER315"):
-            if c in staff.columns:
-                cc_col = c
-                break
-        
-        org_col = "staffORGUNIT"
+        directory = self.data.get_staff_directory()
 
         self.combo_dept.blockSignals(True)
         self.combo_dept.clear()
 
-        if cc_col and cc_col in staff.columns:
+        if directory["cc_col"]:
             self.combo_dept.addItem("Alle afdelingen", userData=None)
-            tmp = staff. copy()
-            tmp[cc_col] = tmp[cc_col].astype(str)
-            
-            if org_col in tmp.columns:
-                tmp[org_col] = tmp[org_col]. astype(str)
-            else: 
-                org_col = None
-
-            for cc in sorted(tmp[cc_col].dropna().unique().tolist()):
-                if cc.lower() == 'nan': 
-                    continue
-                
-                if org_col:
-                    units = tmp[tmp[cc_col] == cc][org_col].dropna().unique().tolist()
-                    unit = units[0] if units else ""
-                    text = f"{cc} – {unit}" if unit else cc
-                else:
-                    text = cc
+            for cc, text in directory["departments"]:
                 self. combo_dept.addItem(text, userData=cc)
 
             active_cc = self.data.active_costcenter
@@ -323,6 +298,26 @@ class EmployeeManagementTab(QWidget):
         self.on_dept_changed()
         self._last_dept_index = self.combo_dept. currentIndex()
 
+    def _employee_name_model(self, cc):
+        """
+        QStringListModel met de medewerkers van een afdeling (cc=None: iedereen).
+        1 model per afdeling, hergebruikt tot de staff-directory wijzigt.
+        """
+        from PyQt6.QtCore import QStringListModel
+
+        directory = self.data.get_staff_directory()
+        if self._name_models_sig != directory["sig"]:
+            for model in self._name_models.values():
+                model.deleteLater()
+            self._name_models = {}
+            self._name_models_sig = directory["sig"]
+
+        key = cc if (cc and directory["cc_col"]) else None
+        model = self._name_models.get(key)
+        if model is None:
+            model = self._name_models[key] = QStringListModel(directory["names"].get(key, []), self)
+        return model
+
     def on_dept_changed(self):
         if self.current_emp_id is not None and self.dirty:
             if not self.confirm_discard_changes():
@@ -333,41 +328,26 @@ class EmployeeManagementTab(QWidget):
             self.dirty = False
 
         new_index = self.combo_dept.currentIndex()
-        self.combo_employee. clear()
         self.current_emp_id = None
         self.clear_cert_widgets()
         self.info_label.setText("")
 
+        selected_cc = self.combo_dept.currentData()
+        model = self._employee_name_model(selected_cc)
+
+        # Combobox en completer delen hetzelfde model (geen nieuwe lijst per afdelingswissel)
+        self.combo_employee.blockSignals(True)
+        self.combo_employee.setModel(model)
+        self.employee_completer.setModel(model)
+        self.combo_employee.blockSignals(False)
+
         if "staff" not in self.data.df:
             return
-        
-        staff = self.data.df["staff"]
-        selected_cc = self.combo_dept.currentData()
-        
-        # V2-FIX: Zoek CostCenter kolom in beide mogelijke namen
-        cc_col = None
-        for c in ("CostCenter", "staffCOSTCENTER315"):
-            if c in staff.columns:
-                cc_col = c
-                break
-
-        if selected_cc and cc_col and cc_col in staff.columns:
-            subset = staff[staff[cc_col].astype(str) == str(selected_cc)]
-        else:
-            subset = staff
 
-        if not subset.empty and "FullName" in subset.columns:
-            names = sorted(subset["FullName"].dropna().astype(str).unique().tolist())
-            self.combo_employee.addItems(names)
-            
-            # ✨ NIEUW: Update de completer met de namen voor autocomplete
-            from PyQt6.QtCore import QStringListModel
-            self.employee_completer.setModel(QStringListModel(names))
-            
-            # 🔧 FIX: Laad automatisch de eerste medewerker
-            if names:
-                self.combo_employee.setCurrentIndex(0)
-                self.on_employee_changed()  # <-- DEZE REGEL TOEVOEGEN! 
+        # 🔧 FIX: Laad automatisch de eerste medewerker
+        if model.rowCount() > 0:
+            self.combo_employee.setCurrentIndex(0)
+            self.on_employee_changed()
 
         self.data.active_costcenter = selected_cc
         self._last_dept_index = new_index
@@ -387,17 +367,11 @@ class EmployeeManagementTab(QWidget):
                 return
             self.dirty = False
 
-        staff = self.data.df.get("staff")
-        id_col = self.data.get_id_column()
-        
-        if staff is None or staff.empty or not id_col:
+        emp_id = self.data.get_staff_directory()["name_to_id"].get(new_name)
+        if not emp_id:
             return
 
-        emp_row = staff[staff["FullName"] == new_name]
-        if emp_row.empty:
-            return
-
-        self.current_emp_id = str(emp_row.iloc[0][id_col]).strip()
+        self.current_emp_id = emp_id
         self.info_label.setText(f"ID: {self.current_emp_id}")
         
         self.load_certificates_for_employee()
@@ -416,32 +390,33 @@ class EmployeeManagementTab(QWidget):
         return dlg.exec()
 
     def load_certificates_for_employee(self):
-        """🌍 Laadt data en toont de lijst met taal-specifieke certificaatnamen."""
+        """
+        🌍 Laadt data en toont de lijst met taal-specifieke certificaatnamen.
+        Data komt uit de profiel-index van de DataStore (get_employee_profile / get_profile_row),
+        dus enkel de rijen van deze medewerker worden overlopen.
+        """
         if not self.current_emp_id:  return
 
         self.clear_cert_widgets()
         self.dirty = False
 
-        # 🌍 Bepaal taal van deze medewerker
-        employee_language = "N"  # Default: Nederlands
-        staff_df = self.data.df. get("staff", pd.DataFrame())
-        if not staff_df.empty and "staffGID" in staff_df.columns and "staffLANGUAGE" in staff_df.columns:
-            emp_row = staff_df[staff_df["staffGID"]. astype(str).str.strip() == self.current_emp_id]
-            if not emp_row.empty:
-                employee_language = str(emp_row. iloc[0]. get("staffLANGUAGE", "N")).strip().upper()
-
-        id_col = self.data.get_id_column()
-        certs = self.data.df. get("certificates", pd.DataFrame())
-        competences = self.data.df.get("competences", pd.DataFrame())
-        training_req = self.data.df.get("training_req", pd.DataFrame())
-        cfg_cert = self.data.df.get("config_cert", pd.DataFrame())
-        cfg_comp = self.data.df.get("competence_config", pd.DataFrame())
-        master_cert = self.data.master_cert_all
-        master_comp = self.data.master_comp_all
+        gid = self.current_emp_id
+        profile = self.data.get_employee_profile(gid)
+
+        # 🌍 Taal van deze medewerker (Default: Nederlands)
+        employee_language = profile["language"]
+
+        emp_cert = profile["certificates"]
+        emp_comp = profile["competences"]
+        emp_req = profile["training_req"]
+        emp_cfg = profile["config_cert"]
+        emp_cfg_comp = profile["competence_config"]
+        strategic_cert = profile["strategic_cert"]
+        strategic_comp = profile["strategic_comp"]
 
         # 🐛 DEBUG: Print data voor deze medewerker
         print(f"\n{'='*70}")
-        print(f"🔍 LOAD CERTIFICATES FOR:  {self.current_emp_id}")
+        print(f"🔍 LOAD CERTIFICATES FOR:  {gid}")
         print(f"{'='*70}")
 
         rows = []
@@ -450,11 +425,7 @@ class EmployeeManagementTab(QWidget):
         # ══════════════════════════════════════════════════════════════
         # 1. Behaalde Certificaten (uit Excel/certificates)
         # ══════════════════════════════════════════════════════════════
-        if not certs.empty and id_col in certs.columns:
-            tmp = certs. copy()
-            tmp[id_col] = tmp[id_col]. astype(str).str.strip()
-            emp_cert = tmp[tmp[id_col] == self.current_emp_id]
-
+        if not emp_cert.empty:
             print(f"📊 Sectie 1 - Behaalde Certificaten: {len(emp_cert)} gevonden")
 
             for _, row in emp_cert.iterrows():
@@ -469,21 +440,14 @@ class EmployeeManagementTab(QWidget):
 
                 display_name = self.data.get_display_certname(name, employee_language)
 
-                cfg_row = pd.DataFrame()
-                if not cfg_cert.empty and id_col in cfg_cert.columns:
-                    cfg_row = cfg_cert[
-                        (cfg_cert[id_col]. astype(str).str.strip() == self.current_emp_id) &
-                        (cfg_cert["CertName"].astype(str).str.strip() == name)
-                    ]
-
-                nodig = bool(cfg_row.iloc[0].get("Nodig", True)) if not cfg_row.empty else True
-                comment = str(cfg_row.iloc[0].get("Commentaar", "") or "") if not cfg_row.empty else ""
-                strategic = name in master_cert["CertName"].values if not master_cert. empty else False
+                cfg_row = self.data.get_profile_row("config_cert", gid, name_norm)
+                nodig = bool(cfg_row.get("Nodig", True)) if cfg_row is not None else True
+                comment = str(cfg_row.get("Commentaar", "") or "") if cfg_row is not None else ""
 
                 rows.append({
                     "name": display_name, "type": "Certificaat", "status": row. get("Status", "Onbekend"),
                     "achieved":  True, "expiry": row. get("Expiry_Date", None),
-                    "strategic":  strategic, "nodig": nodig, "comment": comment,
+                    "strategic":  name in strategic_cert, "nodig": nodig, "comment": comment,
                     "extra": "", "source": "certificates"
                 })
                 seen_certs. add(name_norm)
@@ -491,11 +455,7 @@ class EmployeeManagementTab(QWidget):
         # ══════════════════════════════════════════════════════════════
         # 2. Behaalde Competenties (uit Excel/competences)
         # ══════════════════════════════════════════════════════════════
-        if not competences. empty and id_col in competences.columns:
-            tmp = competences.copy()
-            tmp[id_col] = tmp[id_col].astype(str).str.strip()
-            emp_comp = tmp[tmp[id_col] == self.current_emp_id]
-
+        if not emp_comp.empty:
             print(f"📊 Sectie 2 - Behaalde Competenties: {len(emp_comp)} gevonden")
 
             for _, row in emp_comp.iterrows():
@@ -508,22 +468,15 @@ class EmployeeManagementTab(QWidget):
                     continue
                 print(f"  ➕ ADD: {name} → {name_norm}")
 
-                cfg_row = pd.DataFrame()
-                if not cfg_comp.empty and id_col in cfg_comp.columns:
-                    cfg_row = cfg_comp[
-                        (cfg_comp[id_col].astype(str).str.strip() == self.current_emp_id) &
-                        (cfg_comp["Competence"]. astype(str).str.strip() == name)
-                    ]
-                
-                nodig = bool(cfg_row.iloc[0]. get("Nodig", True)) if not cfg_row.empty else True
-                comment = str(cfg_row.iloc[0].get("Opmerking", "") or "") if not cfg_row.empty else ""
-                strategic = name in master_comp["Competence"].values if not master_comp.empty else False
+                cfg_row = self.data.get_profile_row("competence_config", gid, name_norm)
+                nodig = bool(cfg_row.get("Nodig", True)) if cfg_row is not None else True
+                comment = str(cfg_row.get("Opmerking", "") or "") if cfg_row is not None else ""
                 validated = str(row.get("ValidatedAt", "") or "")
 
                 rows.append({
                     "name": name, "type":  "Vaardigheid", "status": "Behaald",
                     "achieved":  True, "expiry": row. get("ValidUntil", None),
-                    "strategic": strategic, "nodig":  nodig, "comment": comment,
+                    "strategic": name in strategic_comp, "nodig":  nodig, "comment": comment,
                     "extra": f"Validatie: {validated}" if validated and validated. lower() != "nan" else "",
                     "source": "competences"
                 })
@@ -532,47 +485,34 @@ class EmployeeManagementTab(QWidget):
         # ══════════════════════════════════════════════════════════════
         # 3. Ingeschreven Opleidingen (Training Requests - GEEL)
         # ══════════════════════════════════════════════════════════════
-        if not training_req.empty:
-            tmp = training_req.copy()
-            id_col_req = None
-            for c in ["staffGID", "staffSAPNR", id_col]:
-                if c in tmp.columns:
-                    id_col_req = c
-                    break
-            
-            if id_col_req:
-                tmp[id_col_req] = tmp[id_col_req].astype(str).str.strip()
-                emp_req = tmp[tmp[id_col_req] == self.current_emp_id]
-
-                print(f"📊 Sectie 3 - Ingeschreven Opleidingen: {len(emp_req)} gevonden")
-
-                for _, row in emp_req.iterrows():
-                    name = str(row.get("CertName", "")).strip()
-                    if not name or name. lower() == "nan": continue
-
-                    name_norm = self.data.normalize_certname(name)
-                    if name_norm in seen_certs:  continue
-
-                    display_name = self.data.get_display_certname(name, employee_language)
-                    sched_date = row.get("ScheduledDate", row.get("ScheduledDateParsed", None))
-
-                    rows.append({
-                        "name": display_name, "type": "Certificaat", "status": "Ingeschreven",
-                        "achieved": False, "expiry": sched_date,
-                        "strategic": name in master_cert["CertName"].values if not master_cert.empty else False,
-                        "nodig": True,
-                        "comment": "",
-                        "extra": "📅 Ingeschreven in Xaurum",
-                        "source": "training_req"
-                    })
-                    seen_certs. add(name_norm)
-
-        # ═════════════════════════════════════════════���════════════════
+        if not emp_req.empty:
+            print(f"📊 Sectie 3 - Ingeschreven Opleidingen: {len(emp_req)} gevonden")
+
+            for _, row in emp_req.iterrows():
+                name = str(row.get("CertName", "")).strip()
+                if not name or name. lower() == "nan": continue
+
+                name_norm = self.data.normalize_certname(name)
+                if name_norm in seen_certs:  continue
+
+                display_name = self.data.get_display_certname(name, employee_language)
+                sched_date = row.get("ScheduledDate", row.get("ScheduledDateParsed", None))
+
+                rows.append({
+                    "name": display_name, "type": "Certificaat", "status": "Ingeschreven",
+                    "achieved": False, "expiry": sched_date,
+                    "strategic": name in strategic_cert,
+                    "nodig": True,
+                    "comment": "",
+                    "extra": "📅 Ingeschreven in Xaurum",
+                    "source": "training_req"
+                })
+                seen_certs. add(name_norm)
+
+        # ══════════════════════════════════════════════════════════════
         # 4. Certificaat Config Items (Vereist maar niet behaald - ROOD)
         # ══════════════════════════════════════════════════════════════
-        if not cfg_cert.empty and id_col in cfg_cert.columns:
-            emp_cfg = cfg_cert[cfg_cert[id_col].astype(str).str.strip() == self.current_emp_id]
-
+        if not emp_cfg.empty:
             print(f"📊 Sectie 4 - Certificaat Config Items: {len(emp_cfg)} gevonden")
 
             for _, row in emp_cfg.iterrows():
@@ -590,7 +530,7 @@ class EmployeeManagementTab(QWidget):
                 rows.append({
                     "name": display_name, "type": "Certificaat", "status": "Vereist (niet behaald)",
                     "achieved": False, "expiry": None,
-                    "strategic": name in master_cert["CertName"].values if not master_cert.empty else False,
+                    "strategic": name in strategic_cert,
                     "nodig": bool(row.get("Nodig", True)),
                     "comment": str(row.get("Commentaar", "") or ""),
                     "extra": "Vereist in configuratie", "source": "config"
@@ -600,9 +540,7 @@ class EmployeeManagementTab(QWidget):
         # ══════════════════════════════════════════════════════════════
         # 5. ✅ NIEUW: Competentie Config Items (Vereist maar niet behaald - PAARS)
         # ══════════════════════════════════════════════════════════════
-        if not cfg_comp.empty and id_col in cfg_comp. columns:
-            emp_cfg_comp = cfg_comp[cfg_comp[id_col].astype(str).str.strip() == self.current_emp_id]
-
+        if not emp_cfg_comp.empty:
             print(f"📊 Sectie 5 - Competentie Config Items: {len(emp_cfg_comp)} gevonden")
 
             for _, row in emp_cfg_comp.iterrows():
@@ -616,15 +554,7 @@ class EmployeeManagementTab(QWidget):
                 print(f"  ➕ ADD: {name} → {name_norm}")
 
                 # Check of al behaald in competences Excel
-                is_achieved = False
-                if not competences.empty and id_col in competences.columns:
-                    achieved_check = competences[
-                        (competences[id_col].astype(str).str.strip() == self.current_emp_id) &
-                        (competences["Competence"]. astype(str).str.strip() == name)
-                    ]
-                    is_achieved = not achieved_check.empty
-
-                strategic = name in master_comp["Competence"].values if not master_comp.empty else False
+                is_achieved = self.data.get_profile_row("competences", gid, name_norm) is not None
 
                 rows.append({
                     "name": name,
@@ -632,7 +562,7 @@ class EmployeeManagementTab(QWidget):
                     "status": "Behaald" if is_achieved else "Vereist (niet behaald)",
                     "achieved": is_achieved,
                     "expiry": row.get("GeldigTot", None),
-                    "strategic":  strategic,
+                    "strategic":  name in strategic_comp,
                     "nodig":  bool(row.get("Nodig", True)),
                     "comment": str(row.get("Opmerking", "") or ""),
                     "extra": "" if is_achieved else "Vereist in configuratie",
@@ -648,59 +578,28 @@ class EmployeeManagementTab(QWidget):
 
         rows = sorted(rows, key=lambda r: (0 if r["strategic"] else 1, 0 if r["nodig"] else 1, r["name"].lower()))
 
+        # --- STYLING LOGICA ---
         for row in rows:
-            w = CertificateRowWidget(
-                cert_name=row["name"],
-                task_type=row["type"],
-                is_strategic=row["strategic"],
-                status=row["status"],
-                is_achieved=row["achieved"],
-                nodig=row["nodig"],
-                commentaar=row["comment"],
-                expiry_date=row["expiry"],
-                extra_info=row["extra"]
-            )
-            
-            # --- STYLING LOGICA ---
             if row["source"] == "training_req": 
-                w.set_background("ingeschreven", False)
+                row["style"] = ("ingeschreven", False)
             elif row["source"] == "config" and not row["achieved"]: 
-                w.set_background("vereist", False)
+                row["style"] = ("vereist", False)
             elif row["source"] == "competence_config" and not row["achieved"]: 
                 # ✅ NIEUW:  Paarse styling voor vereiste vaardigheden
-                w.set_background("vereist", False)
+                row["style"] = ("vereist", False)
             elif row.get("status") == "Nieuw":
-                w.set_background("nieuw", False)
-
-            w.deleted.connect(self.on_certificate_deleted)
-            w.switch_nodig.toggled.connect(self.mark_dirty)
-            w.edit_comment.textChanged.connect(self. mark_dirty)
-            
-            if hasattr(self, "toggle_show_nodig"):
-                w.set_nodig_visible(self.toggle_show_nodig.isChecked())
-
-            self.cert_layout.addWidget(w)
-            self.cert_widgets.append(w)
+                row["style"] = ("nieuw", False)
 
-        self.cert_layout.addStretch()
+        self.cert_model.set_rows(rows)
     
     def clear_cert_widgets(self):
-        for w in self.cert_widgets:
-            w.setParent(None)
-            w.deleteLater()
-        self.cert_widgets.clear()
-        
-        while self.cert_layout.count():
-            item = self.cert_layout.takeAt(0)
-            w = item.widget()
-            if w: w.deleteLater()
+        self.cert_model.clear()
 
     def mark_dirty(self, *args):
         self.dirty = True
 
     def on_toggle_show_nodig(self, checked: bool):
-        for w in self.cert_widgets:
-            w.set_nodig_visible(checked)
+        self.cert_model.set_details_visible(checked)
 
     # ══════════════════════════════════════════════════════════════
     # ZOEK & TOEVOEG LOGICA
@@ -710,27 +609,32 @@ class EmployeeManagementTab(QWidget):
         self.on_search_changed(self.search_box.text())
 
     def on_search_changed(self, text: str):
-        s = text.strip().lower()
-        if not s:
+        """Debounced: de zoekopdracht loopt pas als er 150 ms niet getypt wordt."""
+        if not text.strip():
+            self._search_timer.stop()
             self.results_list.hide()
             return
+        self._search_timer.start()
 
-        results = []
-        for name in self.data.all_cert_names:
-            if s in name.lower(): results.append(("CERT", name))
-        for name in self.data.all_competence_names:
-            if s in name.lower(): results.append(("VAARD", name))
+    def _run_search(self):
+        """Typeahead via de zoekindex van de DataStore (search_master_names)."""
+        s = self.search_box.text().strip()
+        if not s:
+            self.results_list.hide()
+            return
 
-        is_cert = self.radio_cert.isChecked()
-        results.sort(key=lambda x: (0 if (x[0]=="CERT" and is_cert) or (x[0]=="VAARD" and not is_cert) else 1, x[1]))
+        prefer = "CERT" if self.radio_cert.isChecked() else "VAARD"
+        results = self.data.search_master_names(s, prefer=prefer, limit=50)
 
+        self.results_list.setUpdatesEnabled(False)
         self.results_list.clear()
         from PyQt6.QtWidgets import QListWidgetItem
-        for r_type, r_name in results[:50]:
+        for r_type, r_name in results:
             icon = "📜" if r_type == "CERT" else "🎯"
             item = QListWidgetItem(f"{icon} {r_name}")
             item.setData(Qt.ItemDataRole.UserRole, {"type": r_type, "name": r_name})
             self.results_list.addItem(item)
+        self.results_list.setUpdatesEnabled(True)
 
         if results:
             p = self.search_box.mapToGlobal(self.search_box.rect().bottomLeft())
@@ -742,6 +646,9 @@ class EmployeeManagementTab(QWidget):
             self.results_list.hide()
 
     def on_search_enter(self):
+        if self._search_timer.isActive():
+            self._search_timer.stop()
+            self._run_search()
         if self.results_list.isVisible() and self.results_list.count() > 0:
             item = self.results_list.currentItem() or self.results_list.item(0)
             self.add_item_from_search(item)
@@ -753,25 +660,16 @@ class EmployeeManagementTab(QWidget):
         name = data["name"]
         t_type = "Vaardigheid" if data["type"] == "VAARD" else "Certificaat"
 
-        for w in self.cert_widgets:
-            if w.cert_name.lower() == name.lower():
-                QMessageBox.information(self, "Al aanwezig", f"'{name}' staat al in de lijst.")
-                return
-
-        w = CertificateRowWidget(
-            cert_name=name, task_type=t_type,
-            status="Nieuw", is_achieved=False, nodig=True,
-            extra_info="➕ Nieuw toegevoegd"
-        )
-        w.set_background("nieuw", False)
-
-        w.deleted.connect(self.on_certificate_deleted)
-        w.switch_nodig.toggled.connect(self.mark_dirty)
-        w.edit_comment.textChanged.connect(self.mark_dirty)
-        w.set_nodig_visible(self.toggle_show_nodig.isChecked())
+        if self.cert_model.find(name, case_sensitive=False) is not None:
+            QMessageBox.information(self, "Al aanwezig", f"'{name}' staat al in de lijst.")
+            return
 
-        self.cert_layout.insertWidget(0, w)
-        self.cert_widgets.insert(0, w)
+        self.cert_model.insert_row(0, {
+            "name": name, "type": t_type,
+            "status": "Nieuw", "achieved": False, "nodig": True,
+            "extra": "➕ Nieuw toegevoegd", "style": ("nieuw", False)
+        })
+        self.cert_view.scrollToTop()
         self.dirty = True
         
         self.search_box.clear()
@@ -848,61 +746,39 @@ class EmployeeManagementTab(QWidget):
             print(f"{'='*60}")
             
             # 1. Bepaal type (Certificaat of Vaardigheid)
-            is_vaardigheid = False
-            for w in self.cert_widgets:
-                if w.cert_name == cert_name: 
-                    is_vaardigheid = (w.task_type == "Vaardigheid")
-                    break
+            row = self.cert_model.find(cert_name)
+            is_vaardigheid = row is not None and row["type"] == "Vaardigheid"
             
             print(f"   📋 Type: {'Vaardigheid' if is_vaardigheid else 'Certificaat'}")
 
-            # 2. SQL DELETE (Config + Todo)
-            if self.data. USE_SQL_FOR_CONFIG and self. data.sql_training_manager:
-                try:
-                    # A. Verwijder uit Config tabel
-                    if is_vaardigheid:
-                        success = self.data. sql_training_manager.delete_medewerker_competentie_config(
-                            self.current_emp_id, 
-                            cert_name
-                        )
-                        print(f"   {'✅' if success else '❌'} Config competentie verwijderd")
-                    else:
-                        success = self.data. sql_training_manager.delete_medewerker_certificaat_config(
-                            self.current_emp_id, 
-                            cert_name
-                        )
-                        print(f"   {'✅' if success else '❌'} Config certificaat verwijderd")
-                    
-                    # B.  Verwijder ook de taak uit TodoPlanner
-                    cert_name_norm = self.data.normalize_certname(cert_name)
-                    if hasattr(self. data.sql_training_manager, 'delete_todo_task'):
-                        todo_success = self. data.sql_training_manager.delete_todo_task(
-                            self.current_emp_id, 
-                            cert_name_norm
-                        )
-                        print(f"   {'✅' if todo_success else 'ℹ️'} Todo taak verwijderd")
-                    else:
-                        # Fallback:  verwijder via sync
-                        print(f"   🔄 Todo wordt bijgewerkt via sync...")
-                    
-                    print(f"\n   ✅ {cert_name} volledig verwijderd")
-
-                except Exception as e:
-                    print(f"   ❌ Delete error: {e}")
-                    import traceback
-                    traceback. print_exc()
-                    QMessageBox.warning(self, "Fout", f"Kon niet volledig verwijderen:\n{e}")
-
-            # 3. Herlaad config uit SQL (zodat in-memory data klopt)
-            self._reload_config_from_sql()
+            # 2. DELETE (Config + Todo in 1 SQL batch) + in-memory patch i.p.v. herladen
+            change = None
+            try:
+                change = self.data.delete_employee_item(self.current_emp_id, cert_name, is_vaardigheid)
+                if change is None:
+                    QMessageBox.warning(self, "Fout", f"Kon '{cert_name}' niet verwijderen.")
+                    return
+                print(f"\n   ✅ {cert_name} volledig verwijderd")
 
-            # 4. Herlaad UI
+            except Exception as e:
+                print(f"   ❌ Delete error: {e}")
+                import traceback
+                traceback. print_exc()
+                QMessageBox.warning(self, "Fout", f"Kon niet volledig verwijderen:\n{e}")
+                # Geheugen kan half gepatcht zijn -> terugvallen op volledige herlaadbeurt
+                self._reload_config_from_sql()
+
+            # 3. Herlaad UI (profiel-index werkt enkel de gewijzigde bronnen bij)
             QTimer.singleShot(100, self.load_certificates_for_employee)
             
-            # 5. Refresh Todo pagina
+            # 4. Todo pagina: enkel de verwijderde taken melden (fallback: volledige refresh)
             main_window = self.window()
-            if hasattr(main_window, "page_todo"):
-                QTimer.singleShot(200, main_window.page_todo.refresh)
+            page_todo = getattr(main_window, "page_todo", None)
+            if page_todo is not None:
+                if change is not None and hasattr(page_todo, "on_tasks_removed"):
+                    page_todo.on_tasks_removed(change)
+                else:
+                    QTimer.singleShot(200, page_todo.refresh)
             
             self. dirty = False
             
@@ -978,11 +854,11 @@ class EmployeeManagementTab(QWidget):
 
         print(f"   👤 Medewerker:  {medewerker_naam} ({self.current_emp_id})")
         print(f"   🏢 CostCenter: {staff_costcenter}")
-        print(f"   📋 Widgets te verwerken: {len(self.cert_widgets)}")
+        cert_rows = self.cert_model.get_data_rows()
+        print(f"   📋 Rijen te verwerken: {len(cert_rows)}")
 
-        # 3. Loop door widgets
-        for w in self. cert_widgets: 
-            d = w. get_data()
+        # 3. Loop door de lijst
+        for d in cert_rows: 
             raw_name = d["CertName"]
             
             # Sla lege regels over
@@ -990,7 +866,7 @@ class EmployeeManagementTab(QWidget):
                 continue
 
             # Standaardiseer naam voor certificaten
-            if w.task_type != "Vaardigheid":
+            if d["TaskType"] != "Vaardigheid":
                  raw_name = self.data.normalize_certname_to_standard(raw_name)
 
             # Basis data (voor beide tabellen)
@@ -1008,7 +884,7 @@ class EmployeeManagementTab(QWidget):
             }
 
             # 4. SPLITSING (Cruciaal voor SQL fouten)
-            if w.task_type == "Vaardigheid": 
+            if d["TaskType"] == "Vaardigheid": 
                 # --- VAARDIGHEDEN ---
                 row_data["Competence"] = raw_name
                 row_data["Competence_norm"] = normalize_certname(raw_name)
@@ -1082,137 +958,11 @@ class EmployeeManagementTab(QWidget):
 
     def _run_planner_sync(self, force_refresh=True):
         """Voert de sync uit om taken aan te maken/sluiten."""
-        print("🔄 Start planner sync...")
         try:
             if self.data.sql_training_manager and force_refresh:
                 
-                # 1. Herlaad CONFIG (Master bron)
-                fc = self.data.sql_training_manager.get_medewerker_certificaat_config()
-                if fc is not None: 
-                    self.data.df["config_cert"] = fc
-                    self.data.df["config"] = fc 
-                
-                fcomp = self.data.sql_training_manager.get_medewerker_competentie_config()
-                if fcomp is not None: 
-                    self.data.df["competence_config"] = fcomp
-                
-                print("   -> Config DF's in DataStore herladen vanuit SQL.")
-                
-
-                # 2. Herlaad TODO (Haalt alle bestaande taken op)
-                todo_df = self.data.sql_training_manager.get_todo_planner()
-                if todo_df is not None:
-                    self.data.df["todo"] = todo_df
-                    print(f"   -> Todo herladen: {len(todo_df)} taken")
-                
-                todo = self.data.df.get("todo", pd.DataFrame())
-                cfg_cert = self.data.df.get("config_cert", pd.DataFrame())
-                cfg_comp = self.data.df.get("competence_config", pd.DataFrame())
-                
-                # Definitie van is_truthy (indien nodig)
-                is_truthy = self.data.is_truthy_value if hasattr(self.data, 'is_truthy_value') else lambda val: str(val).lower().strip() in ('true', '1', 'y', 'ja', 'yes')
-
-                
-                # >>> KRITIEKE FIX 1: Forceer de 'Nodig' vlag op basis van de verse Config
-                if not todo.empty and (not cfg_cert.empty or not cfg_comp.empty) and "CertName_norm" in todo.columns:
-                    
-                    # Mapping van Configuratie (Certificaten)
-                    cert_map = {}
-                    if "staffGID" in cfg_cert.columns and "CertName" in cfg_cert.columns:
-                        cfg_cert["CertName_norm"] = cfg_cert["CertName"].astype(str).apply(self.data.normalize_certname)
-                        cert_map = cfg_cert.set_index(["staffGID", "CertName_norm"])["Nodig"].to_dict()
-                    
-                    # Mapping van Configuratie (Vaardigheden)
-                    comp_map = {}
-                    if "staffGID" in cfg_comp.columns and "Competence" in cfg_comp.columns:
-                        cfg_comp["CertName_norm"] = cfg_comp["Competence"].astype(str).apply(self.data.normalize_certname)
-                        comp_map = cfg_comp.set_index(["staffGID", "CertName_norm"])["Nodig"].to_dict()
-
-                    # Functie die de Nodig vlag uit de Master Config haalt
-                    def check_nodig_status(row):
-                        staff_id = str(row.get("staffGID", "")).strip()
-                        cert_norm = str(row.get("CertName_norm", "")).strip()
-                        task_type = str(row.get("TaskType", "")).strip()
-                        key = (staff_id, cert_norm)
-                        default_nodig = is_truthy(row.get("Nodig", True))
-
-                        if "Certificaat" in task_type and key in cert_map:
-                            return is_truthy(cert_map.get(key, default_nodig))
-                        elif "Vaardigheid" in task_type and key in comp_map:
-                            return is_truthy(comp_map.get(key, default_nodig))
-                        return default_nodig
-                    
-                    todo["Nodig"] = todo.apply(check_nodig_status, axis=1)
-                    self.data.df["todo"] = todo
-                    print("   -> 'Nodig' vlag in Todo DF bijgewerkt naar verse Config.")
-                # <<< EINDE KRITIEKE FIX 1
-
-
-                # 3. SLUIT TAKEN (In-memory update: Status -> Afgewerkt)
-                self.data.close_tasks_no_longer_needed()
-                print("   -> Taken in geheugen gemarkeerd als Afgewerkt.")
-
-
-                # >>> KRITIEKE FIX 2: BRUTE FORCE ELIMINATIE (Nodig=False moet verdwijnen)
-                # We gaan de NODIG=TRUE sleutels direct uit de verse config halen.
-                
-                if not todo.empty:
-                    before_count = len(todo)
-
-                    # 1. Bepaal de sleutels (staffGID, CertName_norm) van ALLE taken die NODIG ZIJN
-                    
-                    # Certificaten Nodig=True
-                    cert_nodig = cfg_cert[cfg_cert["Nodig"].apply(is_truthy)].copy()
-                    cert_nodig["CertName_norm"] = cert_nodig["CertName"].astype(str).apply(self.data.normalize_certname)
-                    cert_keys = cert_nodig.set_index(["staffGID", "CertName_norm"]).index.tolist()
-
-                    # Competenties Nodig=True
-                    comp_nodig = cfg_comp[cfg_comp["Nodig"].apply(is_truthy)].copy()
-                    comp_nodig["CertName_norm"] = comp_nodig["Competence"].astype(str).apply(self.data.normalize_certname)
-                    comp_keys = comp_nodig.set_index(["staffGID", "CertName_norm"]).index.tolist()
-
-                    needed_keys = set(cert_keys + comp_keys)
-
-                    # 2. Filteren: Behoud ALLEEN taken die NODIG ZIJN OF AL DEFINITIEF GESLOTEN
-                    todo["key"] = list(zip(todo["staffGID"], todo["CertName_norm"]))
-                    
-                    is_needed = todo["key"].apply(lambda x: x in needed_keys)
-                    is_closed_for_history = todo["Status"].astype(str).str.lower().isin(["afgewerkt", "gesloten", "certified"])
-
-                    # Behoud alles wat Nodig is OF alles wat Gesloten is (dit voorkomt dat correct afgewerkte taken verdwijnen)
-                    todo_to_keep = todo[is_needed | is_closed_for_history].drop(columns=["key"]).copy()
-                    
-                    removed_count = before_count - len(todo_to_keep)
-                    if removed_count > 0:
-                        self.data.df["todo"] = todo_to_keep
-                        print(f"   -> {removed_count} onnodige/verouderde taken (Nodig=False uit Config) VERWIJDERD uit geheugen.")
-                    else:
-                        print("   -> Geen onnodige taken om te verwijderen.")
-                # <<< EINDE KRITIEKE FIX 2
-
-
-                # 4. KRITIEKE STAP: SLA NU DE SCHONE STATUS DIRECT OP NAAR SQL
-                # Dit is de laatste stap die de taak definitief elimineert uit de database.
-                if self.data.USE_SQL_FOR_TODO:
-                    self.data.save_todo() 
-                    print("   -> Schone takenlijst (zonder Nodig=False) opgeslagen naar SQL.")
-
-
-                # 5. Sync Logic (Creëert nieuwe taken/sync inschrijvingen)
-                self.data.sync_todo_with_config()
-                self.data.create_tasks_for_expiring_certificates()  # 🆕 Scan certificaten op vervaldata
-                self.data.sync_competence_tasks()
-                self.data.update_status_from_tasktype_and_xaurum()
-                self.data.apply_overrule_with_zweef()
-                self.data.close_finished_tasks()
-                # Detecteer afwezigen bij afgelopen opleidingen
-                self.data.detect_absent_from_completed_training()
-
-                # 6. Final Save (met staff info enrichment)
-                if self.data.USE_SQL_FOR_TODO:
-                    self.data.enrich_todo_with_staff_info()  # 🆕 Vul CostCenter/MedewerkerNaam in
-                    self.data.save_todo()
-                    print("   -> Sync resultaten opgeslagen naar SQL")
+                # 1-6. Herladen, Nodig verversen, elimineren, sync-keten en opslaan (gedeeld met batch_sync)
+                self.data.run_planner_sync(reload=True)
 
                 # 7. UI Verversen
                 self.load_certificates_for_employee()
@@ -1053,6 +1053,9 @@ class SQLServerTrainingManager:
         if self.engine is None or df is None or df.empty:
             return True, mapping
 
+        # Unieke staging naam per aanroep: parallelle syncs (batch_sync) overschrijven elkaar niet
+        staging = f"temp_todo_sync_{uuid.uuid4().hex[:12]}"
+
         try:
             # --- A. DATA PREPARATIE ---
             df_save = df.copy()
@@ -1101,7 +1104,7 @@ class SQLServerTrainingManager:
                     df_save[col] = pd.to_numeric(df_save[col], errors='coerce').astype('Int64')
 
             # --- B. TIJDELIJKE TABEL VULLEN ---
-            df_save.to_sql("temp_todo_sync", self.engine, if_exists="replace", index=False, 
+            df_save.to_sql(staging, self.engine, if_exists="replace", index=False, 
                            dtype={'_SrcRowId': String(50), 'staffGID': String(50), 'CostCenter': String(50)})
 
             # --- C. DE QUERY (MET FIREWALL) ---
@@ -1112,7 +1115,7 @@ class SQLServerTrainingManager:
                 DELETE FROM dbo.TM_TodoPlanner 
                 WHERE CostCenter = '{active_cc}' 
                 AND NOT EXISTS (
-                    SELECT 1 FROM dbo.temp_todo_sync tmp 
+                    SELECT 1 FROM dbo.{staging} tmp 
                     WHERE tmp.staffGID = dbo.TM_TodoPlanner.staffGID 
                     AND tmp.CertName_norm = dbo.TM_TodoPlanner.CertName_norm
                     AND tmp.TaskType = dbo.TM_TodoPlanner.TaskType
@@ -1124,7 +1127,7 @@ class SQLServerTrainingManager:
                     SELECT * FROM (
                         SELECT *, ROW_NUMBER() OVER (
                             PARTITION BY staffGID, CertName_norm, TaskType ORDER BY LastUpdatedAt DESC
-                        ) as rn FROM dbo.temp_todo_sync
+                        ) as rn FROM dbo.{staging}
                     ) x WHERE x.rn = 1
                 ) AS src
                 ON (target.staffGID = src.staffGID 
@@ -1163,7 +1166,7 @@ class SQLServerTrainingManager:
                     if len(row) >= 2 and row[1]:
                         mapping[str(row[1])] = int(row[0]) if row[0] is not None else None
                 
-                conn.execute(text("IF OBJECT_ID('dbo.temp_todo_sync') IS NOT NULL DROP TABLE dbo.temp_todo_sync"))
+                conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
 
             print(f"   ✅ SQL: Opslaan geslaagd voor {len(df_save)} taken in {active_cc}.")
             return True, mapping
@@ -1172,7 +1175,7 @@ class SQLServerTrainingManager:
             print(f"   ❌ Fout in save_todo_planner: {e}")
             try:
                 with self.engine.begin() as conn:
-                    conn.execute(text("IF OBJECT_ID('dbo.temp_todo_sync') IS NOT NULL DROP TABLE dbo.temp_todo_sync"))
+                    conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
             except: pass
             return False, mapping
     def get_certificaat_mapping(self) -> pd.DataFrame:
@@ -1336,6 +1339,71 @@ class SQLServerTrainingManager:
             traceback.print_exc()
             return False
     
+    def _add_master_batch(self, table: str, name_col: str, norm_col: str, names: List[str]) -> int:
+        """
+        Voegt een lijst namen in 1 INSERT ... SELECT FROM (VALUES ...) toe aan een master tabel.
+        Bestaande namen (zelfde naam of norm) worden overgeslagen door WHERE NOT EXISTS.
+        Per batch van 900 rijen (SQL Server max 2100 parameters).
+
+        Returns: aantal effectief toegevoegde rijen.
+        """
+        from sqlalchemy import text
+        import re
+
+        if not self.engine or not names:
+            return 0
+
+        rows = {}
+        for name in names:
+            name = str(name or "").strip()
+            norm = re.sub(r'[^a-z0-9]', '', name.lower())
+            if name and norm and norm not in rows:
+                rows[norm] = name
+        if not rows:
+            return 0
+
+        items = list(rows.items())
+        added = 0
+        try:
+            with self.engine.begin() as conn:
+                for start in range(0, len(items), 900):
+                    chunk = items[start:start + 900]
+                    values = ", ".join(f"(:name{i}, :norm{i})" for i in range(len(chunk)))
+                    params = {}
+                    for i, (norm, name) in enumerate(chunk):
+                        params[f"name{i}"] = name
+                        params[f"norm{i}"] = norm
+                    insert_sql = text(f"""
+                        INSERT INTO dbo.{table}
+                        ({name_col}, {norm_col}, Active, Categorie, StrategischBelangrijk,
+                         LaatsteWijziging, GewijzigdDoor)
+                        SELECT v.name, v.norm, 1, 'Auto-Created', 0, GETDATE(), 'TMS App'
+                        FROM (VALUES {values}) AS v(name, norm)
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM dbo.{table} m
+                            WHERE m.{name_col} = v.name OR m.{norm_col} = v.norm
+                        )
+                    """)
+                    result = conn.execute(insert_sql, params)
+                    added += max(result.rowcount or 0, 0)
+
+            print(f"✅ {table}: {added} nieuwe rij(en) toegevoegd ({len(items) - added} bestonden al)")
+            return added
+
+        except Exception as e:
+            print(f"❌ Fout bij batch toevoegen aan {table}: {e}")
+            import traceback
+            traceback.print_exc()
+            return 0
+
+    def add_master_certificaten(self, cert_names: List[str]) -> int:
+        """Voegt meerdere certificaten in 1 batch toe aan TM_MasterCertificaten."""
+        return self._add_master_batch("TM_MasterCertificaten", "CertName", "CertName_norm", cert_names)
+
+    def add_master_competenties(self, comp_names: List[str]) -> int:
+        """Voegt meerdere competenties in 1 batch toe aan TM_MasterCompetenties."""
+        return self._add_master_batch("TM_MasterCompetenties", "Competence", "Competence_norm", comp_names)
+    
     def add_medewerker_config(self, staff_id: str, cert_name: str, nodig: bool = True):
         """
         Voegt een certificaat toe aan de config tabel (UPSERT).
@@ -1402,6 +1470,89 @@ class SQLServerTrainingManager:
 
     # Alias voor backwards compatibility
     add_medewerker_certificaat_config = add_medewerker_config
+
+    def add_medewerker_configs(self, pairs: pd.DataFrame, nodig: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Bulk-variant van add_medewerker_config (bv. nieuw verplicht certificaat voor een hele afdeling).
+        De paren worden 1x gestaged en in 1 MERGE op (staffGID, CertName_norm) toegepast.
+
+        Args:
+            pairs: frame met staffGID + CertName (optioneel Nodig per rij)
+            nodig: standaardwaarde voor Nodig als de kolom ontbreekt
+
+        Returns:
+            frame (ConfigID, staffGID, CertName, CertName_norm, Nodig, Action) met Action = 'INSERT'
+            of 'UPDATE' per rij, of None bij fout
+        """
+        import uuid
+        from sqlalchemy import text
+        from sqlalchemy.types import String
+
+        cols = ["ConfigID", "staffGID", "CertName", "CertName_norm", "Nodig", "Action"]
+        if pairs is None or pairs.empty:
+            return pd.DataFrame(columns=cols)
+
+        if getattr(self, "engine", None) is None:
+            print("   ❌ add_medewerker_configs: Geen SQL engine beschikbaar")
+            return None
+
+        src = pd.DataFrame({
+            "staffGID": pairs["staffGID"].astype(str).str.strip(),
+            "CertName": pairs["CertName"].astype(str).str.strip(),
+        })
+        if "Nodig" in pairs.columns:
+            # Zelfde waarheidswaarden als clean_bool: "0", "False", "nee" blijven False (astype(bool) maakt ze True)
+            nodig_txt = pairs["Nodig"].astype(str).str.strip().str.lower()
+            nodig_ok = nodig_txt.isin(['true', '1', '1.0', 'yes', 'ja', 'aan', 'on'])
+            src["Nodig"] = nodig_ok.where(pairs["Nodig"].notna(), bool(nodig)).astype(bool)
+        else:
+            src["Nodig"] = bool(nodig)
+        src["Nodig"] = src["Nodig"].astype(int)
+        # Normaliseer per unieke naam (zelfde sleutel als add_medewerker_config)
+        norms = {n: self._normalize_certname(n) for n in src["CertName"].unique()}
+        src["CertName_norm"] = src["CertName"].map(norms)
+        src = src[(src["staffGID"] != "") & (src["CertName_norm"] != "")]
+        src = src.drop_duplicates(subset=["staffGID", "CertName_norm"], keep="last")
+        if src.empty:
+            return pd.DataFrame(columns=cols)
+
+        staging = f"temp_config_assign_{uuid.uuid4().hex[:12]}"
+        print(f"   ➕ add_medewerker_configs: {len(src)} paren ({src['CertName'].nunique()} certificaat/certificaten)")
+
+        try:
+            with self.engine.begin() as conn:
+                src.to_sql(staging, conn, if_exists="replace", index=False,
+                           dtype={"staffGID": String(50), "CertName": String(255), "CertName_norm": String(255)})
+                result = conn.execute(text(f"""
+                    SET NOCOUNT ON;
+
+                    MERGE INTO dbo.TM_MedewerkerCertificaatConfig AS target
+                    USING dbo.{staging} AS src
+                    ON (target.staffGID = src.staffGID AND target.CertName_norm = src.CertName_norm)
+                    WHEN MATCHED THEN
+                        UPDATE SET target.Nodig = src.Nodig, target.LaatsteWijziging = GETDATE()
+                    WHEN NOT MATCHED THEN
+                        INSERT (staffGID, CertName, CertName_norm, Nodig, Strategisch, LaatsteWijziging)
+                        VALUES (src.staffGID, src.CertName, src.CertName_norm, src.Nodig, 0, GETDATE())
+                    OUTPUT inserted.ConfigID, inserted.staffGID, src.CertName, inserted.CertName_norm,
+                           inserted.Nodig, $action;
+                """))
+                out = pd.DataFrame([tuple(r) for r in result.fetchall()], columns=cols)
+                conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
+
+            n_ins = int((out["Action"] == "INSERT").sum())
+            print(f"   ✅ add_medewerker_configs: {n_ins} INSERT / {len(out) - n_ins} UPDATE")
+            return out
+
+        except Exception as e:
+            print(f"   ❌ Fout bij add_medewerker_configs: {e}")
+            import traceback
+            traceback.print_exc()
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
+            except: pass
+            return None
     
     def delete_medewerker_certificaat_config(self, staff_gid:  str, cert_name: str) -> bool:
         """
@@ -1553,4 +1704,148 @@ class SQLServerTrainingManager:
             print(f"   ❌ DELETE todo fout:  {e}")
             import traceback
             traceback.print_exc()
-            return False
\ No newline at end of file
+            return False
+
+    def delete_medewerker_item(self, staff_gid: str, cert_name: str, cert_name_norm: str,
+                               is_vaardigheid: bool = False):
+        """
+        Verwijdert een certificaat/vaardigheid uit de config EN de bijhorende taak
+        uit de TM_TodoPlanner in één batch (1 round trip, 1 transactie).
+
+        Args:
+            staff_gid: De staffGID van de medewerker
+            cert_name: De naam zoals in de config tabel
+            cert_name_norm: De genormaliseerde naam (sleutel in TodoPlanner)
+            is_vaardigheid: True = TM_MedewerkerCompetentieConfig, anders certificaat
+
+        Returns:
+            {"config": n, "todo": n} met het aantal verwijderde rijen, of None bij fout
+        """
+        from sqlalchemy import text
+
+        if not staff_gid or not cert_name:
+            print(f"   ⚠️ DELETE item: staffGID of naam ontbreekt")
+            return None
+
+        if getattr(self, "engine", None) is None:
+            print("   ❌ DELETE item: Geen SQL engine beschikbaar")
+            return None
+
+        table, name_col = (
+            ("dbo.TM_MedewerkerCompetentieConfig", "Competence") if is_vaardigheid
+            else ("dbo.TM_MedewerkerCertificaatConfig", "CertName")
+        )
+        print(f"   🗑️ DELETE item: {cert_name} voor {staff_gid}")
+
+        try:
+            with self.engine.begin() as conn:
+                row = conn.execute(text(f"""
+                    SET NOCOUNT ON;
+                    DECLARE @cfg INT, @todo INT;
+
+                    DELETE FROM {table}
+                    WHERE staffGID = :gid AND {name_col} = :name;
+                    SET @cfg = @@ROWCOUNT;
+
+                    DELETE FROM dbo.TM_TodoPlanner
+                    WHERE staffGID = :gid AND CertName_norm = :norm;
+                    SET @todo = @@ROWCOUNT;
+
+                    SELECT @cfg AS cfg_deleted, @todo AS todo_deleted;
+                """), {"gid": staff_gid, "name": cert_name, "norm": cert_name_norm or ""}).fetchone()
+
+            counts = {"config": int(row[0] or 0), "todo": int(row[1] or 0)} if row else {"config": 0, "todo": 0}
+            print(f"   ✅ DELETE item: {counts['config']} config / {counts['todo']} taak/taken verwijderd")
+            return counts
+
+        except Exception as e:
+            print(f"   ❌ DELETE item fout: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    def delete_medewerker_items(self, cert_keys=None, comp_keys=None, todo_keys=None):
+        """
+        Batch-variant van delete_medewerker_certificaat_config, delete_medewerker_competentie_config
+        en delete_todo_task. De sleutels worden 1x gestaged; daarna 1 set-based DELETE per tabel,
+        alles in 1 transactie.
+
+        Args:
+            cert_keys: [(staffGID, CertName)] voor TM_MedewerkerCertificaatConfig
+            comp_keys: [(staffGID, Competence)] voor TM_MedewerkerCompetentieConfig
+            todo_keys: [(staffGID, CertName_norm)] voor TM_TodoPlanner
+
+        Returns:
+            {"config_cert": n, "config_comp": n, "todo": n} met het aantal verwijderde rijen, of None bij fout
+        """
+        import uuid
+        from sqlalchemy import text
+        from sqlalchemy.types import String
+
+        counts = {"config_cert": 0, "config_comp": 0, "todo": 0}
+
+        frames = []
+        for kind, keys in (("cert", cert_keys), ("comp", comp_keys), ("todo", todo_keys)):
+            if keys:
+                part = pd.DataFrame([(str(g or "").strip(), str(n or "").strip()) for g, n in keys],
+                                    columns=["staffGID", "Name"])
+                part.insert(0, "Kind", kind)
+                frames.append(part)
+        if not frames:
+            return counts
+
+        staged = pd.concat(frames, ignore_index=True)
+        staged = staged[(staged["staffGID"] != "") & (staged["Name"] != "")].drop_duplicates()
+        if staged.empty:
+            return counts
+
+        if getattr(self, "engine", None) is None:
+            print("   ❌ DELETE batch: Geen SQL engine beschikbaar")
+            return None
+
+        staging = f"temp_delete_keys_{uuid.uuid4().hex[:12]}"
+        print(f"   🗑️ DELETE batch: {len(staged)} sleutel(s) gestaged")
+
+        try:
+            with self.engine.begin() as conn:
+                staged.to_sql(staging, conn, if_exists="replace", index=False,
+                              dtype={"Kind": String(10), "staffGID": String(50), "Name": String(255)})
+                row = conn.execute(text(f"""
+                    SET NOCOUNT ON;
+                    DECLARE @cert INT, @comp INT, @todo INT;
+
+                    DELETE cfg FROM dbo.TM_MedewerkerCertificaatConfig cfg
+                    INNER JOIN dbo.{staging} k
+                        ON k.Kind = 'cert' AND k.staffGID = cfg.staffGID AND k.Name = cfg.CertName;
+                    SET @cert = @@ROWCOUNT;
+
+                    DELETE cfg FROM dbo.TM_MedewerkerCompetentieConfig cfg
+                    INNER JOIN dbo.{staging} k
+                        ON k.Kind = 'comp' AND k.staffGID = cfg.staffGID AND k.Name = cfg.Competence;
+                    SET @comp = @@ROWCOUNT;
+
+                    DELETE t FROM dbo.TM_TodoPlanner t
+                    INNER JOIN dbo.{staging} k
+                        ON k.Kind = 'todo' AND k.staffGID = t.staffGID AND k.Name = t.CertName_norm;
+                    SET @todo = @@ROWCOUNT;
+
+                    DROP TABLE dbo.{staging};
+
+                    SELECT @cert AS cert_deleted, @comp AS comp_deleted, @todo AS todo_deleted;
+                """)).fetchone()
+
+            if row:
+                counts = {"config_cert": int(row[0] or 0), "config_comp": int(row[1] or 0), "todo": int(row[2] or 0)}
+            print(f"   ✅ DELETE batch: {counts['config_cert']} certificaat config / "
+                  f"{counts['config_comp']} competentie config / {counts['todo']} taak/taken verwijderd")
+            return counts
+
+        except Exception as e:
+            print(f"   ❌ DELETE batch fout: {e}")
+            import traceback
+            traceback.print_exc()
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"IF OBJECT_ID('dbo.{staging}') IS NOT NULL DROP TABLE dbo.{staging}"))
+            except: pass
+            return None
@@ -10,12 +10,16 @@ from datetime import datetime, timedelta
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QListWidget, QPushButton, QCheckBox, QDialog, QDialogButtonBox, 
-    QComboBox, QSizePolicy, QGraphicsDropShadowEffect
+    QComboBox, QSizePolicy, QGraphicsDropShadowEffect,
+    QListView, QAbstractItemView, QStyledItemDelegate, QApplication
+)
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QRectF, QPointF, QRect, QSize, QEvent,
+    QAbstractListModel, QModelIndex
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QPointF
 from PyQt6.QtGui import (
     QPainter, QColor, QPen, QBrush, QLinearGradient, 
-    QPainterPath, QRadialGradient, QPixmap
+    QPainterPath, QRadialGradient, QPixmap, QFont, QFontMetrics
 )
 
 
@@ -260,12 +264,16 @@ class ToggleSwitch(QWidget):
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton: self.setChecked(not self._checked)
     def paintEvent(self, event):
-        p = QPainter(self); p.setRenderHint(QPainter.RenderHint.Antialiasing)
-        rect = self.rect(); h = rect.height(); w = rect.width(); radius = h / 2
-        bg = QColor("#70bd95") if self._checked else QColor("#cbd5e1")
+        p = QPainter(self); self.paint_switch(p, self.rect(), self._checked); p.end()
+    @staticmethod
+    def paint_switch(p: QPainter, rect, checked: bool):
+        """Tekent de schakelaar in rect (ook gebruikt door CertificateRowDelegate)."""
+        p.save(); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        h = rect.height(); w = rect.width(); radius = h / 2
+        bg = QColor("#70bd95") if checked else QColor("#cbd5e1")
         p.setBrush(bg); p.setPen(Qt.PenStyle.NoPen); p.drawRoundedRect(rect.adjusted(1, 1, -1, -1), radius, radius)
-        margin = 2; d = h - 2 * margin; x = w - margin - d if self._checked else margin
-        p.setBrush(QColor("white")); p.drawEllipse(QRectF(x, margin, d, d)); p.end()
+        margin = 2; d = h - 2 * margin; x = rect.left() + (w - margin - d if checked else margin)
+        p.setBrush(QColor("white")); p.drawEllipse(QRectF(x, rect.top() + margin, d, d)); p.restore()
 
 # ===============================================================
 # 6. CLICKABLE LABEL
@@ -305,6 +313,135 @@ class StatCard(QWidget):
     def update_value(self, value: str):
         self.lbl_value.setText(value)
 
+# ===============================================================
+# 7b. GEDEELDE RIJ-STYLING (1 APP-STYLESHEET + DYNAMISCHE PROPERTIES)
+# ===============================================================
+# CertificateRowWidget en TodoRowWidget zetten enkel properties (rowState/rowType/tone);
+# de kleuren staan 1x in de applicatie-stylesheet, zodat Qt niet per rij CSS moet parsen.
+CERT_ROW_STATES = {
+    # state -> (voorbeeldstatus, is_achieved) voor certificate_row_colors
+    "standaard": ("", False),
+    "ingeschreven": ("ingeschreven", False),
+    "vereist": ("vereist", False),
+    "verloopt": ("verloopt", False),
+    "nieuw": ("nieuw", False),
+    "behaald": ("actief", True),
+}
+
+TODO_TONES = {
+    # tone -> (achtergrond, linkerrand)
+    "standaard": ("#f0fdf4", "#10b981"),
+    "herkansing": ("#ffcdd2", "#dc2626"),
+    "nieuw": ("#eff6ff", "#3b82f6"),
+    "vervalt": ("#fff1f2", "#dc2626"),
+    "afwezig": ("#fee2e2", "#dc2626"),
+    "afgerond": ("#e0f2fe", "#3b82f6"),
+    "gepasseerd": ("#fff7ed", "#d97706"),
+    "onbekend": ("#fffbeb", "#f59e0b"),
+    "ingeschreven": ("#fff7ed", "#d97706"),
+    "afgewerkt": ("#f0fdf4", "#10b981"),
+    "vaardigheid": ("#f3e8ff", "#9333ea"),
+}
+
+_ROW_STYLE_INSTALLED = False
+
+
+def certificate_row_colors(task_type: str, status: str, is_achieved: bool):
+    """(achtergrond, rand, linkerrand) van een certificaatrij (CertificateRowWidget en CertificateRowDelegate)."""
+    status_lower = str(status).lower(); bg_col = "white"; border_col = "#e2e8f0"
+
+    if "ingeschreven" in status_lower: bg_col = "#fffbeb"; border_col = "#d97706"
+    elif "vereist" in status_lower and not is_achieved: bg_col = "#fef2f2"; border_col = "#dc2626"
+    elif "verloopt" in status_lower: bg_col = "#fffbeb"; border_col = "#fde68a"
+    elif "nieuw" in status_lower: bg_col = "#eff6ff"; border_col = "#bfdbfe"
+    elif status_lower == "actief" or is_achieved: bg_col = "#f0fdf4"; border_col = "#bbf7d0"
+
+    left_color = "#9333ea" if task_type == "Vaardigheid" else "#005EB8"
+    if "ingeschreven" in status_lower: left_color = "#d97706"
+    elif "vereist" in status_lower and not is_achieved: left_color = "#dc2626"
+    return bg_col, border_col, left_color
+
+
+def certificate_row_state(status: str, is_achieved: bool) -> str:
+    """Sleutel uit CERT_ROW_STATES voor (status, is_achieved); zelfde volgorde als certificate_row_colors."""
+    status_lower = str(status).lower()
+    if "ingeschreven" in status_lower: return "ingeschreven"
+    if "vereist" in status_lower and not is_achieved: return "vereist"
+    if "verloopt" in status_lower: return "verloopt"
+    if "nieuw" in status_lower: return "nieuw"
+    if status_lower == "actief" or is_achieved: return "behaald"
+    return "standaard"
+
+
+def _certificate_expiry_label(expiry_date):
+    """(tekst, kleur) voor 'Geldig tot', of None (zelfde regels als CertificateRowWidget)."""
+    if not expiry_date: return None
+    try:
+        dt = pd.to_datetime(expiry_date)
+        txt = "Onbeperkt geldig" if dt.year >= 2099 else dt.strftime("%d-%m-%Y")
+        col = "#059669" if dt.year >= 2099 else ("#dc2626" if (dt - pd.Timestamp.now()).days < 0 else "#059669")
+        return txt, col
+    except: return None
+
+
+def _todo_border_color(left_color: str) -> str:
+    color = QColor(left_color)
+    return QColor(min(240, color.red() + 50), min(240, color.green() + 50), min(240, color.blue() + 50)).name()
+
+
+def build_row_stylesheet() -> str:
+    """Stylesheet voor alle rij-widgets, opgebouwd uit CERT_ROW_STATES en TODO_TONES."""
+    parts = []
+    for state, (status, achieved) in CERT_ROW_STATES.items():
+        for task_type in ("Certificaat", "Vaardigheid"):
+            bg_col, border_col, left_color = certificate_row_colors(task_type, status, achieved)
+            parts.append(
+                f'CertificateRowWidget[rowState="{state}"][rowType="{task_type.lower()}"] {{ '
+                f'background-color: {bg_col}; border: 1px solid {border_col}; border-left: 5px solid {left_color}; border-radius: 0px; margin: 2px 0; }}'
+            )
+    parts.append("""
+        CertificateRowWidget QWidget#CertRowContainer, CertificateRowWidget QLabel { background: transparent; }
+        CertificateRowWidget QLabel#CertTitle { font-family: 'Segoe UI'; font-size: 13px; color: #1f2937; font-weight: 600; }
+        CertificateRowWidget QLabel#CertBadge { background-color: #002439; color: white; font-weight: bold; padding: 0px 6px; border-radius: 0px; font-size: 10px; font-family: 'Segoe UI'; min-height: 18px; max-height: 18px; }
+        CertificateRowWidget QPushButton#CertDelete { border: none; outline: none; background: transparent; color: #333333; font-size: 14px; text-align: center; }
+        CertificateRowWidget QPushButton#CertDelete:hover { background-color: #fee2e2; border-radius: 0px; }
+        CertificateRowWidget QWidget#CertDetail { background: rgba(255,255,255,0.5); margin-top: 5px; border-radius: 0px; }
+        CertificateRowWidget QLabel#CertExtra { color: #64748b; font-size: 11px; font-family: 'Segoe UI'; font-style: italic; }
+        CertificateRowWidget QLabel#CertFieldLabel { font-size: 12px; color: #374151; font-family: 'Segoe UI'; }
+        CertificateRowWidget QLineEdit#CertComment { border: 1px solid #cbd5e1; border-radius: 0px; padding: 4px; font-size: 12px; background: white; }
+    """)
+    for tone, (bg_col, left_color) in TODO_TONES.items():
+        parts.append(
+            f'TodoRowWidget[tone="{tone}"] {{ background-color: {bg_col}; border: 1px solid {_todo_border_color(left_color)}; border-left: 5px solid {left_color}; margin: 2px 0; }}'
+        )
+    parts.append("""
+        TodoRowWidget[selected="true"] { background-color: #e0f2fe; border: 2px solid #005EB8; }
+        TodoRowWidget QLabel { background: transparent; }
+        TodoRowWidget QLabel#TodoTitle { font-size: 15px; color: #1f2937; }
+        TodoRowWidget QLabel#TodoStatus { font-size: 14px; color: #64748b; font-weight: 500; }
+    """)
+    return "\n".join(parts)
+
+
+def install_row_styles():
+    """Voegt de rij-stylesheet 1x toe aan de applicatie-stylesheet (idempotent)."""
+    global _ROW_STYLE_INSTALLED
+    if _ROW_STYLE_INSTALLED: return
+    app = QApplication.instance()
+    if app is None: return
+    app.setStyleSheet((app.styleSheet() or "") + "\n" + build_row_stylesheet())
+    _ROW_STYLE_INSTALLED = True
+
+
+def set_style_properties(widget: QWidget, **props):
+    """Zet dynamische properties en her-polisht enkel als de widget al gepolisht was en er iets wijzigde."""
+    changed = False
+    for name, value in props.items():
+        if widget.property(name) != value:
+            widget.setProperty(name, value); changed = True
+    if changed and widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+        widget.style().unpolish(widget); widget.style().polish(widget)
+
 # ===============================================================
 # 8. CERTIFICATE ROW WIDGET (DE LIJST ITEMS)
 # ===============================================================
@@ -313,76 +450,55 @@ class CertificateRowWidget(QWidget):
 
     def __init__(self, cert_name, task_type="Certificaat", is_strategic=False, status="", is_achieved=False, nodig=True, commentaar="", expiry_date=None, extra_info=""):
         super().__init__()
+        install_row_styles()
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.cert_name = cert_name; self.task_type = task_type; self.is_strategic = is_strategic; self.details_visible = False
 
-        badge_style = "background-color: #002439; color: white; font-weight: bold; padding: 0px 6px; border-radius: 0px; font-size: 10px; font-family: 'Segoe UI'; min-height: 18px; max-height: 18px;"
-        left_color = "#9333ea" if task_type == "Vaardigheid" else "#005EB8"
         icon = "🎯" if task_type == "Vaardigheid" else "📜"
         
-        self.setStyleSheet(f"CertificateRowWidget {{ border-left: 5px solid {left_color}; background: white; margin: 2px 0; }}")
+        # Styling via app-stylesheet (build_row_stylesheet): enkel properties, geen CSS per widget
+        self.setProperty("rowType", "vaardigheid" if task_type == "Vaardigheid" else "certificaat")
+        self.setProperty("rowState", "standaard")  # alle regels matchen op rowState + rowType; set_background overschrijft
 
         main = QVBoxLayout(self); main.setContentsMargins(0, 0, 0, 0); main.setSpacing(0)
         
         # Container TRANSPARANT voor achtergrondkleuren!
-        container = QWidget(); container.setStyleSheet("background: transparent;") 
+        container = QWidget(); container.setObjectName("CertRowContainer")
         clayout = QVBoxLayout(container); clayout.setContentsMargins(10, 8, 10, 8); clayout.setSpacing(4)
 
         top = QHBoxLayout(); top.setSpacing(10)
-        self.lbl_title = ClickableLabel(f"{icon}  {cert_name}")
-        self.lbl_title.setStyleSheet("font-family: 'Segoe UI'; font-size: 13px; color: #1f2937; font-weight: 600; background: transparent;")
+        self.lbl_title = ClickableLabel(f"{icon}  {cert_name}"); self.lbl_title.setObjectName("CertTitle")
         self.lbl_title.clicked.connect(self.toggle_details); top.addWidget(self.lbl_title, stretch=3)
 
-        badge = QLabel(task_type); badge.setStyleSheet(badge_style); badge.setAlignment(Qt.AlignmentFlag.AlignCenter); top.addWidget(badge)
+        badge = QLabel(task_type); badge.setObjectName("CertBadge"); badge.setAlignment(Qt.AlignmentFlag.AlignCenter); top.addWidget(badge)
 
         # DELETE KNOP: Donkere kleur (#333) zodat het zichtbaar is op wit
-        self.btn_del = QPushButton("🗑️")
+        self.btn_del = QPushButton("🗑️"); self.btn_del.setObjectName("CertDelete")
         self.btn_del.setFixedSize(30, 30); self.btn_del.setCursor(Qt.CursorShape.PointingHandCursor); self.btn_del.setFlat(True)
-        self.btn_del.setStyleSheet("""
-            QPushButton { 
-                border: none; 
-                outline: none; 
-                background: transparent; 
-                color: #333333; 
-                font-size: 14px; 
-                text-align: center; 
-            } 
-            QPushButton:hover { 
-                background-color: #fee2e2; 
-                border-radius: 0px; 
-            }
-        """)
-        
         self.btn_del.clicked.connect(lambda checked: self.deleted.emit(self.cert_name))
         
         top.addWidget(self.btn_del)
         clayout.addLayout(top)
 
-        self.detail_box = QWidget(); self.detail_box.setStyleSheet("background: rgba(255,255,255,0.5); margin-top: 5px; border-radius: 0px;")
+        self.detail_box = QWidget(); self.detail_box.setObjectName("CertDetail")
         dlay = QVBoxLayout(self.detail_box); dlay.setContentsMargins(10, 10, 10, 10); dlay.setSpacing(8)
 
-        if expiry_date:
-            try:
-                dt = pd.to_datetime(expiry_date)
-                txt = "Onbeperkt geldig" if dt.year >= 2099 else dt.strftime("%d-%m-%Y")
-                col = "#059669" if dt.year >= 2099 else ("#dc2626" if (dt - pd.Timestamp.now()).days < 0 else "#059669")
-                lbl = QLabel(f"📅 Geldig tot: <span style='color:{col};font-weight:bold;'>{txt}</span>")
-                lbl.setStyleSheet("background: transparent;")
-                dlay.addWidget(lbl)
-            except: pass
+        expiry = _certificate_expiry_label(expiry_date)
+        if expiry:
+            txt, col = expiry
+            dlay.addWidget(QLabel(f"📅 Geldig tot: <span style='color:{col};font-weight:bold;'>{txt}</span>"))
         
         if extra_info:
-            lbl = QLabel(extra_info); lbl.setStyleSheet("color: #64748b; font-size: 11px; font-family: 'Segoe UI'; font-style: italic; background: transparent;"); dlay.addWidget(lbl)
+            lbl = QLabel(extra_info); lbl.setObjectName("CertExtra"); dlay.addWidget(lbl)
 
         nod_row = QHBoxLayout()
-        self.lbl_nodig = QLabel("Nodig:"); self.lbl_nodig.setStyleSheet("font-size: 12px; color: #374151; font-family: 'Segoe UI'; background: transparent;")
+        self.lbl_nodig = QLabel("Nodig:"); self.lbl_nodig.setObjectName("CertFieldLabel")
         nod_row.addWidget(self.lbl_nodig)
         self.switch_nodig = ToggleSwitch(checked=nodig); nod_row.addWidget(self.switch_nodig); nod_row.addStretch(); dlay.addLayout(nod_row)
 
         com_row = QHBoxLayout()
-        com_row.addWidget(QLabel("Opmerking:", styleSheet="font-size: 12px; color: #374151; font-family: 'Segoe UI'; background: transparent;"))
-        self.edit_comment = QLineEdit(commentaar); self.edit_comment.setPlaceholderText("...")
-        self.edit_comment.setStyleSheet("QLineEdit { border: 1px solid #cbd5e1; border-radius: 0px; padding: 4px; font-size: 12px; background: white; }")
+        lbl_comment = QLabel("Opmerking:"); lbl_comment.setObjectName("CertFieldLabel"); com_row.addWidget(lbl_comment)
+        self.edit_comment = QLineEdit(commentaar); self.edit_comment.setPlaceholderText("..."); self.edit_comment.setObjectName("CertComment")
         com_row.addWidget(self.edit_comment); dlay.addLayout(com_row)
 
         self.detail_box.setVisible(False); clayout.addWidget(self.detail_box); main.addWidget(container)
@@ -402,19 +518,277 @@ class CertificateRowWidget(QWidget):
     def get_data(self): return {"CertName": self.cert_name, "Nodig": self.switch_nodig.isChecked(), "Strategisch": self.is_strategic, "Commentaar": self.edit_comment.text().strip()}
     
     def set_background(self, status: str, is_achieved: bool):
-        status_lower = str(status).lower(); bg_col = "white"; border_col = "#e2e8f0"
-        
-        if "ingeschreven" in status_lower: bg_col = "#fffbeb"; border_col = "#d97706"
-        elif "vereist" in status_lower and not is_achieved: bg_col = "#fef2f2"; border_col = "#dc2626"
-        elif "verloopt" in status_lower: bg_col = "#fffbeb"; border_col = "#fde68a"
-        elif "nieuw" in status_lower: bg_col = "#eff6ff"; border_col = "#bfdbfe"
-        elif status_lower == "actief" or is_achieved: bg_col = "#f0fdf4"; border_col = "#bbf7d0"
+        set_style_properties(self, rowState=certificate_row_state(status, is_achieved))
+
+
+# ===============================================================
+# 8b. CERTIFICAAT LIJST (MODEL/VIEW - GEEN WIDGET PER RIJ)
+# ===============================================================
+class CertificateListModel(QAbstractListModel):
+    """
+    Model achter de certificaatlijst van de Medewerkers-tab.
+    Eén dict per rij (name, type, strategic, status, achieved, nodig, comment, expiry, extra);
+    optioneel 'style' = (status, is_achieved) om de kleuren te overschrijven (zoals set_background).
+    """
+    RowRole = Qt.ItemDataRole.UserRole + 1
+    edited = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._details_visible = False
+
+    def _prepare(self, row: dict) -> dict:
+        r = {
+            "name": str(row.get("name", "")), "type": row.get("type", "Certificaat"),
+            "strategic": bool(row.get("strategic", False)), "status": row.get("status", ""),
+            "achieved": bool(row.get("achieved", False)), "nodig": bool(row.get("nodig", True)),
+            "comment": str(row.get("comment", "") or ""), "extra": row.get("extra", "") or "",
+        }
+        style_status, style_achieved = row.get("style") or (r["status"], r["achieved"])
+        r["bg"], r["border"], r["left"] = certificate_row_colors(r["type"], style_status, style_achieved)
+        r["expiry_label"] = _certificate_expiry_label(row.get("expiry"))
+        r["expanded"] = self._details_visible
+        return r
+
+    # --- Qt model API ---
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        row = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole: return row["name"]
+        if role == Qt.ItemDataRole.EditRole: return row["comment"]
+        if role == self.RowRole: return row
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole: return False
+        row = self._rows[index.row()]
+        value = str(value or "").strip()
+        if value == row["comment"]: return False
+        row["comment"] = value
+        self.dataChanged.emit(index, index); self.edited.emit()
+        return True
+
+    def flags(self, index):
+        if not index.isValid(): return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+
+    # --- Lijst API (vervangt de lijst van CertificateRowWidgets) ---
+    def set_rows(self, rows):
+        self.beginResetModel(); self._rows = [self._prepare(r) for r in rows]; self.endResetModel()
+
+    def clear(self): self.set_rows([])
+
+    def insert_row(self, position: int, row: dict):
+        position = max(0, min(position, len(self._rows)))
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, self._prepare(row))
+        self.endInsertRows()
+
+    def find(self, name: str, case_sensitive: bool = True) -> Optional[dict]:
+        key = name if case_sensitive else str(name).lower()
+        for r in self._rows:
+            if (r["name"] if case_sensitive else r["name"].lower()) == key: return r
+        return None
+
+    def set_nodig(self, position: int, value: bool):
+        row = self._rows[position]
+        if row["nodig"] == bool(value): return
+        row["nodig"] = bool(value)
+        idx = self.index(position); self.dataChanged.emit(idx, idx); self.edited.emit()
+
+    def toggle_details(self, position: int):
+        row = self._rows[position]; row["expanded"] = not row["expanded"]
+        idx = self.index(position); self.dataChanged.emit(idx, idx)
+
+    def set_details_visible(self, visible: bool):
+        self._details_visible = bool(visible)
+        self.layoutAboutToBeChanged.emit()
+        for r in self._rows: r["expanded"] = self._details_visible
+        self.layoutChanged.emit()
+
+    def get_data_rows(self):
+        """Zelfde velden als CertificateRowWidget.get_data(), plus TaskType."""
+        return [{"CertName": r["name"], "Nodig": r["nodig"], "Strategisch": r["strategic"],
+                 "Commentaar": r["comment"], "TaskType": r["type"]} for r in self._rows]
+
+
+class CertificateRowDelegate(QStyledItemDelegate):
+    """
+    Tekent de certificaatrijen (zelfde look als CertificateRowWidget) zonder widgets.
+    Enkel het opmerkingveld krijgt een echte QLineEdit, en alleen voor de rij die bewerkt wordt.
+    """
+    deleted = pyqtSignal(str)
+
+    ROW_HEIGHT = 50; MARGIN_Y = 2; PAD_X = 10; PAD_Y = 8
+    DETAIL_PAD = 10; DETAIL_SPACING = 8; EXPIRY_H = 18; EXTRA_H = 16; NODIG_H = 18; COMMENT_H = 28
+    BADGE_STYLE = ("#002439", "white")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font_title = QFont("Segoe UI"); self._font_title.setPixelSize(13); self._font_title.setWeight(QFont.Weight.DemiBold)
+        self._font_badge = QFont("Segoe UI"); self._font_badge.setPixelSize(10); self._font_badge.setBold(True)
+        self._font_label = QFont("Segoe UI"); self._font_label.setPixelSize(12)
+        self._font_extra = QFont("Segoe UI"); self._font_extra.setPixelSize(11); self._font_extra.setItalic(True)
+
+    def _detail_height(self, row) -> int:
+        h = 5 + 2 * self.DETAIL_PAD + self.NODIG_H + self.DETAIL_SPACING + self.COMMENT_H
+        if row["expiry_label"]: h += self.EXPIRY_H + self.DETAIL_SPACING
+        if row["extra"]: h += self.EXTRA_H + self.DETAIL_SPACING
+        return h
+
+    def _rects(self, rect: QRect, row) -> dict:
+        card = rect.adjusted(0, self.MARGIN_Y, 0, -self.MARGIN_Y)
+        inner = card.adjusted(5 + self.PAD_X, self.PAD_Y, -self.PAD_X, -self.PAD_Y)
+        top = QRect(inner.left(), inner.top(), inner.width(), 30)
+        r = {"card": card, "del": QRect(top.right() - 30, top.top(), 30, 30)}
+        badge_w = QFontMetrics(self._font_badge).horizontalAdvance(row["type"]) + 12
+        r["badge"] = QRect(r["del"].left() - 10 - badge_w, top.center().y() - 9, badge_w, 18)
+        r["title"] = QRect(top.left(), top.top(), r["badge"].left() - 10 - top.left(), 30)
+        if row["expanded"]:
+            detail = QRect(inner.left(), top.bottom() + 1 + 4 + 5, inner.width(), self._detail_height(row) - 5)
+            r["detail"] = detail
+            y = detail.top() + self.DETAIL_PAD; x = detail.left() + self.DETAIL_PAD; w = detail.width() - 2 * self.DETAIL_PAD
+            if row["expiry_label"]:
+                r["expiry"] = QRect(x, y, w, self.EXPIRY_H); y += self.EXPIRY_H + self.DETAIL_SPACING
+            if row["extra"]:
+                r["extra"] = QRect(x, y, w, self.EXTRA_H); y += self.EXTRA_H + self.DETAIL_SPACING
+            lbl_w = QFontMetrics(self._font_label).horizontalAdvance("Opmerking:") + 8
+            r["nodig_lbl"] = QRect(x, y, lbl_w, self.NODIG_H)
+            r["switch"] = QRect(x + lbl_w, y, 36, self.NODIG_H); y += self.NODIG_H + self.DETAIL_SPACING
+            r["comment_lbl"] = QRect(x, y, lbl_w, self.COMMENT_H)
+            r["comment"] = QRect(x + lbl_w, y, w - lbl_w, self.COMMENT_H)
+        return r
+
+    def sizeHint(self, option, index):
+        row = index.data(CertificateListModel.RowRole)
+        h = self.ROW_HEIGHT
+        if row and row["expanded"]: h += self._detail_height(row)
+        return QSize(option.rect.width(), h)
+
+    def paint(self, painter, option, index):
+        row = index.data(CertificateListModel.RowRole)
+        if not row: return
+        r = self._rects(option.rect, row)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+
+        # Kaart: achtergrond, rand en gekleurde linkerrand
+        card = r["card"]
+        painter.fillRect(card, QColor(row["bg"]))
+        painter.setPen(QPen(QColor(row["border"]), 1)); painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(card.adjusted(0, 0, -1, -1))
+        painter.fillRect(QRect(card.left(), card.top(), 5, card.height()), QColor(row["left"]))
+
+        # Titel
+        icon = "🎯" if row["type"] == "Vaardigheid" else "📜"
+        painter.setFont(self._font_title); painter.setPen(QColor("#1f2937"))
+        title = QFontMetrics(self._font_title).elidedText(f"{icon}  {row['name']}", Qt.TextElideMode.ElideRight, r["title"].width())
+        painter.drawText(r["title"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, title)
+
+        # Badge
+        painter.fillRect(r["badge"], QColor(self.BADGE_STYLE[0]))
+        painter.setFont(self._font_badge); painter.setPen(QColor(self.BADGE_STYLE[1]))
+        painter.drawText(r["badge"], Qt.AlignmentFlag.AlignCenter, row["type"])
+
+        # Delete knop (hover = rood vlak)
+        hover_pos = getattr(self.parent(), "hover_pos", None)
+        if hover_pos is not None and r["del"].contains(hover_pos):
+            painter.fillRect(r["del"], QColor("#fee2e2"))
+        painter.setFont(self._font_label); painter.setPen(QColor("#333333"))
+        painter.drawText(r["del"], Qt.AlignmentFlag.AlignCenter, "🗑️")
+
+        if row["expanded"]:
+            painter.fillRect(r["detail"], QColor(255, 255, 255, 128))
+            if "expiry" in r:
+                txt, col = row["expiry_label"]
+                prefix = "📅 Geldig tot: "
+                painter.setFont(self._font_label); painter.setPen(QColor("#1f2937"))
+                painter.drawText(r["expiry"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, prefix)
+                bold = QFont(self._font_label); bold.setBold(True)
+                painter.setFont(bold); painter.setPen(QColor(col))
+                painter.drawText(r["expiry"].adjusted(QFontMetrics(self._font_label).horizontalAdvance(prefix), 0, 0, 0),
+                                 Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, txt)
+            if "extra" in r:
+                painter.setFont(self._font_extra); painter.setPen(QColor("#64748b"))
+                painter.drawText(r["extra"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, str(row["extra"]))
+
+            painter.setFont(self._font_label); painter.setPen(QColor("#374151"))
+            painter.drawText(r["nodig_lbl"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, "Nodig:")
+            ToggleSwitch.paint_switch(painter, r["switch"], row["nodig"])
+
+            painter.setFont(self._font_label); painter.setPen(QColor("#374151"))
+            painter.drawText(r["comment_lbl"], Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, "Opmerking:")
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+            painter.fillRect(r["comment"], QColor("white"))
+            painter.setPen(QColor("#cbd5e1")); painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(r["comment"].adjusted(0, 0, -1, -1))
+            painter.setPen(QColor("#1f2937") if row["comment"] else QColor("#94a3b8"))
+            painter.drawText(r["comment"].adjusted(5, 0, -5, 0), Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, row["comment"] or "...")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            row = index.data(CertificateListModel.RowRole)
+            r = self._rects(option.rect, row); pos = event.position().toPoint()
+            if r["del"].contains(pos):
+                self.deleted.emit(row["name"]); return True
+            if row["expanded"] and r["switch"].contains(pos):
+                model.set_nodig(index.row(), not row["nodig"]); return True
+            if row["expanded"] and r["comment"].contains(pos):
+                self.parent().edit(index); return True
+            if r["title"].contains(pos):
+                model.toggle_details(index.row()); self.sizeHintChanged.emit(index); return True
+        return super().editorEvent(event, model, option, index)
+
+    # --- Editor enkel voor de opmerking van de rij in bewerking ---
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent); editor.setPlaceholderText("..."); editor.setObjectName("CertCommentEditor")
+        return editor
 
-        left_color = "#9333ea" if self.task_type == "Vaardigheid" else "#005EB8"
-        if "ingeschreven" in status_lower: left_color = "#d97706"
-        elif "vereist" in status_lower and not is_achieved: left_color = "#dc2626"
+    def setEditorData(self, editor, index): editor.setText(index.data(Qt.ItemDataRole.EditRole) or "")
 
-        self.setStyleSheet(f"CertificateRowWidget {{ background-color: {bg_col}; border: 1px solid {border_col}; border-left: 5px solid {left_color}; border-radius: 0px; margin: 2px 0; }}")
+    def setModelData(self, editor, model, index): model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        r = self._rects(option.rect, index.data(CertificateListModel.RowRole))
+        if "comment" in r: editor.setGeometry(r["comment"])
+
+
+class CertificateListView(QListView):
+    """Virtuele lijst van certificaatrijen (CertificateListModel + CertificateRowDelegate)."""
+    deleted = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hover_pos = None
+        self.cert_model = CertificateListModel(self)
+        self.setModel(self.cert_model)
+        self._delegate = CertificateRowDelegate(self)
+        self._delegate.deleted.connect(self.deleted)
+        self.setItemDelegate(self._delegate)
+
+        self.setUniformItemSizes(False)
+        self.setLayoutMode(QListView.LayoutMode.Batched); self.setBatchSize(100)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setStyleSheet("""
+            QListView { border: none; background: #f8fafc; padding: 20px 30px; }
+            QLineEdit#CertCommentEditor { border: 1px solid #005EB8; border-radius: 0px; padding: 4px; font-size: 12px; background: white; }
+        """)
+
+    def mouseMoveEvent(self, event):
+        self.hover_pos = event.position().toPoint(); self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.hover_pos = None; self.viewport().update()
+        super().leaveEvent(event)
 
 
 # # ===============================================================
@@ -704,6 +1078,7 @@ class CertificateRowWidget(QWidget):
 class TodoRowWidget(QWidget):
     def __init__(self, row_data: pd.Series):
         super().__init__()
+        install_row_styles()
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.row_data = row_data
 
@@ -729,8 +1104,7 @@ class TodoRowWidget(QWidget):
         is_past = False  # <--- DEZE REGEL ONTBRAK
         display_info = ""
         icon = "⚪"
-        bg_col = "#f0fdf4"
-        left_color = "#10b981"
+        tone = "standaard"  # kleuren: TODO_TONES
         is_new_item = False 
         
         # --- 3. Styling bepalen ---
@@ -738,8 +1112,7 @@ class TodoRowWidget(QWidget):
         # A. FAILED / HERKANSING (Hoogste prio)
         if "niet geslaagd" in dl or "failed" in dl or "gezakt" in dl: 
             icon = "⛔"
-            bg_col = "#ffcdd2"
-            left_color = "#dc2626"
+            tone = "herkansing"
             display_info = "Herkansing nodig"
             
         # B. OPEN TAKEN (Nog in te plannen)
@@ -750,15 +1123,13 @@ class TodoRowWidget(QWidget):
             # Check Nieuw
             if "nieuw certificaat nodig" in dl or "vaardigheid nog niet behaald" in dl:
                 icon = "🔵"
-                bg_col = "#eff6ff"  # Lichtblauw
-                left_color = "#3b82f6"  # Blauw
+                tone = "nieuw"  # Lichtblauw / Blauw
                 is_new_item = True
                 display_info = f"🆕 NIEUW - In te plannen"
             else:
                 # Verlopen
                 icon = "🔴"
-                bg_col = "#fff1f2"
-                left_color = "#dc2626"
+                tone = "vervalt"
                 display_info = f"Vervalt: {expiry_str}"
         
         # C. INGESCHREVEN / LOPENDE
@@ -790,8 +1161,7 @@ class TodoRowWidget(QWidget):
             if is_absent:
                 # Rood: Expliciet ziek of afwezig gemeld
                 icon = "⛔"
-                bg_col = "#fee2e2"
-                left_color = "#dc2626"
+                tone = "afwezig"
                 display_info = f"AFWEZIG ({detail}) - Opnieuw inplannen"
 
             elif is_past:
@@ -799,38 +1169,33 @@ class TodoRowWidget(QWidget):
                 if days_ago <= 10:
                     # BLAUW: Training net geweest, wachten op admin/resultaat
                     icon = "⏳"
-                    bg_col = "#e0f2fe"  # Lichtblauw
-                    left_color = "#3b82f6"
+                    tone = "afgerond"  # Lichtblauw
                     # UI geeft duidelijk aan dat de opleiding al is afgewerkt op datum,
                     # maar dat we nog wachten op de officiële resultaten.
                     display_info = f"OPLEIDING AFGEROND ({days_ago}d geleden) | Wachten op resultaat..."
                 else:
                     # ORANJE: Al lang geleden, waarom nog steeds op 'Ingeschreven'?
                     icon = "⚠️"
-                    bg_col = "#fff7ed"
-                    left_color = "#d97706"
+                    tone = "gepasseerd"
                     display_info = f"GEPASSEERD ({days_ago}d geleden) - Check resultaat in Xaurum"
 
             elif not has_date and not loc:
                 # Geen datum EN geen locatie = Vaak een probleem of annulatie zonder datum
                 icon = "❓"
-                bg_col = "#fffbeb"
-                left_color = "#f59e0b"
+                tone = "onbekend"
                 display_info = f"⚠️ Datum onbekend | {detail}"
             
             else:
                 # TOEKOMST: Gewoon ingeschreven
                 icon = "🟠"
-                bg_col = "#fff7ed"
-                left_color = "#d97706"
+                tone = "ingeschreven"
                 d_str = pd.to_datetime(ing_date).strftime('%d-%m-%Y') if has_date else "?"
                 display_info = f"📅 {d_str} - 📍 {loc or 'Locatie?'}"
         
         # D. AFGEWERKT
         elif sl in ["afgewerkt", "recent behaald"]:
             icon = "🟢"
-            bg_col = "#f0fdf4"
-            left_color = "#10b981"
+            tone = "afgewerkt"
             beh_date = row_data.get("Behaald_Datum", pd.NaT)
             date_str = pd.to_datetime(beh_date).strftime('%d-%m-%Y') if pd.notna(beh_date) else "Afgewerkt"
             display_info = f"Status: {date_str}"
@@ -839,23 +1204,11 @@ class TodoRowWidget(QWidget):
         if "vaard" in task_type.lower() or "comp" in task_type.lower():
             # Alleen paars als het geen speciale status (zoals nieuw/afwezig) heeft
             if not is_past and sl not in ["afgewerkt", "recent behaald"] and not is_new_item and icon != "⛔":
-                left_color = "#9333ea"
-                bg_col = "#f3e8ff"
+                tone = "vaardigheid"
 
-        # --- 5. Stylesheet en Layout ---
-        border_color = self._get_border_color(left_color)
-        self.setStyleSheet(f"""
-            TodoRowWidget {{
-                background-color: {bg_col};
-                border: 1px solid {border_color};
-                border-left:  5px solid {left_color};
-                margin: 2px 0;
-            }}
-            TodoRowWidget[selected="true"] {{
-                background-color: #e0f2fe;
-                border:  2px solid #005EB8;
-            }}
-        """)
+        # --- 5. Styling (app-stylesheet via tone-property) en Layout ---
+        self.tone = tone
+        self.setProperty("tone", tone)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -868,12 +1221,12 @@ class TodoRowWidget(QWidget):
         title_text = f"<html>{icon} {task_icon} <b>{medewerker}</b> – {cert}</html>"
         lbl_title = QLabel(title_text)
         lbl_title.setTextFormat(Qt.TextFormat.RichText)
-        lbl_title.setStyleSheet("font-size: 15px; color: #1f2937; background: transparent;")
+        lbl_title.setObjectName("TodoTitle")
         top_row.addWidget(lbl_title, 1)
 
         # Status Label
         lbl_status = QLabel(f"{status.upper()} | {display_info}")
-        lbl_status.setStyleSheet("font-size: 14px; color: #64748b; font-weight: 500; background: transparent;")
+        lbl_status.setObjectName("TodoStatus")
         lbl_status.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         top_row.addWidget(lbl_status)
         
@@ -890,8 +1243,11 @@ class TodoRowWidget(QWidget):
         except: return "-"
 
     def _get_border_color(self, left_color):
-        color = QColor(left_color)
-        return QColor(min(240, color.red() + 50), min(240, color.green() + 50), min(240, color.blue() + 50)).name()
+        return _todo_border_color(left_color)
+
+    def set_selected(self, selected: bool):
+        """Selectie-stijl via de 'selected' property (TodoRowWidget[selected="true"] in de app-stylesheet)."""
+        set_style_properties(self, selected="true" if selected else "false")
 
 # ===============================================================
 # 9. GAUGE WIDGET (VOLLEDIGE VERSIE MET WIJZERS)